@@ -0,0 +1,293 @@
+"""
+Mongo-backed PDF render queue with an interactive and a bulk lane.
+
+Jobs live in the `render_jobs` collection. Interactive jobs (someone is
+waiting on /api/runs/{run_id}/report.pdf) are always claimed before bulk jobs
+(regeneration, backfills), and RENDER_INTERACTIVE_RESERVED of the workers
+never take bulk work at all. A long bulk backlog can therefore never hold up
+a download.
+
+A worker claims a job by setting a lease and keeps extending it while it
+renders. If the process dies, the lease runs out and another worker takes the
+job again, up to MAX_ATTEMPTS times. Jobs for the same cache key are
+deduplicated while queued or running, and an interactive request promotes a
+queued bulk job to the interactive lane.
+
+    queue = RenderQueue(db.render_jobs)
+    job = await queue.enqueue(run_id, key, lane=INTERACTIVE)
+    job = await queue.wait(job['id'], timeout=60)
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+LANES = (INTERACTIVE, BULK)
+# Lower sorts first when claiming
+LANE_PRIORITY = {INTERACTIVE: 0, BULK: 1}
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+DEFAULT_LEASE_SECONDS = 60
+MAX_ATTEMPTS = 3
+# Finished jobs are kept this long for status polling, then expire
+FINISHED_TTL_SECONDS = 7 * 24 * 3600
+POLL_SECONDS = 0.25
+
+
+def utcnow():
+    return datetime.now(timezone.utc)
+
+
+def _aware(value):
+    # Mongo hands datetimes back naive (in UTC) unless the client is tz_aware
+    return value.replace(tzinfo=timezone.utc) if value is not None and value.tzinfo is None else value
+
+
+def public_job(doc):
+    """Job document as returned by the API"""
+    if doc is None:
+        return None
+    job = {k: v for k, v in doc.items() if k not in ('_id', 'priority', 'lease_until', 'worker')}
+    job['id'] = doc['_id']
+    return job
+
+
+class RenderQueue:
+    def __init__(self, collection, lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.jobs = collection
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Wakes idle workers and waiters in this process without waiting for the next poll
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_for_change(self, timeout):
+        """Sleep until a job is queued or finishes in this process, or timeout seconds pass"""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def ensure_indexes(self):
+        await self.jobs.create_index([('state', ASCENDING), ('priority', ASCENDING), ('enqueued_at', ASCENDING)])
+        # At most one queued or running job per cache key
+        await self.jobs.create_index(
+            [('key', ASCENDING)], unique=True, name='active_key',
+            partialFilterExpression={'active': True},
+        )
+        await self.jobs.create_index('finished_at', expireAfterSeconds=FINISHED_TTL_SECONDS)
+
+    async def enqueue(self, run_id, key, lane=BULK):
+        """Queue a render of run_id under cache key; returns the (possibly existing) job"""
+        if lane not in LANES:
+            raise ValueError(f'Unknown lane: {lane}')
+        now = utcnow()
+        doc = {
+            '_id': uuid.uuid4().hex,
+            'run_id': run_id,
+            'key': key,
+            'lane': lane,
+            'priority': LANE_PRIORITY[lane],
+            'state': QUEUED,
+            'active': True,
+            'attempts': 0,
+            'enqueued_at': now,
+            'started_at': None,
+            'finished_at': None,
+            'error': None,
+        }
+        try:
+            await self.jobs.insert_one(doc)
+            self._notify()
+            return public_job(doc)
+        except DuplicateKeyError:
+            pass
+        if lane == INTERACTIVE:
+            # Someone is waiting now: move an already queued bulk job to the front lane
+            await self.jobs.update_one(
+                {'key': key, 'active': True, 'lane': BULK},
+                {'$set': {'lane': INTERACTIVE, 'priority': LANE_PRIORITY[INTERACTIVE]}},
+            )
+            self._notify()
+        existing = await self.jobs.find_one({'key': key, 'active': True})
+        if existing is None:
+            # Finished between the insert and the lookup; queue a fresh one
+            return await self.enqueue(run_id, key, lane)
+        return public_job(existing)
+
+    async def get(self, job_id):
+        return public_job(await self.jobs.find_one({'_id': job_id}))
+
+    async def claim(self, worker, lanes=LANES):
+        """Lease the most urgent job in lanes, including ones whose lease ran out; None if idle"""
+        now = utcnow()
+        lease = {'state': RUNNING, 'worker': worker, 'lease_until': now + timedelta(seconds=self.lease_seconds)}
+        doc = await self.jobs.find_one_and_update(
+            {
+                'lane': {'$in': list(lanes)},
+                '$or': [
+                    {'state': QUEUED},
+                    {'state': RUNNING, 'lease_until': {'$lt': now}},
+                ],
+            },
+            {'$set': dict(lease, started_at=now), '$inc': {'attempts': 1}},
+            sort=[('priority', ASCENDING), ('enqueued_at', ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is None:
+            return None
+        if doc['attempts'] > self.max_attempts:
+            # Its workers kept dying mid-render; stop handing it out
+            await self._finish(doc['_id'], worker, FAILED, f'Lease expired {self.max_attempts} times')
+            return await self.claim(worker, lanes)
+        return public_job(doc)
+
+    async def heartbeat(self, job_id, worker):
+        """Extend the lease; False if the job was taken over in the meantime"""
+        result = await self.jobs.update_one(
+            {'_id': job_id, 'state': RUNNING, 'worker': worker},
+            {'$set': {'lease_until': utcnow() + timedelta(seconds=self.lease_seconds)}},
+        )
+        return result.matched_count == 1
+
+    async def complete(self, job_id, worker):
+        return await self._finish(job_id, worker, DONE)
+
+    async def fail(self, job_id, worker, error):
+        return await self._finish(job_id, worker, FAILED, error)
+
+    async def _finish(self, job_id, worker, state, error=None):
+        result = await self.jobs.update_one(
+            {'_id': job_id, 'state': RUNNING, 'worker': worker},
+            {
+                '$set': {'state': state, 'error': error, 'finished_at': utcnow(), 'lease_until': None},
+                '$unset': {'active': ''},
+            },
+        )
+        self._notify()
+        return result.matched_count == 1
+
+    async def wait(self, job_id, timeout):
+        """Poll until the job is done or failed; returns the job (still active on timeout)"""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            job = await self.get(job_id)
+            if job is None or job['state'] not in ACTIVE_STATES:
+                return job
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                return job
+            # Jobs finished by other processes are only seen by polling
+            await self.wait_for_change(min(POLL_SECONDS, remaining))
+
+    async def metrics(self):
+        """Depth, running count and oldest-queued age per lane, plus failures in the last hour"""
+        now = utcnow()
+        lanes = {lane: {'queued': 0, 'running': 0, 'oldest_queued_age_s': 0.0} for lane in LANES}
+        pipeline = [
+            {'$match': {'active': True}},
+            {'$group': {'_id': {'lane': '$lane', 'state': '$state'}, 'count': {'$sum': 1}, 'oldest': {'$min': '$enqueued_at'}}},
+        ]
+        async for row in self.jobs.aggregate(pipeline):
+            lane = lanes.setdefault(row['_id']['lane'], {'queued': 0, 'running': 0, 'oldest_queued_age_s': 0.0})
+            lane[row['_id']['state']] = row['count']
+            if row['_id']['state'] == QUEUED and row['oldest'] is not None:
+                lane['oldest_queued_age_s'] = round((now - _aware(row['oldest'])).total_seconds(), 3)
+        failed = await self.jobs.count_documents({'state': FAILED, 'finished_at': {'$gte': now - timedelta(hours=1)}})
+        return {'lanes': lanes, 'failed_last_hour': failed}
+
+
+class RenderWorkers:
+    """Asyncio tasks that claim jobs and run render(job) in a thread, one job per worker at a time.
+
+    Renders run on the workers' own thread pool, one thread per worker, so
+    other run_in_executor users can never take the capacity reserved for them.
+    """
+
+    def __init__(self, queue, render, workers=2, reserved_interactive=1, idle_seconds=1.0):
+        self.queue = queue
+        self.render = render
+        self.workers = max(1, workers)
+        # Never give every worker to bulk work
+        self.reserved_interactive = min(reserved_interactive, self.workers - 1) if self.workers > 1 else 0
+        self.idle_seconds = idle_seconds
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self._tasks = []
+        self._executor = None
+        self._stopping = False
+
+    def start(self):
+        self._stopping = False
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='render-worker')
+        for index in range(self.workers):
+            lanes = (INTERACTIVE,) if index < self.reserved_interactive else LANES
+            self._tasks.append(asyncio.create_task(self._run(f'{self.name}:{index}', lanes)))
+
+    async def stop(self):
+        # Python 3.11's wait_for can swallow a cancel that lands as the queue changes; the flag still ends the loop
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            # A render in progress can't be interrupted; it finishes in the background and its
+            # job, still leased, is picked up again once the lease expires
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, worker, lanes):
+        while not self._stopping:
+            try:
+                job = await self.queue.claim(worker, lanes)
+            except Exception:
+                logger.exception('Claiming a render job failed')
+                job = None
+            if job is None:
+                await self.queue.wait_for_change(self.idle_seconds)
+                continue
+            await self._process(worker, job)
+
+    async def _process(self, worker, job):
+        heartbeat = asyncio.create_task(self._keep_leased(worker, job['id']))
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.render, job)
+        except asyncio.CancelledError:
+            # Shutting down: leave the job leased; it is picked up again once the lease expires
+            raise
+        except Exception as exc:
+            logger.exception('Render job %s for run %s failed', job['id'], job['run_id'])
+            await self.queue.fail(job['id'], worker, f'{type(exc).__name__}: {exc}')
+        else:
+            await self.queue.complete(job['id'], worker)
+        finally:
+            heartbeat.cancel()
+
+    async def _keep_leased(self, worker, job_id):
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            try:
+                if not await self.queue.heartbeat(job_id, worker):
+                    logger.warning('Lost the lease on render job %s', job_id)
+                    return
+            except Exception:
+                logger.exception('Extending the lease on render job %s failed', job_id)
@@ -0,0 +1,13 @@
+"""
+PDF rendering for v2 compliance reports (report.json -> report.pdf)
+"""
+
+from .renderer import TEMPLATE_VERSION, load_report, render_pdf
+from .cache import PdfCache, cache_key
+from .engines import EngineUnavailable, available_engines, engine_version, render_report, select_engine
+from .view_model import normalize_report
+
+__all__ = [
+    'TEMPLATE_VERSION', 'load_report', 'render_pdf', 'normalize_report', 'PdfCache', 'cache_key',
+    'render_report', 'select_engine', 'engine_version', 'available_engines', 'EngineUnavailable',
+]
@@ -0,0 +1,169 @@
+"""
+Re-render whole directories of report.json files across a process pool.
+
+    cd backend
+    python -m reporting.batch /srv/ava/data/runs --workers 8
+    python -m reporting.batch ./exports --pattern '*.json' --output ./pdfs
+    python -m reporting.batch /srv/ava/data/runs --engine reportlab
+    python -m reporting.batch /srv/ava/data/runs --profile    # + <run_dir>/report-profile.json
+
+By default every <run_dir>/report.json is rendered to <run_dir>/report.pdf,
+with a first-page thumbnail in <run_dir>/report-thumb.png.
+With --output the PDFs go to the output directory instead, mirroring the
+input tree. One bad report never aborts the batch; failures are listed at
+the end and reflected in the exit code.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .engines import AUTO, ENGINES, WEASYPRINT, engine_available, render_report
+from .optimize import optimize_file
+from .profiling import RenderProfile, profile_path
+from .renderer import load_report
+from .theme import create_styles
+from .thumbnails import thumbnail_path, write_thumbnail
+
+# Styles are built once per worker process and reused for every report it renders
+_worker_styles = None
+_worker_engine = AUTO
+_worker_optimize = True
+_worker_thumbnails = True
+_worker_profile = False
+
+
+def _init_worker(engine=AUTO, optimize=True, thumbnails=True, profile=False):
+    global _worker_styles, _worker_engine, _worker_optimize, _worker_thumbnails, _worker_profile
+    _worker_styles = create_styles()
+    _worker_engine = engine
+    _worker_optimize = optimize
+    _worker_thumbnails = thumbnails
+    _worker_profile = profile
+    if engine in (AUTO, WEASYPRINT) and engine_available(WEASYPRINT):
+        from .html_report import warm_up
+        warm_up()
+
+
+def render_one(job):
+    """Render one (source, destination) pair; never raises"""
+    source, destination = job
+    started = time.perf_counter()
+    try:
+        styles = _worker_styles if _worker_styles is not None else create_styles()
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = destination.with_name(f'.{destination.name}.{os.getpid()}.tmp')
+        profile = RenderProfile() if _worker_profile else None
+        engine, pages = render_report(load_report(source), str(tmp_path), engine=_worker_engine, styles=styles,
+                                      profile=profile)
+        # Only the ReportLab engine records stages; the post-processing is timed for all of them
+        if _worker_optimize:
+            if profile is not None:
+                profile.switch('optimize')
+            saved = optimize_file(tmp_path, linearize=True)['bytes_saved']
+        else:
+            saved = 0
+        os.replace(tmp_path, destination)
+        if _worker_thumbnails:
+            if profile is not None:
+                profile.switch('thumbnail')
+            write_thumbnail(destination.read_bytes(), thumbnail_path(destination))
+        if profile is not None:
+            profile.stop()
+            profile.write(profile_path(destination))
+        return {'source': str(source), 'output': str(destination), 'ok': True, 'pages': pages, 'engine': engine,
+                'bytes_saved': saved,
+                'seconds': time.perf_counter() - started}
+    except Exception as exc:  # noqa: BLE001 - report and continue with the batch
+        if 'tmp_path' in locals() and tmp_path.exists():
+            tmp_path.unlink()
+        return {'source': str(source), 'output': str(destination), 'ok': False,
+                'error': f'{type(exc).__name__}: {exc}', 'seconds': time.perf_counter() - started}
+
+
+def find_reports(root, pattern='report.json'):
+    """All files under root matching pattern, sorted for a stable order"""
+    return sorted(p for p in Path(root).rglob(pattern) if p.is_file())
+
+
+def plan_jobs(sources, root, output_dir=None):
+    """Pair each report.json with the PDF path it renders to"""
+    jobs = []
+    for source in sources:
+        if output_dir is None:
+            destination = source.with_suffix('.pdf')
+        else:
+            destination = Path(output_dir) / source.relative_to(root).with_suffix('.pdf')
+        jobs.append((source, destination))
+    return jobs
+
+
+def render_directory(root, output_dir=None, pattern='report.json', workers=None, chunksize=None, on_result=None,
+                     engine=AUTO, optimize=True, thumbnails=True, profile=False):
+    """Render every matching report under root in a process pool; returns the per-report results"""
+    root = Path(root)
+    jobs = plan_jobs(find_reports(root, pattern), root, output_dir)
+    if not jobs:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # Large enough to amortize IPC, small enough to keep every worker busy at the tail
+        chunksize = max(1, min(32, len(jobs) // (workers * 4)))
+
+    results = []
+
+    def collect(mapped):
+        for result in mapped:
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    if workers == 1:
+        _init_worker(engine, optimize, thumbnails, profile)
+        collect(map(render_one, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine, optimize, thumbnails, profile)) as pool:
+            collect(pool.map(render_one, jobs, chunksize=chunksize))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render report.json files to PDF in parallel')
+    parser.add_argument('root', help='Directory searched recursively for reports')
+    parser.add_argument('--output', '-o', help='Write PDFs here instead of next to each report')
+    parser.add_argument('--pattern', default='report.json', help='Filename glob to render (default: report.json)')
+    parser.add_argument('--workers', '-j', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--engine', choices=(AUTO,) + ENGINES, default=AUTO, help='PDF engine (default: auto)')
+    parser.add_argument('--no-optimize', dest='optimize', action='store_false', help='Skip the size optimization and linearization pass')
+    parser.add_argument('--no-thumbnails', dest='thumbnails', action='store_false', help="Don't write first-page PNG thumbnails")
+    parser.add_argument('--profile', action='store_true',
+                        help='Write a per-stage time and memory profile next to each PDF (<name>-profile.json)')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    def progress(result):
+        mark = '✅' if result['ok'] else '❌'
+        detail = f'{result["pages"]} pages, {result["engine"]}' if result['ok'] else result['error']
+        print(f'{mark} {result["source"]} ({detail}, {result["seconds"]:.2f}s)')
+
+    results = render_directory(args.root, args.output, args.pattern, args.workers, on_result=progress,
+                               engine=args.engine, optimize=args.optimize, thumbnails=args.thumbnails,
+                               profile=args.profile)
+    failed = [r for r in results if not r['ok']]
+    elapsed = time.perf_counter() - started
+
+    saved = sum(r.get('bytes_saved', 0) for r in results)
+    print(f'Rendered {len(results) - len(failed)}/{len(results)} reports in {elapsed:.1f}s '
+          f'(optimizer saved {saved / 1024:.1f} KB)')
+    for result in failed:
+        print(f'   FAILED {result["source"]}: {result["error"]}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Content-addressed on-disk cache for rendered report PDFs.
+
+The key is a SHA-256 over the canonical JSON of what the template actually
+sees (the normalized view model, so fields the PDF never shows don't bust the
+cache), the template version, the engine version and the locale. Identical
+documents therefore render once no matter how often the download button or a
+shared link is hit.
+
+Entries live at <root>/<key[:2]>/<key>.pdf. File mtime doubles as the
+last-access time for LRU eviction once the cache exceeds max_bytes or
+max_entries. The in-memory index is per process; a miss in the index still
+checks disk, so several server processes can share one cache directory.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+
+from .engines import AUTO, engine_version, render_report, select_engine
+from .renderer import ENGINE_VERSION, TEMPLATE_VERSION
+from .view_model import normalize_report
+
+DEFAULT_MAX_BYTES = 2 << 30
+# Post-processing applied to rendered PDFs before they are stored (see get_or_render)
+POSTPROCESS = 'optimized+linearized'
+
+
+def canonical_json(value):
+    """Stable serialization: sorted keys, no insignificant whitespace"""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def cache_key(report, locale=None, template_version=TEMPLATE_VERSION, engine=ENGINE_VERSION):
+    """Content hash identifying the PDF a report renders to"""
+    view = normalize_report(report)
+    locale = locale or view['meta']['locale']
+    payload = canonical_json({
+        'template': template_version,
+        'engine': engine,
+        'postprocess': POSTPROCESS,
+        'locale': locale,
+        'view': view,
+    })
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PdfCache:
+    """Size-bounded LRU of rendered PDFs keyed by content hash"""
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES, max_entries=None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # key -> size, least recently used first
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key):
+        return self.root / key[:2] / f'{key}.pdf'
+
+    def _load_index(self):
+        entries = []
+        for path in self.root.glob('*/*.pdf'):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, path.stem, st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+        self._evict()
+
+    def _touch(self, key):
+        self._index.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, key):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._bytes -= size
+
+    def _evict(self):
+        while self._index and (
+            self._bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._index) > self.max_entries)
+        ):
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def get(self, key, count=True):
+        """Cached PDF bytes for key, or None; count=False leaves the hit/miss counters alone"""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(key)
+                self.misses += count
+            return None
+        with self._lock:
+            if key not in self._index:
+                # Written by another process sharing the directory
+                self._index[key] = len(data)
+                self._bytes += len(data)
+            self._touch(key)
+            self.hits += count
+        return data
+
+    def put(self, key, data):
+        """Store PDF bytes under key, evicting least recently used entries as needed"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._forget(key)
+            self._index[key] = len(data)
+            self._bytes += len(data)
+            self._evict()
+
+    def get_or_render(self, report, locale=None, render=None, key=None, engine=AUTO, count=True, part_cache=None,
+                      background=False):
+        """Return (pdf_bytes, key, hit); renders and stores on a miss.
+
+        part_cache and background are handed to the parallel engine, which reuses
+        the sections it already holds and, for background renders, lets others go first.
+        """
+        engine = select_engine(report, engine)
+        key = key or cache_key(report, locale, engine=engine_version(engine))
+        data = self.get(key, count)
+        if data is not None:
+            return data, key, True
+
+        if render is None:
+            buf = BytesIO()
+            render_report(report, buf, engine=engine, part_cache=part_cache, background=background)
+            return self.put_rendered(key, buf.getvalue()), key, False
+        data = render(report)
+        self.put(key, data)
+        return data, key, False
+
+    def put_rendered(self, key, data):
+        """Optimize and linearize freshly rendered PDF bytes, store them and return what was stored"""
+        # Imported here so `python -m reporting.optimize` doesn't preload itself via the package
+        from .optimize import optimize_pdf
+
+        # Stored once, served many times: worth the extra pass. Linearized so
+        # browsers can show page 1 while the rest downloads.
+        data, optimized = optimize_pdf(data, linearize=True)
+        with self._lock:
+            self.bytes_saved += optimized['bytes_saved']
+        self.put(key, data)
+        return data
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'optimizer_bytes_saved': self.bytes_saved,
+                'entries': len(self._index),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,390 @@
+"""
+Long-lived PDF render service with pre-warmed worker processes.
+
+    cd backend
+    python -m reporting.daemon --socket /run/ava/render.sock --workers 2
+    python -m reporting.daemon --port 4200 --max-jobs 500 --max-rss-mb 512
+    python -m reporting.daemon --socket /run/ava/render.sock --engine reportlab
+
+Each worker imports ReportLab, builds the paragraph styles and renders one
+throwaway report at start-up; where WeasyPrint imports and --engine allows
+it, the HTML path loads its fonts and stylesheet and renders one as well.
+Font metrics and module state are warm before the first real job, which is
+rendered through engines.render_report like any other. Jobs arrive over
+HTTP (Unix socket or TCP):
+
+    POST /render[?engine=...]   body: report.json   ->  200 application/pdf
+    GET  /health                        ->  200 pool counters as JSON
+
+A worker is retired and replaced in the background after --max-jobs renders
+or once its resident set exceeds --max-rss-mb, which bounds the RSS growth
+long ReportLab sessions show from heap fragmentation.
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import resource
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs
+
+from .engines import AUTO, ENGINES, REPORTLAB, WEASYPRINT, engine_available, render_report, select_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_JOBS = 500
+DEFAULT_MAX_RSS_MB = 512
+DEFAULT_TIMEOUT = 60
+
+# Small but complete report used to warm each worker before it takes traffic
+WARMUP_REPORT = {
+    'run_id': 'WARMUP',
+    'score': 100,
+    'verdict': 'PASS',
+    'product': {'product_name': 'Warm-up', 'halal_enabled': True},
+    'findings': [{'id': 'W', 'title': 'Warm-up', 'status': 'warning', 'evidence': [{'excerpt': 'x'}]}],
+    'checks': [{'id': 'W', 'title': 'Warm-up', 'status': 'pass', 'detail': 'x'}],
+    'cross_check': {'matched': [{'field': 'x'}], 'mismatched': [{'field': 'y', 'note': 'z'}]},
+    'print_pack': {'signoff_fields': ['Date'], 'prepress_checklist': ['x']},
+    'halalChecks': [{'title': 'x', 'status': 'pass'}],
+    'next_steps': [{'priority': 'P1', 'task': 'x'}],
+}
+
+
+def current_rss_bytes():
+    """Resident set size of this process (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if peak > 1 << 32 else peak * 1024
+
+
+def _worker_main(conn, max_jobs, max_rss_bytes, engine=AUTO):
+    """Worker loop: warm up once, then render jobs until told to stop or due for recycling"""
+    from .theme import create_styles
+
+    styles = create_styles()
+    if engine != WEASYPRINT:
+        render_report(WARMUP_REPORT, BytesIO(), engine=REPORTLAB, styles=styles)
+    if engine in (AUTO, WEASYPRINT) and engine_available(WEASYPRINT):
+        from .html_report import warm_up
+        warm_up()
+        render_report(WARMUP_REPORT, BytesIO(), engine=WEASYPRINT)
+    conn.send(('ready', os.getpid()))
+
+    jobs = 0
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        report, job_engine = job
+
+        started = time.perf_counter()
+        buf = BytesIO()
+        try:
+            used, pages = render_report(report, buf, engine=job_engine or engine, styles=styles)
+            status, payload = 'ok', buf.getvalue()
+        except Exception as exc:  # noqa: BLE001 - reported back to the caller
+            status, payload, used, pages = 'error', f'{type(exc).__name__}: {exc}', None, 0
+
+        jobs += 1
+        rss = current_rss_bytes()
+        retire = jobs >= max_jobs or (max_rss_bytes and rss > max_rss_bytes)
+        conn.send((status, payload, {
+            'engine': used,
+            'pages': pages,
+            'render_ms': (time.perf_counter() - started) * 1000,
+            'worker_pid': os.getpid(),
+            'worker_jobs': jobs,
+            'worker_rss': rss,
+            'retire': bool(retire),
+        }))
+        if retire:
+            break
+    conn.close()
+
+
+class RenderError(Exception):
+    """The worker could not render the submitted report"""
+
+
+class _Worker:
+    def __init__(self, ctx, max_jobs, max_rss_bytes, engine):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, max_jobs, max_rss_bytes, engine), daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def wait_ready(self, timeout):
+        if not self.conn.poll(timeout):
+            raise TimeoutError('render worker did not start in time')
+        self.conn.recv()
+
+    def stop(self, timeout=5):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class RenderPool:
+    """Fixed-size set of warm render workers, recycled after N jobs or a memory ceiling"""
+
+    def __init__(self, workers=2, max_jobs=DEFAULT_MAX_JOBS, max_rss_bytes=DEFAULT_MAX_RSS_MB << 20,
+                 start_method='spawn', startup_timeout=60, engine=AUTO):
+        # Fail here rather than in every worker's warm-up
+        self.engine = select_engine(None, engine) if engine != AUTO else AUTO
+        self._ctx = multiprocessing.get_context(start_method)
+        self._max_jobs = max_jobs
+        self._max_rss_bytes = max_rss_bytes
+        self._startup_timeout = startup_timeout
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {
+            'workers': workers,
+            'engine': self.engine,
+            'jobs': 0,
+            'errors': 0,
+            'recycled': 0,
+            'crashed': 0,
+            'started_at': time.time(),
+        }
+        for _ in range(workers):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        worker = _Worker(self._ctx, self._max_jobs, self._max_rss_bytes, self.engine)
+        worker.wait_ready(self._startup_timeout)
+        return worker
+
+    def _replace(self, worker, counter):
+        """Retire a worker and add a warm replacement without blocking the caller"""
+        with self._lock:
+            self.stats[counter] += 1
+
+        def run():
+            worker.stop()
+            if not self._closed:
+                try:
+                    self._idle.put(self._spawn())
+                except Exception:  # noqa: BLE001
+                    logger.exception('Failed to start replacement render worker')
+
+        threading.Thread(target=run, name='render-worker-replace', daemon=True).start()
+
+    def render(self, report, timeout=DEFAULT_TIMEOUT, engine=None):
+        """Render a report dict on a warm worker; returns (pdf_bytes, stats)
+
+        engine overrides the pool's engine for this job (see engines.render_report).
+        """
+        if self._closed:
+            raise RuntimeError('render pool is closed')
+        worker = self._idle.get(timeout=timeout)
+        try:
+            worker.conn.send((report, engine))
+            if not worker.conn.poll(timeout):
+                raise TimeoutError(f'render did not finish within {timeout}s')
+            status, payload, stats = worker.conn.recv()
+        except (TimeoutError, EOFError, OSError):
+            self._replace(worker, 'crashed')
+            raise
+
+        if stats['retire']:
+            self._replace(worker, 'recycled')
+        else:
+            self._idle.put(worker)
+
+        with self._lock:
+            self.stats['jobs'] += 1
+            if status != 'ok':
+                self.stats['errors'] += 1
+        if status != 'ok':
+            raise RenderError(payload)
+        return payload, stats
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, idle=self._idle.qsize())
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'AVARender/1.0'
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, fmt, *args):
+        logger.info('%s - %s', self.address_string(), fmt % args)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.server.pool.snapshot())
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        path, _, query = self.path.partition('?')
+        if path != '/render':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        engine = parse_qs(query).get('engine', [None])[0]
+        if engine not in (None, AUTO) + ENGINES:
+            self._send_json(400, {'error': f'Unknown PDF engine: {engine}'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            report = json.loads(self.rfile.read(length) or b'null')
+        except ValueError:
+            self._send_json(400, {'error': 'Body must be a report.json document'})
+            return
+        if not isinstance(report, dict):
+            self._send_json(400, {'error': 'Body must be a report.json document'})
+            return
+
+        try:
+            pdf, stats = self.server.pool.render(report, timeout=self.server.job_timeout, engine=engine)
+        except RenderError as exc:
+            self._send_json(422, {'error': str(exc)})
+            return
+        except (TimeoutError, queue.Empty):
+            self._send_json(503, {'error': 'Render timed out'})
+            return
+        except (EOFError, OSError):
+            self._send_json(500, {'error': 'Render worker crashed'})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(pdf)))
+        self.send_header('X-Render-Ms', f'{stats["render_ms"]:.1f}')
+        self.send_header('X-Render-Pages', str(stats['pages']))
+        self.send_header('X-Render-Engine', stats['engine'])
+        self.end_headers()
+        self.wfile.write(pdf)
+
+
+class UnixHTTPServer(ThreadingHTTPServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        self.socket.bind(self.server_address)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+
+def create_server(pool, socket_path=None, host='127.0.0.1', port=4200, job_timeout=DEFAULT_TIMEOUT):
+    """HTTP server bound to a Unix socket (preferred) or a local TCP port"""
+    if socket_path:
+        server = UnixHTTPServer(socket_path, RenderRequestHandler)
+        os.chmod(socket_path, 0o660)
+    else:
+        server = ThreadingHTTPServer((host, port), RenderRequestHandler)
+    server.daemon_threads = True
+    server.pool = pool
+    server.job_timeout = job_timeout
+    return server
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=DEFAULT_TIMEOUT):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def render_remote(report, socket_path=None, host='127.0.0.1', port=4200, timeout=DEFAULT_TIMEOUT, engine=None):
+    """Client helper: render a report dict on a running daemon and return the PDF bytes"""
+    if socket_path:
+        conn = UnixHTTPConnection(socket_path, timeout=timeout)
+    else:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        body = json.dumps(report).encode('utf-8')
+        path = f'/render?engine={engine}' if engine else '/render'
+        conn.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        data = response.read()
+        if response.status != 200:
+            raise RenderError(f'{response.status}: {data.decode("utf-8", "replace")}')
+        return data
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resident report PDF render service')
+    parser.add_argument('--socket', help='Unix socket path to listen on (takes precedence over --port)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=4200)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--engine', choices=(AUTO,) + ENGINES, default=AUTO,
+                        help='Engine for jobs that do not pick one with ?engine=')
+    parser.add_argument('--max-jobs', type=int, default=DEFAULT_MAX_JOBS, help='Recycle a worker after this many renders')
+    parser.add_argument('--max-rss-mb', type=int, default=DEFAULT_MAX_RSS_MB, help='Recycle a worker above this RSS (0 disables)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='Per-job timeout in seconds')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    pool = RenderPool(workers=args.workers, max_jobs=args.max_jobs, max_rss_bytes=args.max_rss_mb << 20,
+                      engine=args.engine)
+    server = create_server(pool, args.socket, args.host, args.port, args.timeout)
+    logger.info('Render service ready on %s with %d warm workers', args.socket or f'{args.host}:{args.port}', args.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    main()
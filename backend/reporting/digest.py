@@ -0,0 +1,249 @@
+"""
+Portfolio digest: one PDF over the latest run of many products.
+
+The digest opens with a summary table (score, verdict and finding counts per
+product) followed by each product's condensed findings. It is laid out in a
+single document pass: all products share one set of styles, one header form
+XObject, the fonts and the table styles, instead of 200 reports each bringing
+their own and being concatenated afterwards.
+
+Memory stays bounded as the product count grows. The first pass keeps only
+a small summary per run. The second pass loads one report.json at a time and
+hands platypus its flowables through a short lookahead queue (_FlowableFeed),
+so laid-out products are dropped as soon as their pages are drawn. What
+remains is the compressed page content ReportLab holds until save().
+A report.json that can't be read or normalized is logged and left out, so
+one broken run never fails the digest.
+
+    cd backend
+    python -m reporting.digest /srv/ava/data/runs -o digest.pdf
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from reportlab.platypus import KeepTogether, PageBreak, Paragraph, SimpleDocTemplate, Spacer, TableStyle
+
+from .fragments import FRAME_WIDTH
+from .pages import score_color, status_color, status_icon
+from .paragraphs import para
+from .renderer import PageCountCanvas, draw_footer, draw_header, load_report
+from .tables import long_table
+from .theme import (
+    BORDER_COLOR, LIGHT_BG, MARGIN_BOTTOM, MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, PAGE_SIZE, PRIMARY_BLUE,
+    create_styles,
+)
+from .view_model import normalize_report
+
+logger = logging.getLogger(__name__)
+
+DIGEST_TITLE = 'Portfolio Compliance Digest'
+# Flowables queued ahead of the layout; more are built as platypus consumes them
+LOOKAHEAD_FLOWABLES = 64
+
+SUMMARY_COLUMNS = [140, 105, 45, 88, 40, 40, 40]
+FINDINGS_COLUMNS = [20, 170, FRAME_WIDTH - 190]
+
+# One instance of each table style for the whole document
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), LIGHT_BG),
+    ('TEXTCOLOR', (0, 0), (-1, 0), PRIMARY_BLUE),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('ALIGN', (4, 0), (-1, -1), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LINEBELOW', (0, 0), (-1, -1), 0.5, BORDER_COLOR),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+])
+FINDINGS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), LIGHT_BG),
+    ('TEXTCOLOR', (0, 0), (-1, 0), PRIMARY_BLUE),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LINEBELOW', (0, 0), (-1, -1), 0.5, BORDER_COLOR),
+    ('TOPPADDING', (0, 0), (-1, -1), 3),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+])
+
+
+def summarize(path):
+    """The little the digest keeps about one run until its findings are laid out"""
+    view = normalize_report(load_report(path))
+    product = view['sections'][0]['product']
+    summary = view['summary']
+    return {
+        'path': str(path),
+        'run_id': view['meta']['run_id'],
+        'created_at': view['meta']['created_at'],
+        'product_name': product['product_name'],
+        'company_name': product['company_name'],
+        'score': summary['score'],
+        'verdict': summary['verdict'],
+        'counts': summary['counts'],
+    }
+
+
+def summarize_all(paths):
+    """Summaries of the readable reports among paths, in order; the others are logged and skipped"""
+    entries = []
+    for path in paths:
+        try:
+            entries.append(summarize(path))
+        except Exception as exc:  # noqa: BLE001 - skip the report and continue with the digest
+            logger.warning('Leaving %s out of the digest: %s: %s', path, type(exc).__name__, exc)
+    return entries
+
+
+def latest_runs(root):
+    """Summaries of the most recent run per product (company and product name) under root"""
+    latest = {}
+    for entry in summarize_all(sorted(Path(root).rglob('report.json'))):
+        key = (entry['company_name'], entry['product_name'])
+        current = latest.get(key)
+        if current is None or str(entry['created_at'] or '') > str(current['created_at'] or ''):
+            latest[key] = entry
+    return sorted(latest.values(), key=lambda e: (e['product_name'].lower(), e['company_name'].lower()))
+
+
+def _verdict(entry):
+    return entry['verdict'].replace('_', ' ').title()
+
+
+def summary_table(entries, styles):
+    cell = styles['SmallText']
+    rows = [['Product', 'Company', 'Score', 'Verdict', 'Critical', 'Warnings', 'Passed']]
+    for entry in entries:
+        counts = entry['counts']
+        rows.append([
+            Paragraph(f'<b>{escape(entry["product_name"])}</b>', cell),
+            Paragraph(escape(entry['company_name']), cell),
+            para(f'<font color="{score_color(entry["score"])}"><b>{escape(str(entry["score"]))}%</b></font>', cell),
+            para(escape(_verdict(entry)), cell),
+            counts['critical'], counts['warnings'], counts['passed'],
+        ])
+    return long_table(rows, SUMMARY_COLUMNS, SUMMARY_TABLE_STYLE)
+
+
+def product_flowables(entry, styles):
+    """Heading and condensed findings of one product, loaded from its report.json"""
+    findings = normalize_report(load_report(entry['path']))['sections'][1]['findings']
+    counts = entry['counts']
+    heading = [
+        Paragraph(
+            f'<b>{escape(entry["product_name"])}</b> &nbsp; <font size="9" color="#666666">'
+            f'{escape(entry["company_name"])}</font>',
+            styles['SectionTitle'],
+        ),
+        Paragraph(
+            f'<font color="{score_color(entry["score"])}"><b>{escape(str(entry["score"]))}%</b></font> · '
+            f'{escape(_verdict(entry))} · {counts["critical"]} critical, {counts["warnings"]} warnings, '
+            f'{counts["passed"]} passed · <font color="#94a3b8">Run {escape(entry["run_id"])}</font>',
+            styles['SmallText'],
+        ),
+        Spacer(1, 6),
+    ]
+    if not findings:
+        return [KeepTogether(heading + [para('No issues were identified for this run.', styles['SmallText'])]),
+                Spacer(1, 14)]
+
+    cell = styles['SmallText']
+    rows = [['', 'Finding', 'Recommended fix']]
+    for finding in findings:
+        color = status_color(finding['status'])
+        rows.append([
+            para(f'<font color="{color}">{status_icon(finding["status"])}</font>', cell),
+            Paragraph(f'<b>{escape(finding["title"])}</b>', cell),
+            para(escape(finding['fix']), cell),
+        ])
+    table = long_table(rows, FINDINGS_COLUMNS, FINDINGS_TABLE_STYLE)
+    # Keep the heading with the first rows of its table
+    return [KeepTogether(heading), table, Spacer(1, 14)] if len(rows) > 12 else [KeepTogether(heading + [table]), Spacer(1, 14)]
+
+
+def digest_story(entries, styles):
+    """Flowables of the whole digest, built lazily product by product"""
+    yield Paragraph(DIGEST_TITLE, styles['MainTitle'])
+    yield Paragraph(
+        f'Latest run of {len(entries)} product{"" if len(entries) == 1 else "s"} · '
+        'Automated verification against Regulation (EU) 1169/2011',
+        styles['Subtitle'],
+    )
+    yield Spacer(1, 10)
+    yield summary_table(entries, styles)
+    if entries:
+        yield PageBreak()
+    for entry in entries:
+        try:
+            flowables = product_flowables(entry, styles)
+        except Exception as exc:  # noqa: BLE001 - changed since it was summarized; skip its details
+            logger.warning('Leaving the findings of %s out of the digest: %s: %s', entry['path'], type(exc).__name__, exc)
+            continue
+        yield from flowables
+
+
+class _FlowableFeed(list):
+    """Flowable list that platypus consumes from the front, topped up from an iterator as it shrinks"""
+
+    def __init__(self, source, lookahead=LOOKAHEAD_FLOWABLES):
+        super().__init__()
+        self._source = iter(source)
+        self._lookahead = lookahead
+
+    def __len__(self):
+        if self._source is not None and super().__len__() < self._lookahead:
+            for flowable in self._source:
+                self.append(flowable)
+                if super().__len__() >= 2 * self._lookahead:
+                    break
+            else:
+                self._source = None
+        return super().__len__()
+
+
+def _draw_digest_page(canvas, doc):
+    draw_header(canvas, run_id=None)
+    draw_footer(canvas, doc.page)
+
+
+def render_digest(entries, output, styles=None):
+    """Render the digest of entries (from latest_runs or summarize) to a path or binary file; returns the page count"""
+    if styles is None:
+        styles = create_styles()
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=PAGE_SIZE,
+        rightMargin=MARGIN_RIGHT,
+        leftMargin=MARGIN_LEFT,
+        topMargin=MARGIN_TOP,
+        bottomMargin=MARGIN_BOTTOM,
+        title=DIGEST_TITLE,
+        author='Nexodify AVA',
+    )
+    doc.build(
+        _FlowableFeed(digest_story(entries, styles)),
+        onFirstPage=_draw_digest_page, onLaterPages=_draw_digest_page, canvasmaker=PageCountCanvas,
+    )
+    return doc.page
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render one digest PDF over the latest run of every product')
+    parser.add_argument('root', help='Directory searched recursively for report.json files')
+    parser.add_argument('-o', '--output', default='digest.pdf', help='PDF to write (default: digest.pdf)')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    entries = latest_runs(args.root)
+    pages = render_digest(entries, args.output)
+    print(f'{args.output}: {len(entries)} products, {pages} pages ({time.perf_counter() - started:.2f}s)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
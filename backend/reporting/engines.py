@@ -0,0 +1,141 @@
+"""
+Single entry point over the PDF engines: render_report(report, output, engine='auto').
+
+'reportlab' lays out the data-driven page builders directly and stays cheap
+per check. 'weasyprint' renders the HTML template, which matches the richer
+web styling but whose layout cost grows much faster with document size.
+'reportlab-parallel' lays sections out across a process pool and merges them
+(reporting.parallel). 'auto' uses the HTML path for small reports, ReportLab
+for large ones and the parallel path for very large ones when more than one
+CPU is available. If the chosen engine can't be imported on this host, it
+falls back to plain ReportLab.
+"""
+
+import contextlib
+import io
+import logging
+import multiprocessing
+import os
+from functools import lru_cache
+from importlib import metadata
+
+from .fonts import use_bundled_fonts
+from .renderer import ENGINE_VERSION, render_pdf
+from .view_model import normalize_report
+
+logger = logging.getLogger(__name__)
+
+AUTO = 'auto'
+REPORTLAB = 'reportlab'
+WEASYPRINT = 'weasyprint'
+PARALLEL = 'reportlab-parallel'
+ENGINES = (REPORTLAB, WEASYPRINT, PARALLEL)
+
+# Reports heavier than this go to ReportLab under 'auto'. Weight is appendix
+# rows plus findings, each finding counted twice (overview + evidence page).
+AUTO_HTML_MAX_WEIGHT = 60
+# ...and heavier than this to the process pool, where the fan-out and merge pay off
+AUTO_PARALLEL_MIN_WEIGHT = 600
+
+
+class EngineUnavailable(RuntimeError):
+    """The requested engine can't be imported on this host"""
+
+
+@lru_cache(maxsize=None)
+def engine_available(engine):
+    """True if the engine's dependencies import cleanly"""
+    if engine == REPORTLAB:
+        return True
+    if engine == WEASYPRINT:
+        try:
+            # WeasyPrint prints an installation banner to stdout before raising
+            # fontconfig reads its configuration when Pango loads, i.e. on this import
+            use_bundled_fonts()
+            with contextlib.redirect_stdout(io.StringIO()):
+                import weasyprint  # noqa: F401
+        except (ImportError, OSError) as exc:
+            # OSError: installed, but the Pango/Cairo shared libraries are missing
+            logger.warning('PDF engine weasyprint unavailable: %s', exc)
+            return False
+        return True
+    if engine == PARALLEL:
+        try:
+            import pypdf  # noqa: F401
+        except ImportError as exc:
+            logger.warning('PDF engine %s unavailable: %s', PARALLEL, exc)
+            return False
+        return True
+    raise ValueError(f'Unknown PDF engine: {engine}')
+
+
+def available_engines():
+    return [engine for engine in ENGINES if engine_available(engine)]
+
+
+@lru_cache(maxsize=None)
+def engine_version(engine):
+    """Version string that goes into cache keys"""
+    if engine == REPORTLAB:
+        return ENGINE_VERSION
+    if engine == PARALLEL:
+        return f'{ENGINE_VERSION}+pypdf-{metadata.version("pypdf")}'
+    return f'{engine}-{metadata.version(engine)}'
+
+
+def report_weight(view):
+    """Rough layout cost of a normalized report"""
+    weight = 0
+    for section in view['sections']:
+        if section['id'] == 'checks_appendix':
+            weight += len(section['checks'])
+        elif section['id'] == 'findings_overview':
+            weight += 2 * len(section['findings'])
+    return weight
+
+
+def _can_fan_out():
+    # Never start a pool from inside a batch, daemon or pool worker
+    return (os.cpu_count() or 1) > 1 and multiprocessing.parent_process() is None
+
+
+def select_engine(report, engine=AUTO, view=None):
+    """Resolve 'auto' (and unavailable engines under it) to a concrete engine name"""
+    if engine != AUTO:
+        if engine not in ENGINES:
+            raise ValueError(f'Unknown PDF engine: {engine}')
+        if not engine_available(engine):
+            raise EngineUnavailable(f'PDF engine {engine!r} is not available on this host')
+        return engine
+
+    view = view or normalize_report(report)
+    weight = report_weight(view)
+    if weight <= AUTO_HTML_MAX_WEIGHT:
+        preferred = WEASYPRINT
+    elif weight >= AUTO_PARALLEL_MIN_WEIGHT and _can_fan_out():
+        preferred = PARALLEL
+    else:
+        preferred = REPORTLAB
+    if engine_available(preferred):
+        return preferred
+    return REPORTLAB
+
+
+def render_report(report, output, engine=AUTO, styles=None, part_cache=None, profile=None, background=False):
+    """Render a report.json dict with the given (or automatically chosen) engine.
+
+    Returns (engine, page_count). styles and profile (a RenderProfile) are
+    only used by the ReportLab engine, part_cache (reused section parts) and
+    background (give way to other renders in the shared process pool) only
+    by the parallel engine.
+    """
+    engine = select_engine(report, engine)
+    if engine == WEASYPRINT:
+        from .html_report import render_html_pdf
+        return engine, render_html_pdf(report, output)
+    if engine == PARALLEL:
+        from .parallel import render_parallel
+        # A pool of one would only add process overhead
+        workers = None if _can_fan_out() else 1
+        return engine, render_parallel(report, output, workers=workers, part_cache=part_cache, background=background)
+    return engine, render_pdf(report, output, styles=styles, profile=profile)
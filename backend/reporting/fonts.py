@@ -0,0 +1,58 @@
+"""
+Bundled fonts for the WeasyPrint path.
+
+The HTML report used to ask for 'Segoe UI', system-ui and friends, which
+fontconfig resolved against whatever each host had installed, scanning the
+system font directories on every cold start. templates/fonts ships DejaVu
+Sans (and Sans Mono) with a fonts.conf that makes those the only fonts
+WeasyPrint can see, so every host lays the report out with the same faces.
+
+fontconfig reads FONTCONFIG_FILE once, when Pango first loads, so
+use_bundled_fonts() has to run before WeasyPrint is imported. Build the font
+cache at deploy time so the first render doesn't scan the fonts:
+
+    cd backend
+    python -m reporting.fonts
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+FONTS_DIR = Path(__file__).parent / 'templates' / 'fonts'
+FONTCONFIG_FILE = FONTS_DIR / 'fonts.conf'
+# <cachedir prefix="relative"> in fonts.conf
+FONT_CACHE_DIR = FONTS_DIR / 'cache'
+
+
+def use_bundled_fonts():
+    """Point fontconfig at the bundled fonts; a FONTCONFIG_FILE set by the deployment wins"""
+    os.environ.setdefault('FONTCONFIG_FILE', str(FONTCONFIG_FILE))
+
+
+def build_font_cache():
+    """Prebuild the fontconfig cache for the bundled fonts; False if fc-cache isn't installed"""
+    fc_cache = shutil.which('fc-cache')
+    if fc_cache is None:
+        logger.warning('fc-cache not found; fontconfig will build the font cache on the first render')
+        return False
+    env = dict(os.environ, FONTCONFIG_FILE=str(FONTCONFIG_FILE))
+    subprocess.run([fc_cache, '--force', str(FONTS_DIR)], env=env, check=True)
+    return True
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if not build_font_cache():
+        return 1
+    print(f'Built font cache in {FONT_CACHE_DIR}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Static report fragments laid out once and reused by every render in the process.
+
+The print-pack sign-off block and checklists, the Halal disclaimer and the
+closing call to action are the same text in nearly every report. Parsing their
+paragraph markup and wrapping their tables costs the same on every render, so
+each distinct fragment is built and wrapped once, keyed by its content, and
+later documents draw the already laid-out flowables as they are. The cache
+lives for the life of the process. A deploy with a new TEMPLATE_VERSION starts
+fresh processes, so a layout never outlives the template that produced it.
+
+Reports that carry different text simply get their own cache entry.
+"""
+
+import threading
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from reportlab.platypus import Flowable, Paragraph, Spacer, Table, TableStyle
+
+from .theme import (
+    CONTENT_WIDTH, PAGE_HEIGHT, MUTED_TEXT, PRINT_PACK_BG, PRINT_PACK_BORDER,
+    HALAL_NOTE_BG, HALAL_NOTE_TEXT, create_styles,
+)
+
+# Distinct fragments kept per process
+FRAGMENT_CACHE_SIZE = 256
+# Width available to flowables in the content frame (SimpleDocTemplate pads 6pt each side)
+FRAME_WIDTH = CONTENT_WIDTH - 12
+
+
+@lru_cache(maxsize=None)
+def _styles():
+    return create_styles()
+
+
+class Layout:
+    """Flowables wrapped once at a fixed width, with their stacked positions"""
+
+    def __init__(self, flowables, width=FRAME_WIDTH):
+        self.lock = threading.Lock()
+        self.width = width
+        self.flowables = flowables
+        self.space_before = flowables[0].getSpaceBefore() if flowables else 0
+        self.space_after = flowables[-1].getSpaceAfter() if flowables else 0
+        self.placed = []  # (flowable, width, top, bottom), offsets from the top of the layout
+        y = 0
+        previous_after = None
+        for flowable in flowables:
+            if previous_after is not None:
+                # Same collapsing Frame applies between neighbours
+                y += max(previous_after, flowable.getSpaceBefore())
+            w, h = flowable.wrap(width, PAGE_HEIGHT)
+            self.placed.append((flowable, w, y, y + h))
+            y += h
+            previous_after = flowable.getSpaceAfter()
+        self.height = y
+
+
+class PrelaidFragment(Flowable):
+    """Per-document handle drawing a shared Layout (or its flowables start:end) without laying it out again"""
+
+    def __init__(self, layout, start=0, end=None):
+        super().__init__()
+        self.layout = layout
+        self.start = start
+        self.end = len(layout.placed) if end is None else end
+
+    def _offset(self):
+        return self.layout.placed[self.start][2] if self.start < self.end else 0
+
+    def wrap(self, availWidth, availHeight):
+        if self.start >= self.end:
+            return self.layout.width, 0
+        return self.layout.width, self.layout.placed[self.end - 1][3] - self._offset()
+
+    def split(self, availWidth, availHeight):
+        """Break between the laid-out flowables, after the last one that fits"""
+        placed = self.layout.placed
+        offset = self._offset()
+        fits = self.start
+        while fits < self.end and placed[fits][3] - offset <= availHeight:
+            fits += 1
+        if fits == self.start or fits == self.end:
+            return []
+        return [PrelaidFragment(self.layout, self.start, fits), PrelaidFragment(self.layout, fits, self.end)]
+
+    def getSpaceBefore(self):
+        if self.start == 0:
+            return self.layout.space_before
+        return self.layout.placed[self.start][0].getSpaceBefore()
+
+    def getSpaceAfter(self):
+        if self.end == len(self.layout.placed):
+            return self.layout.space_after
+        return self.layout.placed[self.end - 1][0].getSpaceAfter()
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        layout = self.layout
+        top = y + self.wrap(layout.width, 0)[1] + self._offset()
+        # drawOn briefly sets .canv on the shared flowables; one document at a time
+        with layout.lock:
+            for flowable, w, _, bottom in layout.placed[self.start:self.end]:
+                flowable.drawOn(canvas, x, top - bottom, _sW=layout.width - w)
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _signoff_layout(fields):
+    signoff_data = [[Paragraph('<font color="#16a34a">📋 VERSIONING & SIGN-OFF</font>', _styles()['CardTitle']), '', '', '']]
+    for i in range(0, len(fields), 2):
+        pair = fields[i:i + 2]
+        row = []
+        for field in pair:
+            row.extend([f'{field}:', '_________________'])
+        row.extend([''] * (4 - len(row)))
+        signoff_data.append(row)
+    signoff_data.append(['Final Print Run Notes:', '', '', ''])
+    signoff_data.append(['_' * 96, '', '', ''])
+    notes_row = len(signoff_data) - 2
+
+    signoff_table = Table(signoff_data, colWidths=[100, 110, 100, 110])
+    signoff_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), PRINT_PACK_BG),
+        ('BOX', (0, 0), (-1, -1), 1, PRINT_PACK_BORDER),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('TEXTCOLOR', (0, 1), (-1, -1), MUTED_TEXT),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('LEFTPADDING', (0, 0), (-1, -1), 10),
+        ('SPAN', (0, 0), (3, 0)),
+        ('SPAN', (0, notes_row), (3, notes_row)),
+        ('SPAN', (0, notes_row + 1), (3, notes_row + 1)),
+    ]))
+    return Layout([signoff_table])
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _checklist_layout(title, items):
+    styles = _styles()
+    return Layout(
+        [Paragraph(title, styles['CardTitle'])]
+        + [Paragraph(f'☐ {escape(item)}', styles['SmallText']) for item in items]
+    )
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _halal_disclaimer_layout(text):
+    disclaimer_table = Table([[Paragraph(f'<b>Important:</b> {escape(text)}', _styles()['SmallText'])]], colWidths=[CONTENT_WIDTH])
+    disclaimer_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), HALAL_NOTE_BG),
+        ('TEXTCOLOR', (0, 0), (-1, -1), HALAL_NOTE_TEXT),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('LEFTPADDING', (0, 0), (-1, -1), 12),
+    ]))
+    return Layout([disclaimer_table])
+
+
+@lru_cache(maxsize=1)
+def _call_to_action_layout():
+    styles = _styles()
+    return Layout([
+        Spacer(1, 25),
+        Paragraph('READY TO PREFLIGHT YOUR LABELS?', styles['CardTitle']),
+        Paragraph('Run your next preflight at nexodify.com', styles['SmallText']),
+    ])
+
+
+def signoff_block(fields):
+    """Print pack "Versioning & Sign-off" table"""
+    return PrelaidFragment(_signoff_layout(tuple(fields)))
+
+
+def checklist(title, items):
+    """Card title followed by one ☐ line per item"""
+    return PrelaidFragment(_checklist_layout(title, tuple(items)))
+
+
+def halal_disclaimer(text):
+    return PrelaidFragment(_halal_disclaimer_layout(text))
+
+
+def call_to_action():
+    """Closing "Ready to preflight" block of the next-steps page"""
+    return PrelaidFragment(_call_to_action_layout())
+
+
+def cache_info():
+    """Hit/miss counters of the fragment caches"""
+    return {
+        name: fn.cache_info()._asdict()
+        for name, fn in (
+            ('signoff', _signoff_layout),
+            ('checklist', _checklist_layout),
+            ('halal_disclaimer', _halal_disclaimer_layout),
+            ('call_to_action', _call_to_action_layout),
+        )
+    }
@@ -0,0 +1,315 @@
+"""
+HTML renderer for the compliance report (WeasyPrint path).
+
+Renders the same view model as reporting.pages, section for section, as HTML
+styled by templates/report.css. WeasyPrint is imported lazily: it needs Pango
+at runtime, and hosts without it still render through ReportLab.
+
+The per-report work is only the data. Each thread keeps one
+FontConfiguration and the parsed stylesheet, so the bundled fonts
+(reporting.fonts) are loaded and the CSS parsed once per template version,
+not per render. Blocks that carry the same text in nearly every report
+(print-pack checklists, category chips, the Halal disclaimer) are built once
+per distinct content, as reporting.fragments does for the ReportLab path.
+"""
+
+import threading
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+
+from .fonts import use_bundled_fonts
+from .pages import CATEGORIES, HALAL_DISCLAIMER, status_icon
+from .renderer import TEMPLATE_VERSION
+from .view_model import NOT_PROVIDED, normalize_report
+
+TEMPLATES_DIR = Path(__file__).parent / 'templates'
+STYLESHEET = TEMPLATES_DIR / 'report.css'
+# Distinct static blocks kept per process
+FRAGMENT_CACHE_SIZE = 256
+
+_warm = threading.local()
+
+
+def section_title(section, badge):
+    return (
+        f'<div class="section-title"><span class="section-badge">{escape(badge)}</span>'
+        f'{escape(section["title"])}</div>'
+    )
+
+
+def badge(status):
+    return f'<span class="badge badge-{escape(status)}">{escape(status)}</span>'
+
+
+def html_executive_summary(section):
+    product = section['product']
+    summary = section['summary']
+    counts = summary['counts']
+    rows = ''.join(
+        f'<div class="info-row"><span class="info-label">{label}</span>'
+        f'<span class="info-value">{escape(product[key])}</span></div>'
+        for label, key in (
+            ('Product Name', 'product_name'),
+            ('Company', 'company_name'),
+            ('Country of Sale', 'country_of_sale'),
+            ('Languages', 'languages_provided'),
+            ('Category', 'category'),
+        )
+    )
+    score = summary['score']
+    score_status = 'pass' if score >= 85 else 'warning' if score >= 60 else 'critical'
+    included = ''.join(
+        f'<div>{"✓" if item != NOT_PROVIDED else "–"} {escape(item)}</div>' for item in section['included']
+    )
+    return (
+        '<div class="title-section">'
+        '<div class="title">EU Label Compliance, <span>Preflighted.</span></div>'
+        '<div class="subtitle">Automated verification against Regulation (EU) 1169/2011</div>'
+        '</div>'
+        '<div class="grid-2">'
+        f'<div class="card"><div class="card-title">Product Information</div>{rows}</div>'
+        '<div class="score-card">'
+        f'<div class="score-value status-{score_status}">{escape(str(score))}%</div>'
+        '<div class="score-label">Compliance Score</div>'
+        f'<div class="score-label">Verdict: {escape(summary["verdict"].replace("_", " ").title())} · '
+        f'Evidence confidence {escape(str(summary["evidence_confidence"]))}%</div>'
+        '<div class="score-pills">'
+        f'<span class="pill pill-critical">{counts["critical"]} Critical</span>'
+        f'<span class="pill pill-warning">{counts["warnings"]} Warnings</span>'
+        f'<span class="pill pill-pass">{counts["passed"]} Passed</span>'
+        '</div></div></div>'
+        f'<div class="card"><div class="card-title">What\'s Included in This Report</div><div class="grid-2">{included}</div></div>'
+    )
+
+
+def html_findings_overview(section):
+    findings = section['findings']
+    issues = len(findings)
+    parts = [
+        f'<div class="section-title"><span class="section-badge">Findings</span>'
+        f'{issues} Issue{"" if issues == 1 else "s"} Identified</div>'
+    ]
+    if not findings:
+        parts.append('<p class="text-sm text-muted">No issues were identified for this run.</p>')
+    for finding in findings:
+        parts.append(
+            '<div class="finding">'
+            f'<div class="finding-icon status-{escape(finding["status"])}">{status_icon(finding["status"])}</div>'
+            '<div class="finding-content"><div>'
+            f'<span class="finding-title">{escape(finding["title"])}</span>'
+            f'{badge(finding["status"])} <span class="badge badge-source">{escape(finding["source"])}</span>'
+            f'</div><div class="finding-fix">{escape(finding["fix"])}</div></div></div>'
+        )
+    return ''.join(parts)
+
+
+def html_evidence_details(section):
+    parts = [section_title(section, 'Evidence')]
+    if not section['findings']:
+        parts.append('<p class="text-sm text-muted">No findings require evidence review.</p>')
+    for finding in section['findings']:
+        excerpts = ''.join(
+            f'<div><span class="evidence-text">"{escape(entry["excerpt"])}"</span>'
+            f'<span class="evidence-source"> — {escape(entry["source"])}'
+            f'{", p. " + escape(str(entry["page"])) if entry["page"] is not None else ""}</span></div>'
+            for entry in finding['evidence']
+        ) or '<div class="evidence-text">No excerpt captured.</div>'
+        detail = f'<div class="evidence-source">{escape(finding["detail"])}</div>' if finding['detail'] else ''
+        parts.append(
+            '<div class="evidence-block">'
+            f'<div>{badge(finding["status"])} <span class="finding-title">{escape(finding["title"])}</span></div>'
+            '<div class="evidence-box">'
+            f'<div class="evidence-label">Evidence ({escape(finding["source"])} excerpt)</div>{excerpts}{detail}</div>'
+            f'<div class="fix-steps"><div class="evidence-label">Recommended fix</div>{escape(finding["fix"])}</div>'
+            f'<div class="reference">Reference: {escape(finding["reference"])}</div>'
+            '</div>'
+        )
+    return ''.join(parts)
+
+
+def html_crosscheck(section):
+    matched = ''.join(
+        f'<div class="match-item"><span>{escape(item["field"])}</span>'
+        f'<span class="match-status">✓ {escape(item["note"] or "Match")}</span></div>'
+        for item in section['matched']
+    )
+    mismatched = ''.join(
+        f'<div class="mismatch-item"><div>{escape(item["field"])}'
+        f'<div class="mismatch-note">⚠ {escape(item["note"])}</div></div>'
+        '<span class="mismatch-status">Mismatch</span></div>'
+        for item in section['mismatched']
+    )
+    category = section['category_label']
+    return (
+        section_title(section, 'Cross-Check')
+        + '<div class="grid-2">'
+        f'<div class="card"><div class="card-title status-pass">✓ Matched ({len(section["matched"])})</div>{matched}</div>'
+        f'<div class="card"><div class="card-title status-critical">✕ Mismatched ({len(section["mismatched"])})</div>{mismatched}</div>'
+        '</div>'
+        '<div class="card-title">Category-Aware Checks</div>'
+        f'<p class="text-sm text-muted">This report applies EU 1169/2011 checks tailored for the <b>{escape(category)}</b> category.</p>'
+        f'<p>{_category_chips(category)}</p>'
+    )
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _category_chips(category):
+    return ' • '.join(
+        f'<span class="chip chip-active">{escape(name)} ✓</span>' if name == category
+        else f'<span class="chip">{escape(name)}</span>'
+        for name in CATEGORIES
+    )
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _print_pack_checklists(signoff_fields, prepress_checklist, attachments_checklist):
+    signoff = ''.join(
+        f'<div class="signoff-field"><div class="signoff-label">{escape(field)}:</div></div>'
+        for field in signoff_fields
+    )
+    prepress = ''.join(f'<div class="checklist-item">☐ {escape(item)}</div>' for item in prepress_checklist)
+    parts = [
+        '<div class="print-section"><div class="print-title">📋 Versioning &amp; Sign-off</div>',
+        f'<div class="grid-2">{signoff}</div>',
+        '<div class="signoff-field"><div class="signoff-label">Final Print Run Notes:</div></div></div>',
+        f'<div class="card-title">Pre-Press Checklist</div>{prepress}',
+    ]
+    if attachments_checklist:
+        parts.append('<div class="card-title">What to Send to Printer</div>')
+        parts.extend(f'<div class="checklist-item">☐ {escape(item)}</div>' for item in attachments_checklist)
+    return ''.join(parts)
+
+
+def html_print_pack(section):
+    parts = [
+        f'<div class="section-title"><span class="section-badge">Print Pack</span>{escape(section["title"])} (Pre-Press Checklist)</div>',
+        _print_pack_checklists(
+            tuple(section['signoff_fields']), tuple(section['prepress_checklist']),
+            tuple(section['attachments_checklist']),
+        ),
+    ]
+    if section['printer_notes']:
+        parts.append(f'<p class="text-sm text-muted"><i>{escape(section["printer_notes"])}</i></p>')
+    return ''.join(parts)
+
+
+def html_halal(section):
+    checks = ''.join(
+        '<div class="halal-check">'
+        f'<div><b>{escape(check["title"])}</b> {badge(check["status"])}</div>'
+        f'<div class="halal-detail">{escape(check["detail"])}</div>'
+        + (f'<div class="halal-fix">Fix: {escape(check["fix"])}</div>' if check['fix'] else '')
+        + '</div>'
+        for check in section['items']
+    )
+    return (
+        f'<div class="section-title"><span class="section-badge">Optional Module</span>{escape(section["title"])}</div>'
+        '<div class="halal-section">'
+        f'<div class="halal-subtitle">Target Market: {escape(section["target_market"])} · '
+        f'Certificate: {escape(section["certificate"])}</div>{checks}'
+        f'{_halal_disclaimer(section["disclaimer"] or HALAL_DISCLAIMER)}</div>'
+    )
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _halal_disclaimer(text):
+    return f'<div class="halal-disclaimer"><b>Important:</b> {escape(text)}</div>'
+
+
+def html_next_steps(section):
+    steps = ''.join(
+        f'<div class="next-step">☐ <span class="priority-badge">{escape(step["priority"])}</span>{escape(step["task"])}</div>'
+        for step in section['items']
+    )
+    files = section['files']
+    tree = '\n'.join(
+        f'{"└──" if i == len(files) - 1 else "├──"} {escape(name)}' for i, name in enumerate(files)
+    )
+    return (
+        section_title(section, 'Next Steps')
+        + '<div class="grid-2">'
+        f'<div class="card"><div class="card-title">Next Steps Checklist</div>{steps}</div>'
+        f'<div class="audit-trail"><div class="card-title">Audit Trail Artifacts</div>'
+        f'{escape(section["run_dir"] or NOT_PROVIDED)}/\n{tree}</div>'
+        '</div>'
+        '<div class="card-title">Ready to Preflight Your Labels?</div>'
+        '<p class="text-sm text-muted">Run your next preflight at nexodify.com</p>'
+    )
+
+
+def html_appendix_checks(section):
+    rows = ''.join(
+        f'<tr><td class="status-{escape(check["status"])}">{status_icon(check["status"])}</td>'
+        f'<td><b>{escape(check["title"])}</b><div class="check-id">{escape(check["id"])}</div></td>'
+        f'<td>{escape(check["detail"])}</td></tr>'
+        for check in section['checks']
+    )
+    return (
+        section_title(section, 'Appendix')
+        + '<table class="checks-table"><thead><tr><th></th><th>Check</th><th>Detail</th></tr></thead>'
+        f'<tbody>{rows}</tbody></table>'
+    )
+
+
+# Section id -> HTML renderer, mirroring pages.SECTION_BUILDERS
+SECTION_RENDERERS = {
+    'executive_summary': html_executive_summary,
+    'findings_overview': html_findings_overview,
+    'evidence_details': html_evidence_details,
+    'cross_check': html_crosscheck,
+    'print_pack': html_print_pack,
+    'halal': html_halal,
+    'next_steps': html_next_steps,
+    'checks_appendix': html_appendix_checks,
+}
+
+
+def report_html(view):
+    """Complete HTML document for a normalized report, one section per page"""
+    meta = view['meta']
+    pages = ''.join(
+        f'<div class="page">{SECTION_RENDERERS[section["id"]](section)}</div>' for section in view['sections']
+    )
+    return (
+        f'<!DOCTYPE html><html lang="{escape(meta["locale"])}"><head><meta charset="UTF-8">'
+        f'<title>EU Label Compliance Preflight Report {escape(meta["run_id"])}</title>'
+        '<meta name="author" content="Nexodify AVA"></head>'
+        f'<body><div class="run-id">{escape(meta["run_id"])}</div>{pages}</body></html>'
+    )
+
+
+def stylesheet_version():
+    """Version the parsed stylesheet is cached under: the template version plus report.css's mtime"""
+    return TEMPLATE_VERSION, STYLESHEET.stat().st_mtime_ns
+
+
+def _weasyprint_state():
+    """This thread's (FontConfiguration, parsed stylesheet), parsed again only when the version changes"""
+    version = stylesheet_version()
+    state = getattr(_warm, 'state', None)
+    if state is None or state[0] != version:
+        use_bundled_fonts()
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        font_config = FontConfiguration()
+        state = _warm.state = (version, font_config, CSS(filename=str(STYLESHEET), font_config=font_config))
+    return state[1:]
+
+
+def warm_up():
+    """Load the fonts and parse the stylesheet now rather than on this thread's first render"""
+    _weasyprint_state()
+
+
+def render_html_pdf(report, output):
+    """Render a report.json dict through WeasyPrint, returning the page count"""
+    from weasyprint import HTML
+
+    font_config, stylesheet = _weasyprint_state()
+    document = HTML(string=report_html(normalize_report(report))).render(
+        stylesheets=[stylesheet], font_config=font_config,
+    )
+    document.write_pdf(output)
+    return len(document.pages)
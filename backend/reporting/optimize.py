@@ -0,0 +1,143 @@
+"""
+Shrink finished report PDFs without changing how they render.
+
+optimize_pdf() rewrites a PDF with pikepdf:
+- Small objects (fonts, pages, annotations) are packed into compressed
+  object streams.
+- Every stream is recompressed at the highest Flate level.
+- Objects that nothing references any more are dropped.
+
+With linearize=True the file is also written linearized ("fast web view"):
+the first page's objects come first, behind a hint table. A browser fetching
+it with range requests can then show page 1 before the rest has arrived.
+check_linearization() verifies such a file.
+
+It works the same on ReportLab and WeasyPrint output. Both engines already
+keep fonts small: ReportLab only references the standard 14 fonts, and
+WeasyPrint subsets what it embeds. The savings therefore come from structure
+and compression.
+
+    cd backend
+    python -m reporting.optimize /srv/ava/data/runs        # every *.pdf below, in place
+    python -m reporting.optimize report.pdf -o small.pdf --no-linearize
+    python -m reporting.optimize --check report.pdf         # exit code 1 unless linearized
+"""
+
+import argparse
+import logging
+import os
+import sys
+from io import BytesIO, StringIO
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPRESSION_LEVEL = 9
+
+
+def optimize_pdf(data, compression_level=DEFAULT_COMPRESSION_LEVEL, linearize=False):
+    """Return (optimized_bytes, stats).
+
+    The input is returned unchanged if pikepdf is missing, or if the rewrite
+    isn't smaller and no linearization was asked for. Linearizing costs a few
+    KB for the hint tables, which is the point, so that output is always kept.
+    """
+    try:
+        import pikepdf
+    except ImportError:
+        logger.warning('pikepdf is not installed; PDFs are written unoptimized')
+        return data, {'bytes_in': len(data), 'bytes_out': len(data), 'bytes_saved': 0, 'linearized': False}
+
+    pikepdf.settings.set_flate_compression_level(compression_level)
+    out = BytesIO()
+    with pikepdf.open(BytesIO(data)) as pdf:
+        pdf.remove_unreferenced_resources()
+        pdf.save(
+            out,
+            compress_streams=True,
+            recompress_flate=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+            linearize=linearize,
+            # /ID from the content instead of the clock, so identical inputs give identical bytes
+            deterministic_id=True,
+        )
+    optimized = out.getvalue()
+    if not linearize and len(optimized) >= len(data):
+        optimized = data
+    return optimized, {
+        'bytes_in': len(data),
+        'bytes_out': len(optimized),
+        'bytes_saved': len(data) - len(optimized),
+        'linearized': linearize,
+    }
+
+
+def check_linearization(data):
+    """True if data is a linearized PDF whose hint tables and first-page layout check out"""
+    import pikepdf
+
+    with pikepdf.open(BytesIO(data)) as pdf:
+        if not pdf.is_linearized:
+            return False
+        problems = StringIO()
+        ok = pdf.check_linearization(problems)
+    if problems.getvalue():
+        logger.warning('Linearization problems: %s', problems.getvalue().strip())
+    return ok and not problems.getvalue()
+
+
+def optimize_file(path, output=None, compression_level=DEFAULT_COMPRESSION_LEVEL, linearize=False):
+    """Optimize a PDF file in place (or into output); returns the stats"""
+    path = Path(path)
+    output = Path(output) if output else path
+    original = path.read_bytes()
+    data, stats = optimize_pdf(original, compression_level, linearize)
+    if data is not original or output != path:
+        tmp_path = output.with_name(f'.{output.name}.{os.getpid()}.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, output)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Losslessly shrink report PDFs')
+    parser.add_argument('paths', nargs='+', help='PDF files, or directories searched recursively for *.pdf')
+    parser.add_argument('--output', '-o', help='Output file (single input only; default: rewrite in place)')
+    parser.add_argument('--level', type=int, default=DEFAULT_COMPRESSION_LEVEL, help='Flate compression level 1-9')
+    parser.add_argument('--no-linearize', dest='linearize', action='store_false', help="Don't write fast-web-view PDFs")
+    parser.add_argument('--check', action='store_true', help='Only verify that each file is linearized')
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in map(Path, args.paths):
+        files.extend(sorted(path.rglob('*.pdf')) if path.is_dir() else [path])
+    if args.output and len(files) != 1:
+        parser.error('--output needs exactly one input file')
+
+    if args.check:
+        failed = 0
+        for path in files:
+            ok = check_linearization(path.read_bytes())
+            failed += not ok
+            print(f'{"✅" if ok else "❌"} {path}: {"linearized" if ok else "not linearized"}')
+        return 1 if failed else 0
+
+    total_in = total_out = 0
+    for path in files:
+        stats = optimize_file(path, args.output, args.level, args.linearize)
+        total_in += stats['bytes_in']
+        total_out += stats['bytes_out']
+        print(f'{path}: {stats["bytes_in"] / 1024:.1f} KB -> {stats["bytes_out"] / 1024:.1f} KB'
+              f'{" (linearized)" if stats["linearized"] else ""}')
+
+    if not files:
+        print('No PDFs found')
+        return 0
+    # Linearizing adds hint tables, so a small file can come out slightly larger
+    print(f'✅ {len(files)} file(s): {total_in / 1024:.1f} KB -> {total_out / 1024:.1f} KB '
+          f'({(total_out - total_in) / total_in:+.1%})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
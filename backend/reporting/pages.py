@@ -0,0 +1,454 @@
+"""
+Data-driven page builders for the compliance report PDF.
+
+Each builder takes one section of the view model produced by
+reporting.view_model.normalize_report() plus the shared styles and returns a
+list of flowables. Builders never add page breaks; the renderer does.
+A section marked continued=True is a later chunk of a split list
+(reporting.parallel) and is rendered without its heading.
+"""
+
+from xml.sax.saxutils import escape
+
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, KeepTogether
+
+from .fragments import call_to_action, checklist, halal_disclaimer, signoff_block
+from .paragraphs import para
+from .tables import long_table
+from .theme import (
+    PRIMARY_BLUE, DARK_BG, LIGHT_BG, BORDER_COLOR, MUTED_TEXT, CONTENT_WIDTH,
+    EVIDENCE_BG, HALAL_BG, HALAL_BORDER, STATUS_COLORS, STATUS_ICONS,
+)
+
+CATEGORIES = [
+    'Dairy', 'Meat & Fish', 'Confectionery', 'Bakery', 'Beverages', 'Ready Meals',
+    'Oils & Fats', 'Frozen', 'Baby Food', 'Supplements',
+]
+HALAL_DISCLAIMER = (
+    'Halal determinations depend on the target market, accepted standard, and '
+    'certification body. This module provides preflight risk flags, not certification.'
+)
+
+
+def section_title(section, styles, badge=None):
+    """Section heading with the colored badge used across all pages"""
+    badge = badge or 'Report'
+    return Paragraph(
+        f'<font color="#5B6CFF">{escape(badge)}</font> &nbsp; <b>{escape(section["title"])}</b>',
+        styles['SectionTitle'],
+    )
+
+
+def status_color(status):
+    return STATUS_COLORS.get(status, STATUS_COLORS['unknown'])
+
+
+def status_icon(status):
+    return STATUS_ICONS.get(status, STATUS_ICONS['unknown'])
+
+
+def score_color(score):
+    if score >= 85:
+        return STATUS_COLORS['pass']
+    if score >= 60:
+        return STATUS_COLORS['warning']
+    return STATUS_COLORS['critical']
+
+
+def build_page1_executive_summary(section, styles):
+    """Page 1: Executive Summary"""
+    elements = []
+    product = section['product']
+    summary = section['summary']
+    counts = summary['counts']
+
+    elements.append(Paragraph('EU Label Compliance, <font color="#5B6CFF">Preflighted.</font>', styles['MainTitle']))
+    elements.append(Paragraph('Automated verification against Regulation (EU) 1169/2011', styles['Subtitle']))
+    elements.append(Spacer(1, 10))
+
+    cell = styles['SmallText']
+    product_data = [
+        ['PRODUCT INFORMATION', ''],
+        ['Product Name', Paragraph(f'<b>{escape(product["product_name"])}</b>', cell)],
+        ['Company', Paragraph(f'<b>{escape(product["company_name"])}</b>', cell)],
+        ['Country of Sale', Paragraph(f'<b>{escape(product["country_of_sale"])}</b>', cell)],
+        ['Languages', Paragraph(f'<b>{escape(product["languages_provided"])}</b>', cell)],
+        ['Category', Paragraph(f'<b>{escape(product["category"])}</b>', cell)],
+    ]
+    product_table = Table(product_data, colWidths=[90, 170])
+    product_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), LIGHT_BG),
+        ('TEXTCOLOR', (0, 0), (-1, 0), PRIMARY_BLUE),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 8),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('TEXTCOLOR', (0, 1), (0, -1), MUTED_TEXT),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, BORDER_COLOR),
+        ('SPAN', (0, 0), (1, 0)),
+    ]))
+
+    score = summary['score']
+    score_data = [
+        [Paragraph(f'<font color="{score_color(score)}"><b>{escape(str(score))}%</b></font>', styles['ScoreText'])],
+        [Paragraph('<font size="9" color="#cbd5e1">Compliance Score</font>', styles['SmallText'])],
+        [Paragraph(f'<font size="8" color="#cbd5e1">Verdict: {escape(summary["verdict"].replace("_", " ").title())} · '
+                   f'Evidence confidence {escape(str(summary["evidence_confidence"]))}%</font>', styles['TinyText'])],
+        [''],
+        [Paragraph(
+            f'<font size="8" color="#ef4444">● {counts["critical"]} Critical</font> &nbsp; '
+            f'<font size="8" color="#f59e0b">● {counts["warnings"]} Warnings</font> &nbsp; '
+            f'<font size="8" color="#22c55e">● {counts["passed"]} Passed</font>',
+            styles['SmallText'],
+        )],
+    ]
+    score_table = Table(score_data, colWidths=[190])
+    score_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), DARK_BG),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (0, 0), 28),
+        ('BOTTOMPADDING', (0, -1), (0, -1), 20),
+    ]))
+
+    main_table = Table([[product_table, score_table]], colWidths=[270, 200])
+    main_table.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+    elements.append(main_table)
+    elements.append(Spacer(1, 20))
+
+    elements.append(Paragraph('WHAT\'S INCLUDED IN THIS REPORT', styles['CardTitle']))
+    included = section['included']
+    rows = []
+    for i in range(0, len(included), 2):
+        pair = included[i:i + 2] + [''] * (2 - len(included[i:i + 2]))
+        rows.append([f'{"✓" if item != "Not provided" else "–"} {item}' if item else '' for item in pair])
+    included_table = Table(rows, colWidths=[235, 235])
+    included_table.setStyle(TableStyle([
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ('BACKGROUND', (0, 0), (-1, -1), LIGHT_BG),
+        ('BOX', (0, 0), (-1, -1), 1, BORDER_COLOR),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ]))
+    elements.append(included_table)
+    return elements
+
+
+def build_page2_findings_overview(section, styles):
+    """Page 2: Findings Overview"""
+    elements = []
+    findings = section['findings']
+    issues = section.get('total', len(findings))
+    if not section.get('continued'):
+        elements.append(Paragraph(
+            f'<font color="#5B6CFF">Findings</font> &nbsp; <b>{issues} Issue{"" if issues == 1 else "s"} Identified</b>',
+            styles['SectionTitle'],
+        ))
+        elements.append(Spacer(1, 10))
+
+    if not findings:
+        elements.append(Paragraph('No issues were identified for this run.', styles['SmallText']))
+        return elements
+
+    for finding in findings:
+        color = status_color(finding['status'])
+        finding_data = [[
+            para(f'<font size="14" color="{color}">{status_icon(finding["status"])}</font>', styles['BodyTextCustom']),
+            Paragraph(
+                f'<b>{escape(finding["title"])}</b><br/>'
+                f'<font size="7" color="{color}">{escape(finding["status"].upper())}</font> &nbsp; '
+                f'<font size="7" color="#2563eb">Source: {escape(finding["source"])}</font><br/>'
+                f'<font size="8" color="#666666">{escape(finding["fix"])}</font>',
+                styles['BodyTextCustom'],
+            ),
+        ]]
+        finding_table = Table(finding_data, colWidths=[25, CONTENT_WIDTH - 25])
+        finding_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), LIGHT_BG),
+            ('BOX', (0, 0), (-1, -1), 1, BORDER_COLOR),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ]))
+        elements.append(finding_table)
+        elements.append(Spacer(1, 6))
+    return elements
+
+
+def build_page3_evidence_details(section, styles):
+    """Page 3: Evidence & Fix Details"""
+    elements = [] if section.get('continued') else [section_title(section, styles, 'Evidence'), Spacer(1, 10)]
+
+    if not section['findings']:
+        elements.append(Paragraph('No findings require evidence review.', styles['SmallText']))
+        return elements
+
+    for finding in section['findings']:
+        color = status_color(finding['status'])
+        block = [
+            Paragraph(
+                f'<font size="8" color="{color}">{escape(finding["status"].upper())}</font> &nbsp; '
+                f'<b>{escape(finding["title"])}</b>',
+                styles['FindingTitle'],
+            ),
+            Spacer(1, 6),
+        ]
+
+        excerpts = ''.join(
+            f'<i>"{escape(entry["excerpt"])}"</i>'
+            f'<font size="7" color="#94a3b8"> — {escape(entry["source"])}'
+            f'{", p. " + escape(str(entry["page"])) if entry["page"] is not None else ""}</font><br/>'
+            for entry in finding['evidence']
+        ) or '<i>No excerpt captured.</i><br/>'
+        detail = f'<br/><font size="8" color="#94a3b8">{escape(finding["detail"])}</font>' if finding['detail'] else ''
+        evidence_table = Table([[Paragraph(
+            f'<font size="7" color="#64748b">EVIDENCE ({escape(finding["source"].upper())} EXCERPT)</font><br/><br/>'
+            f'{excerpts}{detail}',
+            styles['EvidenceText'],
+        )]], colWidths=[CONTENT_WIDTH])
+        evidence_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), EVIDENCE_BG),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ]))
+        block.append(evidence_table)
+        block.append(Spacer(1, 8))
+
+        fix_table = Table([[para(
+            f'<font size="7" color="#64748b">RECOMMENDED FIX</font><br/><br/>{escape(finding["fix"])}',
+            styles['SmallText'],
+        )]], colWidths=[CONTENT_WIDTH])
+        fix_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), LIGHT_BG),
+            ('BOX', (0, 0), (-1, -1), 1, BORDER_COLOR),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ]))
+        block.append(fix_table)
+        block.append(para(f'<font size="8" color="#94a3b8">Reference: {escape(finding["reference"])}</font>', styles['TinyText']))
+        block.append(Spacer(1, 15))
+        elements.append(KeepTogether(block))
+    return elements
+
+
+def build_page4_crosscheck(section, styles):
+    """Page 4: Label ↔ TDS Cross-Check"""
+    elements = [section_title(section, styles, 'Cross-Check'), Spacer(1, 10)]
+
+    matched = section['matched']
+    match_data = [[Paragraph(f'<font color="#22c55e">✓ MATCHED ({len(matched)})</font>', styles['CardTitle']), '']]
+    for item in matched:
+        match_data.append([
+            Paragraph(escape(item['field']), styles['SmallText']),
+            Paragraph(f'<font color="#22c55e">✓ {escape(item["note"] or "Match")}</font>', styles['SmallText']),
+        ])
+    match_table = Table(match_data, colWidths=[140, 80])
+    match_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), LIGHT_BG),
+        ('BOX', (0, 0), (-1, -1), 1, BORDER_COLOR),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('LEFTPADDING', (0, 0), (-1, -1), 10),
+        ('SPAN', (0, 0), (1, 0)),
+    ]))
+
+    mismatched = section['mismatched']
+    mismatch_data = [[Paragraph(f'<font color="#ef4444">✕ MISMATCHED ({len(mismatched)})</font>', styles['CardTitle']), '']]
+    for item in mismatched:
+        mismatch_data.append([
+            Paragraph(f'{escape(item["field"])}<br/><font size="7" color="#f59e0b">⚠ {escape(item["note"])}</font>', styles['SmallText']),
+            Paragraph('<font color="#ef4444">Mismatch</font>', styles['SmallText']),
+        ])
+    mismatch_table = Table(mismatch_data, colWidths=[170, 60])
+    mismatch_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), LIGHT_BG),
+        ('BOX', (0, 0), (-1, -1), 1, BORDER_COLOR),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('LEFTPADDING', (0, 0), (-1, -1), 10),
+        ('SPAN', (0, 0), (1, 0)),
+    ]))
+
+    crosscheck_main = Table([[match_table, mismatch_table]], colWidths=[230, 240])
+    crosscheck_main.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+    elements.append(crosscheck_main)
+    elements.append(Spacer(1, 20))
+
+    category = section['category_label']
+    elements.append(Paragraph('CATEGORY-AWARE CHECKS', styles['CardTitle']))
+    elements.append(Paragraph(
+        f'This report applies EU 1169/2011 checks tailored for the <b>{escape(category)}</b> category.',
+        styles['SmallText'],
+    ))
+    elements.append(Spacer(1, 8))
+    chips = [
+        f'<b><font color="#1d4ed8">{escape(name)} ✓</font></b>' if name == category else escape(name)
+        for name in CATEGORIES
+    ]
+    elements.append(Paragraph(' • '.join(chips), styles['SmallText']))
+    return elements
+
+
+def build_page5_print_pack(section, styles):
+    """Page 5: Print Verification Pack"""
+    elements = [
+        Paragraph(f'<font color="#16a34a">Print Pack</font> &nbsp; <b>{escape(section["title"])} (Pre-Press Checklist)</b>', styles['SectionTitle']),
+        Spacer(1, 10),
+    ]
+
+    elements.append(signoff_block(section['signoff_fields']))
+    elements.append(Spacer(1, 15))
+
+    elements.append(checklist('PRE-PRESS CHECKLIST', section['prepress_checklist']))
+    elements.append(Spacer(1, 15))
+
+    if section['attachments_checklist']:
+        elements.append(checklist('WHAT TO SEND TO PRINTER', section['attachments_checklist']))
+    if section['printer_notes']:
+        elements.append(Spacer(1, 10))
+        elements.append(Paragraph(f'<i>{escape(section["printer_notes"])}</i>', styles['SmallText']))
+    return elements
+
+
+def build_page6_halal(section, styles):
+    """Page 6: Halal Export-Readiness Preflight"""
+    elements = [
+        Paragraph(f'<font color="#a16207">Optional Module</font> &nbsp; <b>{escape(section["title"])}</b>', styles['SectionTitle']),
+        Spacer(1, 6),
+        Paragraph(
+            f'Target Market: {escape(section["target_market"])} · Certificate: {escape(section["certificate"])}',
+            styles['SmallText'],
+        ),
+        Spacer(1, 10),
+    ]
+
+    for check in section['items']:
+        color = status_color(check['status'])
+        fix_text = f'<br/><font size="7" color="#92400e">Fix: {escape(check["fix"])}</font>' if check['fix'] else ''
+        check_data = [[
+            para(f'<font size="12" color="{color}">{status_icon(check["status"])}</font>', styles['BodyTextCustom']),
+            Paragraph(
+                f'<b>{escape(check["title"])}</b> &nbsp;<font size="7" color="{color}">{escape(check["status"].upper())}</font><br/>'
+                f'<font size="8" color="#78716c">{escape(check["detail"])}</font>{fix_text}',
+                styles['SmallText'],
+            ),
+        ]]
+        check_table = Table(check_data, colWidths=[25, CONTENT_WIDTH - 25])
+        check_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), HALAL_BG),
+            ('BOX', (0, 0), (-1, -1), 1, HALAL_BORDER),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ]))
+        elements.append(check_table)
+        elements.append(Spacer(1, 4))
+
+    elements.append(Spacer(1, 10))
+    elements.append(halal_disclaimer(section['disclaimer'] or HALAL_DISCLAIMER))
+    return elements
+
+
+def build_page7_next_steps(section, styles):
+    """Page 7: Next Steps & Audit Trail"""
+    elements = [section_title(section, styles, 'Next Steps'), Spacer(1, 10)]
+
+    next_steps_data = [[Paragraph('NEXT STEPS CHECKLIST', styles['CardTitle']), '']]
+    for step in section['items']:
+        next_steps_data.append([
+            '☐',
+            Paragraph(f'<font color="#3b82f6">{escape(step["priority"])}</font> {escape(step["task"])}', styles['SmallText']),
+        ])
+    next_steps_table = Table(next_steps_data, colWidths=[20, 200])
+    next_steps_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), LIGHT_BG),
+        ('BOX', (0, 0), (-1, -1), 1, BORDER_COLOR),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('LEFTPADDING', (0, 0), (-1, -1), 10),
+        ('SPAN', (0, 0), (1, 0)),
+    ]))
+
+    files = section['files']
+    tree = '<br/>'.join(
+        f'{"└──" if i == len(files) - 1 else "├──"} {escape(name)}' for i, name in enumerate(files)
+    )
+    audit_data = [
+        [Paragraph('AUDIT TRAIL ARTIFACTS', styles['CardTitle'])],
+        [Paragraph(
+            f'<font name="Courier" size="8" color="#cbd5e1">{escape(section["run_dir"] or "Not provided")}/</font><br/>'
+            f'<font name="Courier" size="8" color="#94a3b8">{tree}</font>',
+            styles['SmallText'],
+        )],
+    ]
+    audit_table = Table(audit_data, colWidths=[230])
+    audit_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), DARK_BG),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('LEFTPADDING', (0, 0), (-1, -1), 12),
+    ]))
+
+    main_table = Table([[next_steps_table, audit_table]], colWidths=[235, 240])
+    main_table.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+    elements.append(main_table)
+    elements.append(call_to_action())
+    return elements
+
+
+def build_appendix_checks(section, styles):
+    """Appendix: every check with its result and legal detail"""
+    elements = [] if section.get('continued') else [section_title(section, styles, 'Appendix'), Spacer(1, 10)]
+
+    header = ['', 'Check', 'Detail']
+    rows = [header]
+    for check in section['checks']:
+        color = status_color(check['status'])
+        rows.append([
+            para(f'<font color="{color}">{status_icon(check["status"])}</font>', styles['SmallText']),
+            Paragraph(f'<b>{escape(check["title"])}</b><br/><font size="7" color="#94a3b8">{escape(check["id"])}</font>', styles['SmallText']),
+            # A given check mostly yields the same detail (legal basis included) run after run
+            para(escape(check['detail']), styles['SmallText']),
+        ])
+    # Thousands of rows on big runs: laid out in batches instead of one ever-splitting Table
+    elements.append(long_table(rows, [20, 170, CONTENT_WIDTH - 190], TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), LIGHT_BG),
+        ('TEXTCOLOR', (0, 0), (-1, 0), PRIMARY_BLUE),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LINEBELOW', (0, 0), (-1, -1), 0.5, BORDER_COLOR),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ])))
+    return elements
+
+
+# Section id -> builder, in report order
+SECTION_BUILDERS = {
+    'executive_summary': build_page1_executive_summary,
+    'findings_overview': build_page2_findings_overview,
+    'evidence_details': build_page3_evidence_details,
+    'cross_check': build_page4_crosscheck,
+    'print_pack': build_page5_print_pack,
+    'halal': build_page6_halal,
+    'next_steps': build_page7_next_steps,
+    'checks_appendix': build_appendix_checks,
+}
@@ -0,0 +1,111 @@
+"""
+Interned paragraphs for rich text that repeats within and across reports.
+
+Check details end in the same "Legal basis: Regulation (EU) No 1169/2011 …
+Official text: https://eur-lex…" boilerplate, and status icons, fixes and
+references recur on every page. A plain Paragraph runs the markup parser and
+line breaking for each copy. para() parses each distinct (text, style) pair
+once per process and shares the fragments. It also remembers the line breaks
+per wrap width, so a repeated string is parsed once and measured once per
+width, and later reports in the same worker start warm.
+
+Styles are matched by their attributes rather than by identity, so
+create_styles() called again for another report still hits the cache. Only
+text that really repeats should go through para(). One-off strings like
+check titles with their ids would just push useful entries out.
+"""
+
+import weakref
+from functools import lru_cache
+
+from reportlab.platypus import Paragraph
+from reportlab.platypus.paragraph import _FUZZ, cleanBlockQuotedText, textTransformFrags
+from reportlab.platypus.paraparser import ParaParser
+
+# Distinct (text, style) pairs kept per process
+PARAGRAPH_CACHE_SIZE = 4096
+
+# Attribute key per style object. Kept off the style itself: ParagraphStyle(parent=...)
+# copies the parent's __dict__, and a child must not inherit its parent's key.
+_style_keys = weakref.WeakKeyDictionary()
+
+
+class _StyleKey:
+    """Hashable stand-in for a ParagraphStyle, equal to any style with the same attributes"""
+
+    __slots__ = ('style', 'key')
+
+    def __init__(self, style):
+        self.style = style
+        key = _style_keys.get(style)
+        if key is None:
+            # Computed once per style object; styles aren't changed after create_styles()
+            key = (style.name, tuple(sorted((k, repr(v)) for k, v in vars(style).items() if k != 'parent')))
+            _style_keys[style] = key
+        self.key = key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+class _Parsed:
+    """Parse result of one (text, style) pair plus its line breaks by wrap width"""
+
+    __slots__ = ('text', 'style', 'frags', 'layouts')
+
+    def __init__(self, text, style, frags):
+        self.text = text
+        self.style = style
+        self.frags = frags
+        self.layouts = {}  # availWidth -> (blPara, height, wrap widths)
+
+
+@lru_cache(maxsize=PARAGRAPH_CACHE_SIZE)
+def _parse(text, style_key):
+    style = style_key.style
+    text = cleanBlockQuotedText(text)
+    parsed_style, frags, bullet_frags = ParaParser().parse(text, style)
+    if frags is None or bullet_frags:
+        return None
+    textTransformFrags(frags, parsed_style)
+    # <para> attributes produce a derived style; only the unmodified one can be swapped for an equal style
+    return _Parsed(text, None if parsed_style is style else parsed_style, frags)
+
+
+class InternedParagraph(Paragraph):
+    """Paragraph over shared parse fragments that reuses line breaks for widths already seen"""
+
+    def __init__(self, text, style=None, bulletText=None, frags=None, caseSensitive=1, encoding='utf8', parsed=None):
+        self._parsed = parsed
+        if parsed is not None:
+            text, style, frags = parsed.text, parsed.style or style, parsed.frags
+        super().__init__(text, style, bulletText, frags, caseSensitive, encoding)
+
+    def wrap(self, availWidth, availHeight):
+        parsed = self._parsed
+        if parsed is None or availWidth < _FUZZ:
+            return super().wrap(availWidth, availHeight)
+        layout = parsed.layouts.get(availWidth)
+        if layout is None:
+            width, height = super().wrap(availWidth, availHeight)
+            # blPara is only read once built (split slices it into new objects)
+            parsed.layouts[availWidth] = (self.blPara, height, self._wrapWidths)
+            return width, height
+        self.blPara, self.height, self._wrapWidths = layout
+        self.width = availWidth
+        return availWidth, self.height
+
+
+def para(text, style):
+    """Paragraph(text, style) for text that recurs across checks and reports"""
+    parsed = _parse(text, _StyleKey(style))
+    if parsed is None:
+        return Paragraph(text, style)
+    return InternedParagraph(text, style, parsed=parsed)
+
+
+def cache_info():
+    return _parse.cache_info()._asdict()
@@ -0,0 +1,273 @@
+"""
+Render one large report section by section across a process pool, then merge.
+
+The page builders only depend on each other through page numbering, so every
+section is laid out as its own PDF in a worker. Long list sections (findings,
+evidence, check appendix) are further split into chunks per CHUNKED_SECTIONS.
+The parts are concatenated with pypdf. Once the total is known, the
+"Page X/Y" footers are stamped from a single overlay, and each section gets
+an outline entry (bookmark) at its first page.
+
+Parts don't depend on the run either: the run id in the header is stamped
+with the footers. With a part_cache (a PdfCache keyed by part_key()), a part
+whose inputs are unchanged is reused as already rendered, so a rerun that
+changes a few checks only lays out the sections, or appendix chunks, those
+checks appear in before the parts are stitched together again.
+
+    from reporting.parallel import render_parallel
+    render_parallel(report, 'report.pdf', workers=8)
+    render_parallel(report, 'report.pdf', part_cache=PdfCache('/srv/ava/data/pdf-part-cache'))
+
+Renders share one process pool, so parts are handed to it no faster than it
+has free workers (PartScheduler). Parts of background renders (the bulk
+lane) wait while any foreground part is waiting, so a download queues
+behind at most the parts already running, never behind a bulk report's
+whole backlog.
+"""
+
+import hashlib
+import heapq
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache, partial
+from io import BytesIO
+
+from pypdf import PdfReader, PdfWriter
+from reportlab.pdfgen.canvas import Canvas
+
+from .pages import SECTION_BUILDERS
+from .renderer import ENGINE_VERSION, TEMPLATE_VERSION, create_document, draw_footer, draw_header, draw_run_id
+from .theme import PAGE_SIZE, create_styles
+from .view_model import normalize_report
+
+logger = logging.getLogger(__name__)
+
+# Section id -> (list key, items per part). A chunk boundary always starts a new page.
+CHUNKED_SECTIONS = {
+    'findings_overview': ('findings', 150),
+    'evidence_details': ('findings', 40),
+    'checks_appendix': ('checks', 250),
+}
+
+# Styles are built once per worker process and reused for every part it renders
+_worker_styles = None
+
+
+def _init_worker():
+    global _worker_styles
+    _worker_styles = create_styles()
+
+
+def _draw_part_header(canvas, doc):
+    draw_header(canvas, run_id=None)
+
+
+def render_part(job):
+    """Lay out one section (or chunk of one) without run id or page numbers; returns (pdf_bytes, page_count)"""
+    section, meta = job
+    styles = _worker_styles if _worker_styles is not None else create_styles()
+    buf = BytesIO()
+    doc = create_document(buf, meta)
+    doc.build(SECTION_BUILDERS[section['id']](section, styles), onFirstPage=_draw_part_header, onLaterPages=_draw_part_header)
+    return buf.getvalue(), doc.page
+
+
+def part_key(part, template_version=TEMPLATE_VERSION, engine=ENGINE_VERSION):
+    """Content hash of everything a rendered part depends on"""
+    # Imported here: reporting.cache imports the engines, which import this module
+    from .cache import canonical_json
+
+    payload = canonical_json({'template': template_version, 'engine': engine, 'part': part})
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PartScheduler:
+    """Hands parts to an executor no faster than it has free workers, foreground parts first.
+
+    Parts submitted straight to a ProcessPoolExecutor wait in its FIFO queue,
+    where a bulk report's parts hold up a download's. Here they wait in a
+    priority queue instead, and a dispatch thread passes them on as workers
+    free up: foreground parts in arrival order, then background ones.
+    """
+
+    def __init__(self, executor, workers):
+        self._executor = executor
+        self._cond = threading.Condition()
+        self._free = workers
+        self._queue = []  # heap of (background, arrival, job, future)
+        self._arrivals = itertools.count()
+        self._dispatching = False
+
+    def submit(self, job, background=False):
+        """Future of render_part(job), run once a worker is free and no more urgent part is waiting"""
+        future = Future()
+        with self._cond:
+            heapq.heappush(self._queue, (background, next(self._arrivals), job, future))
+            if not self._dispatching:
+                # Runs while parts are waiting, so an idle scheduler holds no thread
+                self._dispatching = True
+                threading.Thread(target=self._dispatch, name='pdf-parts', daemon=True).start()
+            self._cond.notify_all()
+        return future
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                while self._queue and not self._free:
+                    self._cond.wait()
+                if not self._queue:
+                    self._dispatching = False
+                    return
+                _, _, job, future = heapq.heappop(self._queue)
+                if not future.set_running_or_notify_cancel():
+                    continue  # the render was abandoned while this part waited
+                self._free -= 1
+            try:
+                inner = self._executor.submit(render_part, job)
+            except BaseException as exc:
+                self._release()
+                future.set_exception(exc)
+                continue
+            inner.add_done_callback(partial(self._finished, future))
+
+    def _release(self):
+        with self._cond:
+            self._free += 1
+            self._cond.notify_all()
+
+    def _finished(self, future, inner):
+        self._release()
+        try:
+            future.set_result(inner.result())
+        except BaseException as exc:
+            future.set_exception(exc)
+
+
+_schedulers = weakref.WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def part_scheduler(executor):
+    """The PartScheduler every render shares for executor, sized to its workers"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(executor)
+        if scheduler is None:
+            workers = getattr(executor, '_max_workers', None) or os.cpu_count() or 1
+            scheduler = _schedulers[executor] = PartScheduler(executor, workers)
+        return scheduler
+
+
+def rendered_parts(parts, meta, executor=None, part_cache=None, background=False):
+    """(pdf_bytes, page_count) for each part, in order, as each becomes available.
+
+    Parts found in part_cache are reused; the others are rendered in this
+    thread or across executor, and stored in part_cache. Parts reach executor
+    through its PartScheduler, background ones after any foreground part
+    that is waiting.
+    """
+    keys = [part_key(part) for part in parts] if part_cache is not None else [None] * len(parts)
+    cached = [part_cache.get(key) if key else None for key in keys]
+    todo = [index for index, data in enumerate(cached) if data is None]
+    if part_cache is not None:
+        logger.info('Run %s: reusing %d of %d report parts', meta['run_id'], len(parts) - len(todo), len(parts))
+    futures = {}
+    if executor is not None:
+        scheduler = part_scheduler(executor)
+        futures = {index: scheduler.submit((parts[index], meta), background) for index in todo}
+    try:
+        for index, (key, data) in enumerate(zip(keys, cached)):
+            if data is None:
+                data, pages = futures.pop(index).result() if futures else render_part((parts[index], meta))
+                if key:
+                    part_cache.put(key, data)
+            else:
+                pages = len(PdfReader(BytesIO(data)).pages)
+            yield data, pages
+    finally:
+        # Closed early (a stream whose client left): parts still waiting aren't rendered
+        for future in futures.values():
+            future.cancel()
+
+
+def plan_parts(view, chunks=CHUNKED_SECTIONS):
+    """Independently renderable parts of a normalized report, in document order"""
+    parts = []
+    for section in view['sections']:
+        key, size = chunks.get(section['id'], (None, 0))
+        items = section[key] if key else []
+        if len(items) <= size or not size:
+            parts.append(section)
+            continue
+        for start in range(0, len(items), size):
+            parts.append(dict(section, **{key: items[start:start + size]}, continued=start > 0, total=len(items)))
+    return parts
+
+
+def footer_overlay(total, run_id):
+    """One page per document page, carrying only its run id and "Page X/Y" footer"""
+    buf = BytesIO()
+    canvas = Canvas(buf, pagesize=PAGE_SIZE, invariant=1)
+    for page in range(1, total + 1):
+        draw_run_id(canvas, run_id)
+        draw_footer(canvas, page, total)
+        canvas.showPage()
+    canvas.save()
+    buf.seek(0)
+    return PdfReader(buf)
+
+
+def merge_parts(parts, rendered, output, meta):
+    """Concatenate rendered parts, stamp global page numbers and add section bookmarks"""
+    writer = PdfWriter()
+    for section, (data, _) in zip(parts, rendered):
+        start = len(writer.pages)
+        writer.append(PdfReader(BytesIO(data)))
+        if not section.get('continued'):
+            writer.add_outline_item(section['title'], start)
+
+    total = len(writer.pages)
+    for page, stamp in zip(writer.pages, footer_overlay(total, meta['run_id']).pages):
+        page.merge_page(stamp)
+        page.compress_content_streams()
+    # Each part embeds its own copy of the fonts and the overlay adds one more
+    writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+    writer.add_metadata({
+        '/Title': f'EU Label Compliance Preflight Report {meta["run_id"]}',
+        '/Author': 'Nexodify AVA',
+    })
+    writer.page_mode = '/UseOutlines'
+    writer.write(output)
+    return total
+
+
+@lru_cache(maxsize=None)
+def shared_executor(workers=None):
+    """Process pool kept for the life of the process (spawned, so safe to create from a threaded server)"""
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+    )
+
+
+def render_parallel(report, output, workers=None, executor=None, chunks=CHUNKED_SECTIONS, part_cache=None,
+                    background=False):
+    """Render a report.json dict to a PDF path or binary file object in parallel, returning the page count.
+
+    executor defaults to shared_executor(workers); with workers=1 parts are
+    rendered in this process. Parts already in part_cache aren't rendered again.
+    A background render gives way to foreground ones sharing the executor.
+    """
+    view = normalize_report(report)
+    meta = view['meta']
+    parts = plan_parts(view, chunks)
+
+    if executor is None and workers != 1:
+        executor = shared_executor(workers)
+    rendered = list(rendered_parts(parts, meta, executor, part_cache, background))
+    return merge_parts(parts, rendered, output, meta)
@@ -0,0 +1,120 @@
+"""
+Opt-in per-stage profile of a ReportLab render: where time and memory go.
+
+render_pdf(report, output, profile=RenderProfile()) records one stage after
+another: normalize, styles (only when no styles are passed in), one
+flowables:<builder> stage per build_page* call, layout (doc.build), finalize
+(serializing the document) and write (the file write). Each stage gets its
+wall time and, with memory tracing on, the tracemalloc peak reached during
+the stage and the memory it left allocated. The profile is written as JSON
+next to the PDF (report.pdf -> report-profile.json).
+
+    cd backend
+    python -m reporting.profiling /srv/ava/data/runs/<run_id>/report.json -o /tmp/report.pdf
+    python -m reporting.batch /srv/ava/data/runs --profile
+
+Memory tracing slows Python code down considerably, so with it on the
+timings are only useful relative to each other. Use --no-memory for
+representative wall times.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROFILE_SUFFIX = '-profile.json'
+
+
+def profile_path(pdf_path):
+    """Where the profile of a PDF goes: report.pdf -> report-profile.json"""
+    pdf_path = Path(pdf_path)
+    return pdf_path.with_name(pdf_path.stem + PROFILE_SUFFIX)
+
+
+class RenderProfile:
+    """Consecutive named stages with wall time and tracemalloc peaks"""
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.stages = []
+        self.pages = None
+        self._current = None
+        self._traced_by_us = False
+
+    def switch(self, name):
+        """End the running stage (if any) and start the next one"""
+        now = time.perf_counter()
+        if self._current is None:
+            if self.memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._traced_by_us = True
+        else:
+            self._close(now)
+        self._current = {'name': name, 'started': now}
+        if self.memory:
+            self._current['allocated_before'] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+    def stop(self):
+        """End the running stage and memory tracing, if this profile started it"""
+        if self._current is None:
+            return
+        self._close(time.perf_counter())
+        self._current = None
+        if self._traced_by_us:
+            tracemalloc.stop()
+            self._traced_by_us = False
+
+    def _close(self, now):
+        stage = {'name': self._current['name'], 'seconds': round(now - self._current['started'], 6)}
+        if self.memory:
+            allocated, peak = tracemalloc.get_traced_memory()
+            stage['peak_bytes'] = peak
+            stage['allocated_bytes'] = allocated - self._current['allocated_before']
+        self.stages.append(stage)
+
+    def as_dict(self):
+        profile = {
+            'pages': self.pages,
+            'total_seconds': round(sum(stage['seconds'] for stage in self.stages), 6),
+            'memory_traced': self.memory,
+            'stages': self.stages,
+        }
+        if self.memory:
+            profile['peak_bytes'] = max((stage['peak_bytes'] for stage in self.stages), default=0)
+        return profile
+
+    def write(self, path):
+        """Write the profile as JSON to path; returns the path"""
+        path = Path(path)
+        path.write_text(json.dumps(self.as_dict(), indent=2) + '\n', encoding='utf-8')
+        return path
+
+
+def main(argv=None):
+    from .renderer import load_report, render_pdf
+
+    parser = argparse.ArgumentParser(description='Render one report.json with a per-stage time and memory profile')
+    parser.add_argument('report', help='report.json to render')
+    parser.add_argument('-o', '--output', help='PDF to write (default: report.pdf next to the input)')
+    parser.add_argument('--no-memory', action='store_true', help='Time stages without tracemalloc')
+    args = parser.parse_args(argv)
+
+    output = Path(args.output) if args.output else Path(args.report).with_name('report.pdf')
+    profile = RenderProfile(memory=not args.no_memory)
+    render_pdf(load_report(args.report), str(output), profile=profile)
+    written = profile.write(profile_path(output))
+
+    print(f'{"stage":<48} {"seconds":>9} {"peak MB":>9}')
+    for stage in profile.stages:
+        peak = f'{stage["peak_bytes"] / 1e6:9.2f}' if profile.memory else f'{"-":>9}'
+        print(f'{stage["name"]:<48} {stage["seconds"]:9.4f} {peak}')
+    print(f'{profile.pages} pages, {profile.as_dict()["total_seconds"]:.3f}s -> {written}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Render a v2 report.json into the multi-page compliance report PDF
+"""
+
+import json
+from functools import partial
+
+import reportlab
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import SimpleDocTemplate, PageBreak
+
+from .pages import SECTION_BUILDERS
+from .theme import (
+    PAGE_SIZE, PAGE_WIDTH, PAGE_HEIGHT, MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP,
+    MARGIN_BOTTOM, PRIMARY_BLUE, DARK_BG, MUTED_TEXT, FAINT_TEXT, create_styles,
+)
+from .view_model import normalize_report
+
+# Bump whenever page builders or styles change the rendered output
+TEMPLATE_VERSION = '2026.10.4'
+ENGINE_VERSION = f'reportlab-{reportlab.Version}'
+
+HEADER_Y = PAGE_HEIGHT - 40
+FOOTER_Y = 28
+PAGE_COUNT_FORM = 'PageCount'
+HEADER_FORM = 'PageHeader'
+FOOTER_TEXT = 'Nexodify AVA · EU Label Compliance Preflight  |  Confidential'
+
+
+def load_report(path):
+    """Read a report.json file"""
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+class PageCountCanvas(Canvas):
+    """Canvas that fills in the "Page X/Y" total without keeping finished pages.
+
+    Footers reference a form XObject for the total; it is a forward reference
+    defined once in save(), so memory stays flat however long the report is.
+    """
+
+    def save(self):
+        # showPage() has already advanced past the last page
+        self.beginForm(PAGE_COUNT_FORM)
+        self.setFillColor(FAINT_TEXT)
+        self.setFont('Helvetica', 8)
+        self.drawString(0, 0, str(self._pageNumber - 1))
+        self.endForm()
+        super().save()
+
+
+class ProfiledPageCountCanvas(PageCountCanvas):
+    """PageCountCanvas that reports serialization and the file write as separate profile stages"""
+
+    def __init__(self, *args, profile, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._profile = profile
+
+    def save(self):
+        self._profile.switch('finalize')
+        get_pdf_data = self._doc.GetPDFData
+
+        def serialized(canvas):
+            data = get_pdf_data(canvas)
+            self._profile.switch('write')
+            return data
+
+        self._doc.GetPDFData = serialized
+        super().save()
+
+
+def draw_header(canvas, run_id='Unknown'):
+    """Brand, title and run id above the content frame.
+
+    The header is identical on every page, so it is drawn once per document
+    into a form XObject that each page references. With run_id=None the run
+    id is left out, for parts that get it stamped later (draw_run_id).
+    """
+    if canvas.hasForm(HEADER_FORM):
+        canvas.doForm(HEADER_FORM)
+        return
+
+    canvas.beginForm(HEADER_FORM)
+    canvas.saveState()
+    canvas.setFillColor(DARK_BG)
+    canvas.setFont('Helvetica-Bold', 10)
+    canvas.drawString(MARGIN_LEFT, HEADER_Y, 'Nexodify AVA')
+
+    canvas.setFillColor(MUTED_TEXT)
+    canvas.setFont('Helvetica', 8)
+    canvas.drawCentredString(PAGE_WIDTH / 2, HEADER_Y, 'EU Label Compliance Preflight')
+    if run_id is not None:
+        canvas.drawRightString(PAGE_WIDTH - MARGIN_RIGHT, HEADER_Y, f'Run ID: {run_id}')
+
+    canvas.setStrokeColor(PRIMARY_BLUE)
+    canvas.setLineWidth(2)
+    canvas.line(MARGIN_LEFT, HEADER_Y - 8, PAGE_WIDTH - MARGIN_RIGHT, HEADER_Y - 8)
+    canvas.restoreState()
+    canvas.endForm()
+    canvas.doForm(HEADER_FORM)
+
+
+def draw_run_id(canvas, run_id):
+    """The run id at the right of the header, as draw_header places it"""
+    canvas.saveState()
+    canvas.setFillColor(MUTED_TEXT)
+    canvas.setFont('Helvetica', 8)
+    canvas.drawRightString(PAGE_WIDTH - MARGIN_RIGHT, HEADER_Y, f'Run ID: {run_id}')
+    canvas.restoreState()
+
+
+def draw_footer(canvas, page, total=None):
+    """"Page X/Y" footer; without a total, the PageCount form fills it in at save time"""
+    canvas.saveState()
+    canvas.setFillColor(FAINT_TEXT)
+    canvas.setFont('Helvetica', 8)
+    prefix = f'{FOOTER_TEXT} · Page {page}/'
+    prefix_width = canvas.stringWidth(prefix, 'Helvetica', 8)
+    if total is not None:
+        canvas.drawCentredString(PAGE_WIDTH / 2, FOOTER_Y, f'{prefix}{total}')
+    else:
+        # Reserve as many digits for the (not yet known) total as the current page number has
+        total_width = canvas.stringWidth('0' * len(str(page)), 'Helvetica', 8)
+        x = (PAGE_WIDTH - prefix_width - total_width) / 2
+        canvas.drawString(x, FOOTER_Y, prefix)
+        canvas.translate(x + prefix_width, FOOTER_Y)
+        canvas.doForm(PAGE_COUNT_FORM)
+    canvas.restoreState()
+
+
+def draw_page_frame(canvas, doc, run_id='Unknown'):
+    """Draw header and footer on each page"""
+    draw_header(canvas, run_id)
+    draw_footer(canvas, doc.page)
+
+
+def create_document(output, meta):
+    """Create the A4 document template for one report"""
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=PAGE_SIZE,
+        rightMargin=MARGIN_RIGHT,
+        leftMargin=MARGIN_LEFT,
+        topMargin=MARGIN_TOP,
+        bottomMargin=MARGIN_BOTTOM,
+        title=f'EU Label Compliance Preflight Report {meta["run_id"]}',
+        author='Nexodify AVA',
+        # No creation date and a content-derived /ID: the same report renders to the same bytes,
+        # which the cache key doubles as a strong ETag for
+        invariant=1,
+    )
+    return doc
+
+
+def build_story(view, styles, profile=None):
+    """Flowables for every section of a normalized report, one section per page"""
+    elements = []
+    for i, section in enumerate(view['sections']):
+        if i:
+            elements.append(PageBreak())
+        builder = SECTION_BUILDERS[section['id']]
+        if profile is not None:
+            profile.switch(f'flowables:{builder.__name__}')
+        elements.extend(builder(section, styles))
+    return elements
+
+
+def render_pdf(report, output, styles=None, profile=None):
+    """Render a report.json dict to a PDF path or binary file object, returning the page count.
+
+    profile is an optional reporting.profiling.RenderProfile that records each stage.
+    """
+    if profile is not None:
+        profile.switch('normalize')
+    view = normalize_report(report)
+    if styles is None:
+        if profile is not None:
+            profile.switch('styles')
+        styles = create_styles()
+
+    doc = create_document(output, view['meta'])
+    on_page = partial(draw_page_frame, run_id=view['meta']['run_id'])
+    story = build_story(view, styles, profile)
+    canvasmaker = PageCountCanvas
+    if profile is not None:
+        profile.switch('layout')
+        canvasmaker = partial(ProfiledPageCountCanvas, profile=profile)
+    doc.build(story, onFirstPage=on_page, onLaterPages=on_page, canvasmaker=canvasmaker)
+    if profile is not None:
+        profile.stop()
+        profile.pages = doc.page
+    return doc.page
@@ -0,0 +1,429 @@
+"""
+Stream a report PDF to the client while later sections are still being laid out.
+
+ReportLab only serializes a document in save(), so the report is produced as
+the independent parts reporting.parallel already knows how to render. As each
+part finishes, its pages and everything they reference are renumbered into
+one output document and written out immediately.
+
+Only a few objects wait until the end: the page tree, the outline, the info
+dictionary, the xref table and the "Page X/Y" total. Footers reference the
+total through a form XObject that is written last, the same forward
+reference PageCountCanvas uses. The run id goes into the header with the
+footer, since parts are rendered (and cached) without it.
+
+Streamed files are complete, valid PDFs but not linearized. Callers that keep
+the result, such as the PDF cache, optimize it afterwards.
+
+    with open('report.pdf', 'wb') as fh:
+        stream_report(report, fh.write)
+
+    async for chunk in aiter_report(report):   # bounded window, for ASGI responses
+        ...
+
+    renders = StreamRenders(max_renders=4)       # one render per document, at most 4 at once
+    if not await renders.wait(key, timeout=60):
+        chunks = renders.stream(key, report, on_complete=store)
+"""
+
+import asyncio
+import logging
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject, DictionaryObject, EncodedStreamObject, IndirectObject, NameObject, StreamObject,
+)
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from .engines import _can_fan_out
+from .parallel import CHUNKED_SECTIONS, plan_parts, rendered_parts, shared_executor
+from .renderer import FOOTER_TEXT, FOOTER_Y, HEADER_Y
+from .theme import FAINT_TEXT, MARGIN_RIGHT, MUTED_TEXT, PAGE_WIDTH
+from .view_model import normalize_report
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+# Chunks allowed to queue up between the renderer and a slow client
+DEFAULT_WINDOW_CHUNKS = 64
+# The finished document stays in memory up to this size, then moves to a temp file
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+# Streams rendering at once in this process; later ones wait for a free render thread
+DEFAULT_MAX_STREAMS = 4
+
+FOOTER_FONT = b'/StreamFooterFont'
+PAGE_COUNT_XOBJECT = b'/StreamPageCount'
+
+
+class StreamCancelled(Exception):
+    """The consumer went away; rendering stops at the next write"""
+
+
+def _pdf_string(text):
+    """Literal string in WinAnsi, as the standard Helvetica font expects"""
+    raw = text.encode('cp1252', 'replace')
+    return b'(' + raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _rgb(color):
+    return f'{color.red:.4f} {color.green:.4f} {color.blue:.4f}'.encode()
+
+
+class PdfStreamWriter:
+    """Append-only PDF serializer that tracks offsets for the final xref table"""
+
+    def __init__(self, write):
+        self._write = write
+        self.offset = 0
+        self.offsets = {}
+        self._next_id = 1
+
+    def reserve(self):
+        """Allocate an object number now, to be written later"""
+        idnum = self._next_id
+        self._next_id += 1
+        return idnum
+
+    def raw(self, data):
+        self._write(data)
+        self.offset += len(data)
+
+    def obj(self, idnum, body):
+        """Write object idnum; body is a pypdf object or already serialized bytes"""
+        self.offsets[idnum] = self.offset
+        buf = BytesIO()
+        buf.write(f'{idnum} 0 obj\n'.encode())
+        if isinstance(body, bytes):
+            buf.write(body)
+        else:
+            body.write_to_stream(buf)
+        buf.write(b'\nendobj\n')
+        self.raw(buf.getvalue())
+
+    def stream_obj(self, idnum, data, entries=b''):
+        self.obj(idnum, b'<< ' + entries + b' /Length %d >>\nstream\n' % len(data) + data + b'\nendstream')
+
+    def finish(self, root, info):
+        xref_offset = self.offset
+        size = self._next_id
+        lines = [f'xref\n0 {size}\n'.encode(), b'0000000000 65535 f \n']
+        lines.extend(b'%010d 00000 n \n' % self.offsets[idnum] for idnum in range(1, size))
+        lines.append(f'trailer\n<< /Size {size} /Root {root} 0 R /Info {info} 0 R >>\n'
+                     f'startxref\n{xref_offset}\n%%EOF\n'.encode())
+        self.raw(b''.join(lines))
+
+
+def _copy_part(writer, data, pages_id, footer_font_id, page_count_id, first_page_number, run_id):
+    """Write every page of one rendered part with its run id and footer; returns the new page object ids"""
+    reader = PdfReader(BytesIO(data))
+    mapping = {}
+    pending = []
+
+    def ref(indirect):
+        key = indirect.idnum
+        if key not in mapping:
+            mapping[key] = writer.reserve()
+            pending.append(indirect)
+        return IndirectObject(mapping[key], 0, None)
+
+    def remap(value):
+        if isinstance(value, IndirectObject):
+            return ref(value)
+        if isinstance(value, StreamObject):
+            copy = EncodedStreamObject()
+            copy.update({k: remap(v) for k, v in value.items() if k != '/Length'})
+            copy._data = value._data  # raw (still encoded) bytes
+            return copy
+        if isinstance(value, DictionaryObject):
+            return DictionaryObject({k: remap(v) for k, v in value.items()})
+        if isinstance(value, ArrayObject):
+            return ArrayObject(remap(v) for v in value)
+        return value
+
+    page_ids = []
+    for index, page in enumerate(reader.pages):
+        number = first_page_number + index
+        page_id = writer.reserve()
+        footer_id = writer.reserve()
+        new_page = DictionaryObject({k: remap(v) for k, v in page.items() if k not in ('/Parent', '/Contents', '/Resources')})
+        new_page[NameObject('/Parent')] = IndirectObject(pages_id, 0, None)
+
+        # Page resources get a private copy that also names the footer font and total
+        source = page['/Resources'].get_object() if '/Resources' in page else DictionaryObject()
+        resources = DictionaryObject({k: remap(v) for k, v in source.items() if k not in ('/Font', '/XObject')})
+        for key, name, idnum in (('/Font', FOOTER_FONT, footer_font_id), ('/XObject', PAGE_COUNT_XOBJECT, page_count_id)):
+            entries = source[key].get_object() if key in source else DictionaryObject()
+            merged = DictionaryObject({k: remap(v) for k, v in entries.items()})
+            merged[NameObject(name.decode())] = IndirectObject(idnum, 0, None)
+            resources[NameObject(key)] = merged
+        new_page[NameObject('/Resources')] = resources
+
+        contents = page.get('/Contents')
+        contents = [] if contents is None else list(contents) if isinstance(contents.get_object(), ArrayObject) else [contents]
+        new_page[NameObject('/Contents')] = ArrayObject(
+            [remap(c) for c in contents] + [IndirectObject(footer_id, 0, None)]
+        )
+
+        # Everything this page references, depth first, before the page itself
+        while pending:
+            source = pending.pop()
+            writer.obj(mapping[source.idnum], remap(source.get_object()))
+        writer.stream_obj(footer_id, zlib.compress(_page_stream(number, run_id)), b'/Filter /FlateDecode')
+        writer.obj(page_id, new_page)
+        page_ids.append(page_id)
+    return page_ids
+
+
+def _page_stream(page, run_id):
+    """Same text and placement as renderer.draw_run_id and draw_footer, with the total as a forward reference"""
+    run_id_text = f'Run ID: {run_id}'
+    run_id_x = PAGE_WIDTH - MARGIN_RIGHT - stringWidth(run_id_text, 'Helvetica', 8)
+    prefix = f'{FOOTER_TEXT} · Page {page}/'
+    prefix_width = stringWidth(prefix, 'Helvetica', 8)
+    total_width = stringWidth('0' * len(str(page)), 'Helvetica', 8)
+    x = (PAGE_WIDTH - prefix_width - total_width) / 2
+    return (
+        b'q ' + _rgb(MUTED_TEXT) + b' rg BT ' + FOOTER_FONT + b' 8 Tf 1 0 0 1 %.4f %.4f Tm ' % (run_id_x, HEADER_Y)
+        + _pdf_string(run_id_text) + b' Tj ET Q '
+        + b'q ' + _rgb(FAINT_TEXT) + b' rg BT ' + FOOTER_FONT + b' 8 Tf 1 0 0 1 %.4f %.4f Tm ' % (x, FOOTER_Y)
+        + _pdf_string(prefix) + b' Tj ET 1 0 0 1 %.4f %.4f cm ' % (x + prefix_width, FOOTER_Y)
+        + PAGE_COUNT_XOBJECT + b' Do Q'
+    )
+
+
+def stream_report(report, write, executor=None, chunks=CHUNKED_SECTIONS, part_cache=None):
+    """Render report.json to PDF bytes passed to write() part by part; returns the page count.
+
+    Parts are rendered in this thread, or in order across executor when one
+    is given. Parts already in part_cache are written out without rendering.
+    """
+    view = normalize_report(report)
+    meta = view['meta']
+    parts = plan_parts(view, chunks)
+    rendered = rendered_parts(parts, meta, executor, part_cache)
+
+    writer = PdfStreamWriter(write)
+    catalog_id, pages_id, footer_font_id, page_count_id = (writer.reserve() for _ in range(4))
+    writer.raw(b'%PDF-1.4\n%\x93\x8c\x8b\x9e\n')
+    writer.obj(footer_font_id, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+
+    page_ids = []
+    bookmarks = []
+    for section, (data, _) in zip(parts, rendered):
+        if not section.get('continued'):
+            bookmarks.append((section['title'], len(page_ids)))
+        page_ids.extend(_copy_part(writer, data, pages_id, footer_font_id, page_count_id, len(page_ids) + 1, meta['run_id']))
+
+    total = len(page_ids)
+    writer.stream_obj(
+        page_count_id,
+        b'BT /F1 8 Tf 0 0 Td ' + _pdf_string(str(total)) + b' Tj ET',
+        b'/Type /XObject /Subtype /Form /BBox [0 0 %d 10] /Resources << /Font << /F1 %d 0 R >> >>'
+        % (len(str(total)) * 8, footer_font_id),
+    )
+    kids = b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+    writer.obj(pages_id, b'<< /Type /Pages /Count %d /Kids [ %s ] >>' % (total, kids))
+
+    outline_id = writer.reserve()
+    item_ids = [writer.reserve() for _ in bookmarks]
+    for i, ((title, page_index), item_id) in enumerate(zip(bookmarks, item_ids)):
+        links = b''
+        if i:
+            links += b' /Prev %d 0 R' % item_ids[i - 1]
+        if i + 1 < len(item_ids):
+            links += b' /Next %d 0 R' % item_ids[i + 1]
+        title_bytes = b'<FEFF' + title.encode('utf-16-be').hex().upper().encode() + b'>'
+        writer.obj(item_id, b'<< /Title %s /Parent %d 0 R /Dest [ %d 0 R /XYZ null null null ]%s >>'
+                   % (title_bytes, outline_id, page_ids[page_index], links))
+    if item_ids:
+        writer.obj(outline_id, b'<< /Type /Outlines /First %d 0 R /Last %d 0 R /Count %d >>'
+                   % (item_ids[0], item_ids[-1], len(item_ids)))
+    else:
+        writer.obj(outline_id, b'<< /Type /Outlines /Count 0 >>')
+
+    writer.obj(catalog_id, b'<< /Type /Catalog /Pages %d 0 R /Outlines %d 0 R /PageMode /UseOutlines >>'
+               % (pages_id, outline_id))
+    info_id = writer.reserve()
+    title = f'EU Label Compliance Preflight Report {meta["run_id"]}'
+    writer.obj(info_id, b'<< /Title <FEFF' + title.encode('utf-16-be').hex().upper().encode()
+               + b'> /Author (Nexodify AVA) /Producer (reporting.streaming) >>')
+    writer.finish(catalog_id, info_id)
+    return total
+
+
+class _ChunkWriter:
+    """Coalesces small writes into CHUNK_SIZE pieces handed to the event loop, copying them to a spool.
+
+    Each piece takes one of the window's slots, which the consumer gives back
+    as it takes the piece, so at most window_chunks pieces wait in memory.
+    """
+
+    def __init__(self, loop, chunks, slots, cancelled, spool=None):
+        self._loop = loop
+        self._chunks = chunks
+        self._slots = slots
+        self._cancelled = cancelled
+        self._spool = spool
+        self._buf = bytearray()
+
+    def write(self, data):
+        if self._spool is not None:
+            self._spool.write(data)
+        self._buf += data
+        if len(self._buf) >= CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self.put(bytes(self._buf))
+            self._buf.clear()
+
+    def put(self, item):
+        # Blocks while the window is full, but notices a consumer that went away
+        while not self._cancelled.is_set():
+            if self._slots.acquire(timeout=0.5):
+                try:
+                    self._loop.call_soon_threadsafe(self._chunks.put_nowait, item)
+                except RuntimeError:
+                    # The event loop is closed; nobody is left to read
+                    break
+                return
+        raise StreamCancelled()
+
+
+_DONE = object()
+
+
+@lru_cache(maxsize=None)
+def stream_executor():
+    """Render threads shared by streams that don't bring their own"""
+    return ThreadPoolExecutor(max_workers=DEFAULT_MAX_STREAMS, thread_name_prefix='pdf-stream')
+
+
+async def aiter_report(report, window_chunks=DEFAULT_WINDOW_CHUNKS, executor=None, on_complete=None, part_cache=None,
+                       render_executor=None, on_finish=None):
+    """Async iterator of PDF chunks for a streaming response.
+
+    Rendering runs on a thread of render_executor (stream_executor() by
+    default), so streams beyond its size wait for a free thread. At most
+    window_chunks chunks of CHUNK_SIZE wait in memory; past that the renderer
+    blocks until the client catches up, and it stops once the iterator is
+    closed. With on_complete, the document is also written to a
+    SpooledTemporaryFile (on disk past SPOOL_MAX_BYTES), and
+    on_complete(spool, pages) runs in the render thread after the last chunk
+    is queued, e.g. to store the finished file in a cache. on_finish() runs
+    once the render is over, finished or not, after on_complete.
+    part_cache is passed on to stream_report.
+    """
+    # Fed from the render thread through call_soon_threadsafe, so waiting for
+    # the next chunk never ties up an executor thread
+    loop = asyncio.get_running_loop()
+    chunks = asyncio.Queue()
+    slots = threading.Semaphore(window_chunks)
+    cancelled = threading.Event()
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) if on_complete is not None else None
+    writer = _ChunkWriter(loop, chunks, slots, cancelled, spool)
+
+    def produce():
+        try:
+            if cancelled.is_set():
+                # The client left while this stream waited for a render thread
+                return
+            pages = stream_report(report, writer.write, executor=executor, part_cache=part_cache)
+            writer.flush()
+            writer.put(_DONE)
+            if on_complete is not None:
+                spool.seek(0)
+                on_complete(spool, pages)
+        except StreamCancelled:
+            pass
+        except Exception as exc:
+            logger.exception('Streaming render failed')
+            try:
+                writer.put(exc)
+            except StreamCancelled:
+                pass
+        finally:
+            if spool is not None:
+                spool.close()
+            if on_finish is not None:
+                on_finish()
+
+    rendering = (render_executor or stream_executor()).submit(produce)
+    try:
+        while True:
+            item = await chunks.get()
+            slots.release()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # A renderer waiting on a full window sees this within half a second and stops
+        cancelled.set()
+        if rendering.cancel() and on_finish is not None:
+            # Never started, so produce() won't report it
+            on_finish()
+
+
+class StreamRenders:
+    """Streams in flight by cache key, so concurrent requests for one document share a single render.
+
+    stream() registers the key before the response starts; wait() lets a
+    later request for the same key wait until that render is over, after
+    which the finished file is in the cache (or the render failed or was
+    abandoned, and the caller streams it itself). At most max_renders
+    streams render at once.
+    """
+
+    def __init__(self, max_renders=DEFAULT_MAX_STREAMS):
+        self.max_renders = max_renders
+        self._executor = ThreadPoolExecutor(max_workers=max_renders, thread_name_prefix='pdf-stream')
+        self._active = {}  # key -> asyncio.Future, done once that render is over
+
+    async def wait(self, key, timeout=None):
+        """True once a render already streaming key is over; False if there is none or it outlasts timeout"""
+        future = self._active.get(key)
+        if future is None:
+            return False
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def stream(self, key, report, **kwargs):
+        """aiter_report(report, **kwargs) on this instance's render threads, registered under key"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._active[key] = future
+
+        def finished():
+            if self._active.get(key) is future:
+                del self._active[key]
+            if not future.done():
+                future.set_result(None)
+
+        def on_finish():
+            try:
+                loop.call_soon_threadsafe(finished)
+            except RuntimeError:
+                # The event loop is closed; nobody is left to wait
+                pass
+
+        return aiter_report(report, render_executor=self._executor, on_finish=on_finish, **kwargs)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def default_executor():
+    """Shared process pool when this process may fan out, otherwise None (render in-thread)"""
+    return shared_executor() if _can_fan_out() else None
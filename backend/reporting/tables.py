@@ -0,0 +1,102 @@
+"""
+Long tables that measure each row once.
+
+A platypus Table that spans many pages is split one page at a time, and each
+split builds a new Table from the remaining rows. With ReportLab 4.x the
+total stays close to linear in the row count, but rows are still measured
+more than once along the way.
+
+BatchedTable measures every row once, at fixed column widths and in batches
+of MEASURE_BATCH_ROWS. On a split it takes as many rows as fit on the page
+into an ordinary Table with the header repeated and the row heights already
+known, so nothing is measured twice. What is left stays a BatchedTable that
+shares the measurements. The gain is a constant factor, not a better curve:
+benchmarks/long_tables.py measures 250 to 2,000 rows at 1.7-1.9 ms per row
+batched against 2.3-2.7 ms for the plain Table, roughly 28% less.
+"""
+
+from reportlab.platypus import Flowable, Table
+
+# Tables shorter than this are plain Tables: they rarely span more than two pages
+BATCHED_TABLE_MIN_ROWS = 60
+MEASURE_BATCH_ROWS = 200
+
+
+def long_table(rows, col_widths, style, repeat_rows=1):
+    """Table for rows (header rows first) that may run over many pages"""
+    if len(rows) - repeat_rows < BATCHED_TABLE_MIN_ROWS:
+        table = Table(rows, colWidths=col_widths, repeatRows=repeat_rows)
+        table.setStyle(style)
+        return table
+    return BatchedTable(rows, col_widths, style, repeat_rows)
+
+
+def _row_heights(rows, col_widths, style):
+    table = Table(rows, colWidths=col_widths)
+    table.setStyle(style)
+    table.wrap(sum(col_widths), 1 << 30)
+    return list(table._rowHeights)
+
+
+class BatchedTable(Flowable):
+    """Multi-page table with header rows repeated and each body row measured only once"""
+
+    def __init__(self, rows, col_widths, style, repeat_rows=1, _measured=None):
+        super().__init__()
+        self.hAlign = 'CENTER'  # as Table
+        self.col_widths = list(col_widths)
+        self.style = style
+        self.header = rows[:repeat_rows]
+        self.body = rows[repeat_rows:]
+        if _measured is None:
+            _measured = self._measure()
+        self.header_heights, self.body_heights = _measured
+
+    def _measure(self):
+        # The header is measured with the first batch; the style targets header rows by index
+        header_heights = None
+        body_heights = []
+        for start in range(0, len(self.body), MEASURE_BATCH_ROWS):
+            heights = _row_heights(self.header + self.body[start:start + MEASURE_BATCH_ROWS], self.col_widths, self.style)
+            header_heights = heights[:len(self.header)]
+            body_heights.extend(heights[len(self.header):])
+        if header_heights is None:
+            header_heights = _row_heights(self.header, self.col_widths, self.style) if self.header else []
+        return header_heights, body_heights
+
+    def _table(self, start, stop):
+        table = Table(
+            self.header + self.body[start:stop],
+            colWidths=self.col_widths,
+            rowHeights=self.header_heights + self.body_heights[start:stop],
+            repeatRows=len(self.header),
+        )
+        table.setStyle(self.style)
+        return table
+
+    def wrap(self, availWidth, availHeight):
+        self.width = sum(self.col_widths)
+        self.height = sum(self.header_heights) + sum(self.body_heights)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        space = availHeight - sum(self.header_heights)
+        stop = 0
+        while stop < len(self.body) and self.body_heights[stop] <= space:
+            space -= self.body_heights[stop]
+            stop += 1
+        if stop == 0:
+            # Not even one row fits: let the frame move on to the next page
+            return []
+        if stop == len(self.body):
+            return [self._table(0, stop)]
+        rest = BatchedTable(
+            self.header + self.body[stop:], self.col_widths, self.style, len(self.header),
+            _measured=(self.header_heights, self.body_heights[stop:]),
+        )
+        return [self._table(0, stop), rest]
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        table = self._table(0, len(self.body))
+        table.wrapOn(canvas, self.width, self.height)
+        table.drawOn(canvas, x, y, _sW)
@@ -0,0 +1,155 @@
+"""
+Colors, page geometry and paragraph styles shared by the report renderers
+"""
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+
+# Color definitions
+PRIMARY_BLUE = colors.HexColor('#5B6CFF')
+DARK_BG = colors.HexColor('#1a1a2e')
+LIGHT_BG = colors.HexColor('#f8f9fc')
+BORDER_COLOR = colors.HexColor('#e2e8f0')
+CRITICAL_RED = colors.HexColor('#ef4444')
+WARNING_AMBER = colors.HexColor('#f59e0b')
+PASS_GREEN = colors.HexColor('#22c55e')
+MUTED_TEXT = colors.HexColor('#666666')
+FAINT_TEXT = colors.HexColor('#94a3b8')
+EVIDENCE_BG = colors.HexColor('#f1f5f9')
+PRINT_PACK_BG = colors.HexColor('#f0fdf4')
+PRINT_PACK_BORDER = colors.HexColor('#bbf7d0')
+HALAL_BG = colors.HexColor('#fefce8')
+HALAL_BORDER = colors.HexColor('#fde68a')
+HALAL_NOTE_BG = colors.HexColor('#fef3c7')
+HALAL_NOTE_TEXT = colors.HexColor('#92400e')
+
+# Hex strings for inline <font color="..."> markup, keyed by normalized status
+STATUS_COLORS = {
+    'critical': '#ef4444',
+    'fail': '#ef4444',
+    'warning': '#f59e0b',
+    'pass': '#22c55e',
+    'unknown': '#94a3b8',
+}
+STATUS_ICONS = {
+    'critical': '✕',
+    'fail': '✕',
+    'warning': '!',
+    'pass': '✓',
+    'unknown': '?',
+}
+
+# A4 geometry
+PAGE_SIZE = A4
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN_LEFT = 15 * mm
+MARGIN_RIGHT = 15 * mm
+MARGIN_TOP = 22 * mm
+MARGIN_BOTTOM = 20 * mm
+CONTENT_WIDTH = PAGE_WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+
+
+def create_styles():
+    """Create custom paragraph styles"""
+    styles = getSampleStyleSheet()
+
+    styles.add(ParagraphStyle(
+        name='MainTitle',
+        fontName='Helvetica-Bold',
+        fontSize=22,
+        leading=26,
+        textColor=DARK_BG,
+        alignment=TA_CENTER,
+        spaceAfter=6,
+    ))
+
+    styles.add(ParagraphStyle(
+        name='Subtitle',
+        fontName='Helvetica',
+        fontSize=11,
+        textColor=MUTED_TEXT,
+        alignment=TA_CENTER,
+        spaceAfter=20,
+    ))
+
+    styles.add(ParagraphStyle(
+        name='SectionTitle',
+        fontName='Helvetica-Bold',
+        fontSize=14,
+        leading=18,
+        textColor=DARK_BG,
+        spaceBefore=12,
+        spaceAfter=8,
+    ))
+
+    styles.add(ParagraphStyle(
+        name='CardTitle',
+        fontName='Helvetica-Bold',
+        fontSize=8,
+        textColor=PRIMARY_BLUE,
+        spaceAfter=8,
+    ))
+
+    styles.add(ParagraphStyle(
+        name='BodyTextCustom',
+        fontName='Helvetica',
+        fontSize=10,
+        leading=13,
+        textColor=DARK_BG,
+        spaceAfter=6,
+    ))
+
+    styles.add(ParagraphStyle(
+        name='SmallText',
+        fontName='Helvetica',
+        fontSize=9,
+        leading=12,
+        textColor=MUTED_TEXT,
+        spaceAfter=4,
+    ))
+
+    styles.add(ParagraphStyle(
+        name='TinyText',
+        fontName='Helvetica',
+        fontSize=8,
+        textColor=FAINT_TEXT,
+        spaceAfter=2,
+    ))
+
+    styles.add(ParagraphStyle(
+        name='FindingTitle',
+        fontName='Helvetica-Bold',
+        fontSize=10,
+        textColor=DARK_BG,
+        spaceAfter=4,
+    ))
+
+    styles.add(ParagraphStyle(
+        name='EvidenceText',
+        fontName='Helvetica-Oblique',
+        fontSize=9,
+        leading=12,
+        textColor=colors.HexColor('#475569'),
+        spaceAfter=4,
+    ))
+
+    styles.add(ParagraphStyle(
+        name='ScoreText',
+        fontName='Helvetica-Bold',
+        fontSize=36,
+        leading=40,
+        alignment=TA_CENTER,
+    ))
+
+    styles.add(ParagraphStyle(
+        name='Footer',
+        fontName='Helvetica',
+        fontSize=8,
+        textColor=FAINT_TEXT,
+        alignment=TA_CENTER,
+    ))
+
+    return styles
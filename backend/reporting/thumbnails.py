@@ -0,0 +1,129 @@
+"""
+First-page PNG thumbnails of report PDFs, for run lists and dashboards.
+
+Thumbnails are rasterized with PyMuPDF and stored next to the PDF:
+<run_dir>/report.pdf gets <run_dir>/report-thumb.png. The batch renderer and
+the report.pdf endpoint write one whenever they render. This module's CLI
+backfills runs rendered before that, or whose report.json changed since.
+Runs that only have a report.json are rendered first.
+
+    cd backend
+    python -m reporting.thumbnails /srv/ava/data/runs            # missing or stale thumbnails
+    python -m reporting.thumbnails /srv/ava/data/runs --force    # all of them
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_WIDTH = 240
+THUMBNAIL_SUFFIX = '-thumb.png'
+
+
+def thumbnail_path(pdf_path):
+    """Where the thumbnail of a PDF lives: report.pdf -> report-thumb.png"""
+    pdf_path = Path(pdf_path)
+    return pdf_path.with_name(pdf_path.stem + THUMBNAIL_SUFFIX)
+
+
+def render_thumbnail(data, width=THUMBNAIL_WIDTH):
+    """PNG bytes of the first page of PDF data, width pixels wide; None if PyMuPDF is missing"""
+    try:
+        import pymupdf
+    except ImportError:
+        logger.warning('PyMuPDF is not installed; no report thumbnails')
+        return None
+
+    with pymupdf.open(stream=data, filetype='pdf') as doc:
+        page = doc[0]
+        scale = width / page.rect.width
+        pixmap = page.get_pixmap(matrix=pymupdf.Matrix(scale, scale), alpha=False)
+        return pixmap.tobytes('png')
+
+
+def write_thumbnail(data, path, width=THUMBNAIL_WIDTH):
+    """Write the thumbnail of PDF data to path; returns the PNG size in bytes, or 0 if none was written"""
+    png = render_thumbnail(data, width)
+    if png is None:
+        return 0
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_bytes(png)
+    os.replace(tmp_path, path)
+    return len(png)
+
+
+def is_stale(thumb, *sources):
+    """True if thumb is missing or older than any existing source file"""
+    try:
+        built = Path(thumb).stat().st_mtime
+    except FileNotFoundError:
+        return True
+    return any(Path(s).exists() and Path(s).stat().st_mtime > built for s in sources)
+
+
+def _pdf_bytes(run_dir):
+    pdf_path = run_dir / 'report.pdf'
+    if pdf_path.exists():
+        return pdf_path.read_bytes()
+    # Served from the PDF cache only: lay the report out again, it isn't kept in the run directory
+    from .engines import render_report
+    from .renderer import load_report
+
+    buf = BytesIO()
+    render_report(load_report(run_dir / 'report.json'), buf)
+    return buf.getvalue()
+
+
+def backfill(root, force=False, width=THUMBNAIL_WIDTH, on_result=None):
+    """Thumbnail every run under root that lacks a current one; returns the per-run results.
+
+    A run is a directory with report.pdf or report.json; runs without a PDF are rendered first.
+    """
+    root = Path(root)
+    run_dirs = sorted({p.parent for name in ('report.pdf', 'report.json') for p in root.rglob(name) if p.is_file()})
+    results = []
+    for run_dir in run_dirs:
+        thumb = thumbnail_path(run_dir / 'report.pdf')
+        if not force and not is_stale(thumb, run_dir / 'report.pdf', run_dir / 'report.json'):
+            continue
+        started = time.perf_counter()
+        try:
+            size = write_thumbnail(_pdf_bytes(run_dir), thumb, width)
+            result = {'source': str(run_dir), 'output': str(thumb), 'ok': bool(size), 'bytes': size,
+                      'error': None if size else 'PyMuPDF is not installed'}
+        except Exception as exc:  # noqa: BLE001 - report and continue with the backfill
+            result = {'source': str(run_dir), 'output': str(thumb), 'ok': False, 'error': f'{type(exc).__name__}: {exc}'}
+        result['seconds'] = time.perf_counter() - started
+        results.append(result)
+        if on_result:
+            on_result(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Create first-page PNG thumbnails for rendered reports')
+    parser.add_argument('root', help='Directory searched recursively for runs (report.pdf or report.json)')
+    parser.add_argument('--force', action='store_true', help='Regenerate thumbnails that look current')
+    parser.add_argument('--width', type=int, default=THUMBNAIL_WIDTH, help=f'Width in pixels (default: {THUMBNAIL_WIDTH})')
+    args = parser.parse_args(argv)
+
+    def progress(result):
+        mark = '✅' if result['ok'] else '❌'
+        detail = f'{result["bytes"] / 1024:.1f} KB' if result['ok'] else result['error']
+        print(f'{mark} {result["output"]} ({detail}, {result["seconds"]:.2f}s)')
+
+    results = backfill(args.root, args.force, args.width, on_result=progress)
+    failed = [r for r in results if not r['ok']]
+    print(f'Created {len(results) - len(failed)}/{len(results)} thumbnails')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Normalize a v2 report.json into the section view model the PDF pages render.
+
+Mirrors frontend/src/lib/reportViewModel.js so the PDF and the web report
+show the same fallbacks ("Not provided"), status names and section order.
+"""
+
+NOT_PROVIDED = 'Not provided'
+
+
+def safe_text(value, fallback=NOT_PROVIDED):
+    if value is None:
+        return fallback
+    if isinstance(value, str):
+        return value if value.strip() else fallback
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return fallback
+
+
+def safe_list(value):
+    return value if isinstance(value, list) else []
+
+
+def normalize_status(value):
+    if not value:
+        return 'unknown'
+    status = str(value).lower()
+    if status == 'high':
+        return 'critical'
+    if status in ('medium', 'warn'):
+        return 'warning'
+    if status == 'low':
+        return 'pass'
+    return status
+
+
+def normalize_verdict(value):
+    raw = str(value or '').upper()
+    if raw in ('PASS', 'FAIL', 'NEEDS_REVIEW'):
+        return raw
+    return 'NEEDS_REVIEW'
+
+
+def _product(report):
+    product = report.get('product') or {}
+    languages = product.get('languages_provided', report.get('languages_provided'))
+    if isinstance(languages, list):
+        languages = ', '.join(languages) if languages else NOT_PROVIDED
+    category = product.get('category', product.get('categories'))
+    if isinstance(category, list):
+        category = ', '.join(category) if category else NOT_PROVIDED
+    return {
+        'product_name': safe_text(product.get('product_name', report.get('product_name'))),
+        'company_name': safe_text(product.get('company_name', report.get('company_name'))),
+        'country_of_sale': safe_text(product.get('country_of_sale', report.get('country_of_sale'))),
+        'languages_provided': safe_text(languages),
+        'category': safe_text(category),
+    }
+
+
+def _counts(report, findings):
+    summary = report.get('summary') or {}
+
+    def count(key, status):
+        value = summary.get(key)
+        if value is None:
+            value = sum(1 for f in findings if f['status'] == status)
+        return value
+
+    issues_total = summary.get('issues_total')
+    return {
+        'critical': count('critical', 'critical'),
+        'warnings': count('warnings', 'warning'),
+        'passed': count('passed', 'pass'),
+        'issues_total': len(findings) if issues_total is None else issues_total,
+    }
+
+
+def _evidence_confidence(report):
+    for key in ('evidence_confidence', 'evidence_confidence_percent'):
+        value = report.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+    overall = (report.get('evidence_confidence_detail') or {}).get('overall')
+    if isinstance(overall, (int, float)):
+        return round(overall * 100)
+    return 0
+
+
+def _finding(finding):
+    return {
+        'id': safe_text(finding.get('id'), ''),
+        'title': safe_text(finding.get('title')),
+        'status': normalize_status(finding.get('status')),
+        'source': safe_text(finding.get('source')),
+        'fix': safe_text(finding.get('fix')),
+        'detail': safe_text(finding.get('detail'), ''),
+        'reference': safe_text(finding.get('reference', finding.get('id'))),
+        'evidence': [
+            {
+                'source': safe_text(entry.get('source'), 'Source'),
+                'page': entry.get('page'),
+                'excerpt': safe_text(entry.get('excerpt')),
+            }
+            for entry in safe_list(finding.get('evidence')) if isinstance(entry, dict)
+        ],
+    }
+
+
+def _check(check):
+    evidence = [e for e in safe_list(check.get('evidence')) if isinstance(e, dict)]
+    return {
+        'id': safe_text(check.get('id'), ''),
+        'title': safe_text(check.get('title')),
+        'status': normalize_status(check.get('status') or check.get('result')),
+        'severity': safe_text(check.get('severity'), ''),
+        'detail': safe_text(check.get('detail', check.get('description')), ''),
+        'fix': safe_text(check.get('fix'), ''),
+        'snippet': safe_text(evidence[0].get('snippet', evidence[0].get('excerpt')), '') if evidence else '',
+    }
+
+
+def normalize_report(report):
+    """Build {'meta', 'summary', 'sections'} from a raw report.json dict"""
+    product = report.get('product') or {}
+    halal_enabled = bool(product.get('halal_enabled') or report.get('halal'))
+    findings = [_finding(f) for f in safe_list(report.get('findings')) if isinstance(f, dict)]
+    checks = [_check(c) for c in safe_list(report.get('checks')) if isinstance(c, dict)]
+    counts = _counts(report, findings)
+    cross_check = report.get('cross_check') or {}
+    print_pack = report.get('print_pack') or {}
+    artifacts = report.get('artifacts') or {}
+    product_info = _product(report)
+
+    score = report.get('compliance_score')
+    if score is None:
+        score = report.get('score', 0)
+
+    summary = {
+        'verdict': normalize_verdict(safe_text(report.get('verdict'), 'NEEDS_REVIEW')),
+        'score': score if score is not None else 0,
+        'evidence_confidence': _evidence_confidence(report),
+        'counts': counts,
+    }
+
+    included = [
+        'Executive summary + compliance score',
+        'Findings with severity + fixes' if findings else NOT_PROVIDED,
+        'Evidence excerpts' if any(f['evidence'] for f in findings) else NOT_PROVIDED,
+        'Label ↔ TDS cross-check' if report.get('cross_check') else NOT_PROVIDED,
+        'Print Verification Pack' if report.get('print_pack') else NOT_PROVIDED,
+        'Halal export-readiness preflight' if halal_enabled else NOT_PROVIDED,
+    ]
+
+    sections = [
+        {
+            'id': 'executive_summary',
+            'title': 'Executive Summary',
+            'product': product_info,
+            'summary': summary,
+            'included': included,
+        },
+        {
+            'id': 'findings_overview',
+            'title': 'Findings Overview',
+            'findings': findings,
+        },
+        {
+            'id': 'evidence_details',
+            'title': 'Evidence & Fix Details',
+            'findings': findings,
+        },
+        {
+            'id': 'cross_check',
+            'title': 'Label ↔ TDS Cross-Check',
+            'matched': [
+                {'field': safe_text(item.get('field')), 'note': safe_text(item.get('note'), '')}
+                for item in safe_list(cross_check.get('matched')) if isinstance(item, dict)
+            ],
+            'mismatched': [
+                {'field': safe_text(item.get('field')), 'note': safe_text(item.get('note'))}
+                for item in safe_list(cross_check.get('mismatched')) if isinstance(item, dict)
+            ],
+            'category_label': product_info['category'],
+        },
+        {
+            'id': 'print_pack',
+            'title': 'Print Verification Pack',
+            'signoff_fields': [safe_text(f) for f in safe_list(print_pack.get('signoff_fields'))],
+            'prepress_checklist': [safe_text(i) for i in safe_list(print_pack.get('prepress_checklist'))],
+            'attachments_checklist': [safe_text(i) for i in safe_list(print_pack.get('attachments_checklist'))],
+            'printer_notes': safe_text(print_pack.get('printer_notes'), ''),
+        },
+    ]
+
+    if halal_enabled:
+        halal = report.get('halal') if isinstance(report.get('halal'), dict) else {}
+        sections.append({
+            'id': 'halal',
+            'title': 'Halal Export-Readiness Preflight',
+            'items': [
+                {
+                    'id': safe_text(c.get('id'), ''),
+                    'title': safe_text(c.get('title')),
+                    'status': normalize_status(c.get('status') or c.get('severity')),
+                    'detail': safe_text(c.get('detail')),
+                    'fix': safe_text(c.get('fix'), ''),
+                    'source': safe_text(c.get('source'), 'N/A'),
+                }
+                for c in safe_list(report.get('halalChecks')) if isinstance(c, dict)
+            ],
+            'disclaimer': safe_text(report.get('halal_disclaimer'), ''),
+            'certificate': safe_text(report.get('halal_certificate', halal.get('certificate'))),
+            'target_market': product_info['country_of_sale'],
+        })
+
+    sections.append({
+        'id': 'next_steps',
+        'title': 'Next Steps & Audit Trail',
+        'items': [
+            {'priority': safe_text(s.get('priority'), 'P2'), 'task': safe_text(s.get('task'))}
+            for s in safe_list(report.get('next_steps')) if isinstance(s, dict)
+        ],
+        'run_dir': safe_text(artifacts.get('run_dir'), ''),
+        'files': [safe_text(f) for f in safe_list(artifacts.get('files'))],
+    })
+
+    if checks:
+        sections.append({
+            'id': 'checks_appendix',
+            'title': 'Appendix: Check Results',
+            'checks': checks,
+        })
+
+    return {
+        'meta': {
+            'run_id': safe_text(report.get('run_id'), 'Unknown'),
+            'created_at': report.get('ts') or report.get('created_at') or report.get('createdAt'),
+            'halal_enabled': halal_enabled,
+            'locale': safe_text(report.get('locale'), 'en-US'),
+        },
+        'summary': summary,
+        'sections': sections,
+    }
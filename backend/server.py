@@ -1,24 +1,90 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
 import os
+import re
+import json
+import base64
 import logging
+from functools import lru_cache
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List
+from tempfile import SpooledTemporaryFile
+from pydantic import BaseModel, Field, ConfigDict, ValidationError
+from typing import List, Optional
 import uuid
 from datetime import datetime, timezone
 
+from reporting import EngineUnavailable, PdfCache, cache_key, engine_version, load_report, normalize_report, select_engine
+from reporting.engines import AUTO_PARALLEL_MIN_WEIGHT, PARALLEL, REPORTLAB, WEASYPRINT, engine_available, report_weight
+from reporting.digest import render_digest, summarize_all
+from reporting.streaming import CHUNK_SIZE, SPOOL_MAX_BYTES, StreamRenders, default_executor
+from reporting.thumbnails import is_stale, thumbnail_path, write_thumbnail
+from render_queue import BULK, DONE, FAILED, INTERACTIVE, LANES, RenderQueue, RenderWorkers
+from write_batcher import InsertBatcher
+from fast_json import JSON_MEDIA_TYPE, dump_document, dump_documents
+
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# tz_aware: datetimes come back as UTC-aware, as the API serializes them
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
 
+# Report artifacts: /srv/ava/data/runs/<run_id>/report.json
+RUNS_DIR = Path(os.environ.get('RUNS_DIR', '/srv/ava/data/runs'))
+RUN_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+# auto | reportlab | weasyprint
+PDF_ENGINE = os.environ.get('PDF_ENGINE', 'auto')
+# Uncached reports at least this heavy are streamed while they render (0 disables)
+PDF_STREAM_MIN_WEIGHT = int(os.environ.get('PDF_STREAM_MIN_WEIGHT', str(AUTO_PARALLEL_MIN_WEIGHT)))
+# Streamed renders running at once; further streams wait for one to finish
+PDF_STREAM_MAX_RENDERS = int(os.environ.get('PDF_STREAM_MAX_RENDERS', '4'))
+
+# Lay ReportLab reports out section by section and reuse unchanged sections on reruns (0 disables)
+PDF_DELTA_RENDER = os.environ.get('PDF_DELTA_RENDER', '1') != '0'
+# Render workers in this process; RENDER_INTERACTIVE_RESERVED of them never take bulk jobs
+RENDER_WORKERS = int(os.environ.get('RENDER_WORKERS', '2'))
+RENDER_INTERACTIVE_RESERVED = int(os.environ.get('RENDER_INTERACTIVE_RESERVED', '1'))
+# Runs one GET /api/digest.pdf may cover; the whole portfolio is rendered offline (python -m reporting.digest)
+DIGEST_MAX_RUNS = int(os.environ.get('DIGEST_MAX_RUNS', '50'))
+# How long report.pdf waits for its render job before answering 202 with a status URL
+PDF_WAIT_SECONDS = float(os.environ.get('PDF_WAIT_SECONDS', '60'))
+# Concurrent POST /api/status inserts are written together, after at most STATUS_WRITE_FLUSH_MS
+# or once STATUS_WRITE_MAX_BATCH are queued (0 disables)
+STATUS_WRITE_BATCHING = os.environ.get('STATUS_WRITE_BATCHING', '1') != '0'
+STATUS_WRITE_FLUSH_MS = float(os.environ.get('STATUS_WRITE_FLUSH_MS', '5'))
+STATUS_WRITE_MAX_BATCH = int(os.environ.get('STATUS_WRITE_MAX_BATCH', '500'))
+
+@lru_cache(maxsize=None)
+def get_pdf_cache():
+    return PdfCache(
+        os.environ.get('PDF_CACHE_DIR', str(RUNS_DIR.parent / 'pdf-cache')),
+        max_bytes=int(os.environ.get('PDF_CACHE_MAX_MB', '2048')) * 1024 * 1024,
+    )
+
+@lru_cache(maxsize=None)
+def get_part_cache():
+    """Rendered report sections by content hash, shared by reruns whose sections didn't change"""
+    if not PDF_DELTA_RENDER:
+        return None
+    return PdfCache(
+        os.environ.get('PDF_PART_CACHE_DIR', str(RUNS_DIR.parent / 'pdf-part-cache')),
+        max_bytes=int(os.environ.get('PDF_PART_CACHE_MAX_MB', '512')) * 1024 * 1024,
+    )
+
+render_queue = RenderQueue(db.render_jobs)
+stream_renders = StreamRenders(PDF_STREAM_MAX_RENDERS)
+status_writes = InsertBatcher(db.status_checks, STATUS_WRITE_FLUSH_MS / 1000, STATUS_WRITE_MAX_BATCH)
+
 # Create the main app without a prefix
 app = FastAPI()
 
@@ -37,6 +103,10 @@ class StatusCheck(BaseModel):
 class StatusCheckCreate(BaseModel):
     client_name: str
 
+class RenderJobsCreate(BaseModel):
+    run_ids: List[str]
+    lane: str = BULK
+
 # Add your routes to the router instead of directly to app
 @api_router.get("/")
 async def root():
@@ -47,24 +117,415 @@ async def create_status_check(input: StatusCheckCreate):
     status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
     
-    # Convert to dict and serialize datetime to ISO string for MongoDB
+    # timestamp is stored as a native BSON date (older documents hold ISO
+    # strings until status_migration has converted them)
     doc = status_obj.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
     
-    _ = await db.status_checks.insert_one(doc)
+    # Coalesced with concurrent requests into one insert_many; returns once it is acknowledged
+    await status_writes.insert(doc)
     return status_obj
 
+# Status checks are listed in (timestamp, id) order, one page per request
+STATUS_PAGE_MAX = 1000
+STATUS_SORT = [("timestamp", ASCENDING), ("id", ASCENDING)]
+# Documents per round trip while streaming NDJSON
+STATUS_STREAM_BATCH = 500
+
+def encode_status_cursor(doc: dict) -> str:
+    """Opaque cursor pointing just past doc in (timestamp, id) order"""
+    timestamp = doc["timestamp"]
+    if isinstance(timestamp, datetime):
+        position = ["date", timestamp.isoformat(), doc["id"]]
+    else:
+        position = ["str", timestamp, doc["id"]]
+    raw = json.dumps(position, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def status_query(after: Optional[str]) -> dict:
+    """Mongo filter for the status checks that come after cursor"""
+    if not after:
+        return {}
+    try:
+        kind, timestamp, check_id = json.loads(base64.urlsafe_b64decode(after + "=" * (-len(after) % 4)))
+        if kind == "date":
+            timestamp = datetime.fromisoformat(timestamp)
+        elif kind != "str":
+            raise ValueError(kind)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    after_position = [
+        {"timestamp": {"$gt": timestamp}},
+        {"timestamp": timestamp, "id": {"$gt": check_id}},
+    ]
+    if kind == "str":
+        # Not yet migrated ISO strings sort before every BSON date, and they
+        # all predate the switch to dates, so all dates come after them
+        after_position.append({"timestamp": {"$type": "date"}})
+    return {"$or": after_position}
+
 @api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    # Exclude MongoDB's _id field from the query results
-    status_checks = await db.status_checks.find({}, {"_id": 0}).to_list(1000)
-    
-    # Convert ISO string timestamps back to datetime objects
-    for check in status_checks:
-        if isinstance(check['timestamp'], str):
-            check['timestamp'] = datetime.fromisoformat(check['timestamp'])
-    
-    return status_checks
+async def get_status_checks(limit: int = Query(default=STATUS_PAGE_MAX, ge=1, le=STATUS_PAGE_MAX),
+                            after: Optional[str] = None):
+    """One page of status checks; the cursor for the next page is in X-Next-Cursor and the Link header"""
+    # Exclude MongoDB's _id field from the query results; one extra document tells whether there is a next page
+    cursor = db.status_checks.find(status_query(after), {"_id": 0}).sort(STATUS_SORT).limit(limit + 1)
+    status_checks = await cursor.to_list(limit + 1)
+    headers = {}
+    if len(status_checks) > limit:
+        status_checks = status_checks[:limit]
+        next_cursor = encode_status_cursor(status_checks[-1])
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'</api/status?limit={limit}&after={next_cursor}>; rel="next"'
+    # Same body as response_model would render, without validating every document again
+    return Response(dump_documents(status_checks, StatusCheck), media_type=JSON_MEDIA_TYPE, headers=headers)
+
+@api_router.get("/status/stream")
+async def stream_status_checks(after: Optional[str] = None):
+    """Every status check after the cursor as NDJSON, sent as the database cursor yields them"""
+    query = status_query(after)
+
+    async def lines():
+        cursor = db.status_checks.find(query, {"_id": 0}).sort(STATUS_SORT).batch_size(STATUS_STREAM_BATCH)
+        try:
+            async for doc in cursor:
+                yield dump_document(doc, StatusCheck) + b"\n"
+        finally:
+            await cursor.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# Items accepted by one POST /api/status/bulk, and documents per insert_many
+STATUS_BULK_MAX_ITEMS = 50_000
+STATUS_BULK_BATCH = 1000
+# Body bytes allowed per item; a longer body is refused before it is read in full or parsed
+STATUS_BULK_MAX_ITEM_BYTES = 1024
+
+async def read_bulk_body(request: Request) -> bytes:
+    """The request body, refused with 413 as soon as it is known to exceed the bulk size limit"""
+    limit = STATUS_BULK_MAX_ITEMS * STATUS_BULK_MAX_ITEM_BYTES
+    too_large = HTTPException(status_code=413, detail=f"Body larger than {limit} bytes")
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > limit:
+        raise too_large
+    # Chunked bodies (or a wrong Content-Length) are counted as they arrive
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+def bulk_status_items(body: bytes, content_type: str) -> list:
+    """Items of a JSON array or NDJSON body; NDJSON lines that don't parse become ValueErrors"""
+    if content_type.split(";")[0].strip() == "application/x-ndjson":
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as exc:
+                items.append(ValueError(f"Invalid JSON: {exc}"))
+        return items
+    try:
+        items = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=422, detail="Body must be a JSON array of status checks")
+    return items
+
+def validation_message(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, error['loc'])) or 'item'}: {error['msg']}" for error in exc.errors())
+
+@api_router.post("/status/bulk")
+async def create_status_checks_bulk(request: Request):
+    """Insert many status checks from a JSON array or an NDJSON body (Content-Type: application/x-ndjson).
+
+    Items are validated one by one and written with unordered insert_many in
+    batches of STATUS_BULK_BATCH, so one bad item doesn't hold up the rest.
+    Every item gets a result at its index: its id, or the error that kept it
+    out. All items of a request share one timestamp, the time it was received.
+    A body over STATUS_BULK_MAX_ITEMS * STATUS_BULK_MAX_ITEM_BYTES is a 413.
+    """
+    items = bulk_status_items(await read_bulk_body(request), request.headers.get("content-type", ""))
+    if len(items) > STATUS_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {STATUS_BULK_MAX_ITEMS} status checks per request")
+
+    timestamp = datetime.now(timezone.utc)
+    results = [None] * len(items)
+    pending = []  # (index, document)
+    for index, item in enumerate(items):
+        if isinstance(item, ValueError):
+            results[index] = {"index": index, "error": str(item)}
+            continue
+        try:
+            create = StatusCheckCreate.model_validate(item)
+        except ValidationError as exc:
+            results[index] = {"index": index, "error": validation_message(exc)}
+            continue
+        pending.append((index, {"id": str(uuid.uuid4()), "client_name": create.client_name, "timestamp": timestamp}))
+
+    for start in range(0, len(pending), STATUS_BULK_BATCH):
+        batch = pending[start:start + STATUS_BULK_BATCH]
+        failed = {}
+        try:
+            await db.status_checks.insert_many([doc for _, doc in batch], ordered=False)
+        except BulkWriteError as exc:
+            failed = {error["index"]: error["errmsg"] for error in exc.details["writeErrors"]}
+        for position, (index, doc) in enumerate(batch):
+            if position in failed:
+                results[index] = {"index": index, "error": failed[position]}
+            else:
+                results[index] = {"index": index, "id": doc["id"]}
+
+    inserted = sum("id" in result for result in results)
+    return {"inserted": inserted, "failed": len(results) - inserted, "results": results}
+
+def load_run_report(run_id: str) -> dict:
+    if not RUN_ID_PATTERN.match(run_id):
+        raise HTTPException(status_code=404, detail="Run not found")
+    report_path = RUNS_DIR / run_id / 'report.json'
+    if not report_path.is_file():
+        raise HTTPException(status_code=404, detail="Run not found")
+    return load_report(report_path)
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+def parse_byte_range(header: str, size: int):
+    """(start, end) inclusive for a single "bytes=" range; None to send the whole file"""
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None  # multiple or malformed ranges: ignore and send everything
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start > end or start >= size:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+def resolve_pdf_engine(report: dict):
+    """(engine, streamable) for a run report; 503 if the configured engine can't run here"""
+    try:
+        engine = select_engine(report, PDF_ENGINE)
+    except EngineUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    # Large ReportLab reports are laid out part by part, as the parallel engine does, so they can stream
+    streamable = (
+        PDF_STREAM_MIN_WEIGHT > 0
+        and engine != WEASYPRINT
+        and engine_available(PARALLEL)
+        and report_weight(normalize_report(report)) >= PDF_STREAM_MIN_WEIGHT
+    )
+    # Section by section, so a rerun only lays out the sections its corrections changed
+    delta = PDF_DELTA_RENDER and engine == REPORTLAB and engine_available(PARALLEL)
+    return (PARALLEL if streamable or delta else engine), streamable
+
+def save_run_thumbnail(run_id: str, pdf: bytes):
+    """First-page PNG next to the run's artifacts, so run lists needn't fetch the PDF"""
+    try:
+        write_thumbnail(pdf, thumbnail_path(RUNS_DIR / run_id / 'report.pdf'))
+    except Exception:
+        logger.exception("Thumbnail for run %s failed", run_id)
+
+def run_render_job(job: dict):
+    """Render one queued job into the PDF cache (runs in a worker thread)"""
+    report = load_run_report(job["run_id"])
+    engine, _ = resolve_pdf_engine(report)
+    # Interactive jobs were already counted as a miss by the request that queued them.
+    # Bulk jobs hand their parts to the shared process pool only after any interactive part waiting for it.
+    bulk = job["lane"] == BULK
+    pdf, _, hit = get_pdf_cache().get_or_render(
+        report, key=job["key"], engine=engine, count=bulk, part_cache=get_part_cache(), background=bulk,
+    )
+    if not hit:
+        save_run_thumbnail(job["run_id"], pdf)
+
+render_workers = RenderWorkers(render_queue, run_render_job, RENDER_WORKERS, RENDER_INTERACTIVE_RESERVED)
+
+def job_pending_response(job: dict) -> JSONResponse:
+    return JSONResponse(
+        status_code=202,
+        content=jsonable_encoder(dict(job, status_url=f"/api/render-jobs/{job['id']}")),
+        headers={"Retry-After": "5", "Location": f"/api/render-jobs/{job['id']}"},
+    )
+
+async def cached_or_rendered_pdf(run_id: str, key: str):
+    """(pdf, hit, job): cached bytes, or the interactive lane renders them while we wait.
+
+    pdf is None if the job failed or is still running after PDF_WAIT_SECONDS.
+    """
+    pdf = await run_in_threadpool(get_pdf_cache().get, key)
+    if pdf is not None:
+        return pdf, True, None
+    job = await render_queue.enqueue(run_id, key, lane=INTERACTIVE)
+    job = await render_queue.wait(job["id"], PDF_WAIT_SECONDS)
+    if job["state"] == DONE:
+        pdf = await run_in_threadpool(get_pdf_cache().get, key, False)
+    return pdf, False, job
+
+@api_router.get("/runs/{run_id}/report.pdf")
+async def get_run_report_pdf(run_id: str, request: Request):
+    report = await run_in_threadpool(load_run_report, run_id)
+    engine, streamable = resolve_pdf_engine(report)
+    key = cache_key(report, engine=engine_version(engine))
+    headers = {
+        "ETag": f'"{key}"',
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": f'inline; filename="report-{run_id}.pdf"',
+        "Accept-Ranges": "bytes",
+    }
+    # Identical content renders to identical bytes (invariant ReportLab output, content-derived
+    # /ID when optimizing), so the hash is a strong validator, also for If-Range
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    if streamable:
+        pdf = await run_in_threadpool(get_pdf_cache().get, key)
+        hit = pdf is not None
+        if pdf is None and await stream_renders.wait(key, PDF_WAIT_SECONDS):
+            # Another request was streaming this document; its render is in the cache now
+            pdf = await run_in_threadpool(get_pdf_cache().get, key, False)
+        if pdf is None:
+            return stream_report_pdf(run_id, report, key, headers)
+    else:
+        pdf, hit, job = await cached_or_rendered_pdf(run_id, key)
+        if pdf is None:
+            if job["state"] == FAILED:
+                raise HTTPException(status_code=500, detail=f"Rendering failed: {job['error']}")
+            return job_pending_response(job)
+    headers["X-Cache"] = "HIT" if hit else "MISS"
+    headers["X-Render-Engine"] = engine
+
+    # PDFs are linearized; viewers fetch the first page with a range request and the rest lazily
+    range_header = request.headers.get("range")
+    if range_header and request.headers.get("if-range", headers["ETag"]) == headers["ETag"]:
+        byte_range = parse_byte_range(range_header, len(pdf))
+        if byte_range:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(pdf)}"
+            return Response(content=pdf[start:end + 1], status_code=206, media_type="application/pdf", headers=headers)
+    return Response(content=pdf, media_type="application/pdf", headers=headers)
+
+def stream_report_pdf(run_id: str, report: dict, key: str, headers: dict) -> StreamingResponse:
+    """Send pages as they are laid out (chunked), then cache the optimized document for later requests"""
+    def store(spool, pages):
+        save_run_thumbnail(run_id, get_pdf_cache().put_rendered(key, spool.read()))
+
+    # The streamed bytes aren't the linearized file later served under the ETag, so no validators or ranges
+    headers = {name: value for name, value in headers.items() if name not in ("ETag", "Accept-Ranges")}
+    headers["X-Cache"] = "MISS-STREAM"
+    headers["X-Render-Engine"] = PARALLEL
+    return StreamingResponse(
+        stream_renders.stream(key, report, executor=default_executor(), on_complete=store, part_cache=get_part_cache()),
+        media_type="application/pdf",
+        headers=headers,
+    )
+
+@api_router.get("/runs/{run_id}/thumbnail.png")
+async def get_run_thumbnail(run_id: str, request: Request):
+    if not RUN_ID_PATTERN.match(run_id):
+        raise HTTPException(status_code=404, detail="Run not found")
+    run_dir = RUNS_DIR / run_id
+    thumb = thumbnail_path(run_dir / 'report.pdf')
+    if is_stale(thumb, run_dir / 'report.pdf', run_dir / 'report.json'):
+        # Not rendered since the last change: render (or take the cached PDF) now
+        report = await run_in_threadpool(load_run_report, run_id)
+        engine, _ = resolve_pdf_engine(report)
+        pdf, _, job = await cached_or_rendered_pdf(run_id, cache_key(report, engine=engine_version(engine)))
+        if pdf is None:
+            if job["state"] == FAILED:
+                raise HTTPException(status_code=500, detail=f"Rendering failed: {job['error']}")
+            return job_pending_response(job)
+        if not await run_in_threadpool(write_thumbnail, pdf, thumb):
+            raise HTTPException(status_code=503, detail="Thumbnails are not available on this host")
+
+    stat = thumb.stat()
+    headers = {
+        "ETag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+        # The URL stays the same across reruns, so the browser revalidates every time (a 304 when unchanged)
+        "Cache-Control": "private, no-cache",
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(thumb, media_type="image/png", headers=headers)
+
+def render_digest_file(run_ids: List[str]):
+    """The digest PDF in a spool file (on disk past SPOOL_MAX_BYTES), rewound"""
+    for run_id in run_ids:
+        if not RUN_ID_PATTERN.match(run_id) or not (RUNS_DIR / run_id / 'report.json').is_file():
+            raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
+    # Reports that can't be read are logged and left out
+    entries = summarize_all(RUNS_DIR / run_id / 'report.json' for run_id in run_ids)
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        render_digest(entries, spool)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+def iter_spool(spool):
+    with spool:
+        while chunk := spool.read(CHUNK_SIZE):
+            yield chunk
+
+@api_router.get("/digest.pdf")
+async def get_portfolio_digest(run_id: List[str] = Query(default=[])):
+    """One PDF over the given runs (at most DIGEST_MAX_RUNS)"""
+    # Reading every report.json and laying out hundreds of products is too slow for a request
+    if not run_id:
+        raise HTTPException(
+            status_code=422,
+            detail="Pass the runs to cover as run_id; the digest of every product is rendered with python -m reporting.digest",
+        )
+    run_id = list(dict.fromkeys(run_id))
+    if len(run_id) > DIGEST_MAX_RUNS:
+        raise HTTPException(status_code=422, detail=f"At most {DIGEST_MAX_RUNS} runs per digest")
+    spool = await run_in_threadpool(render_digest_file, run_id)
+    return StreamingResponse(
+        iter_spool(spool),
+        media_type="application/pdf",
+        headers={"Content-Disposition": 'inline; filename="portfolio-digest.pdf"', "Cache-Control": "private, no-cache"},
+    )
+
+@api_router.post("/render-jobs", status_code=202)
+async def create_render_jobs(input: RenderJobsCreate):
+    """Queue (re)renders, by default in the bulk lane that interactive downloads always overtake"""
+    if input.lane not in LANES:
+        raise HTTPException(status_code=422, detail=f"lane must be one of {', '.join(LANES)}")
+    jobs = []
+    for run_id in input.run_ids:
+        report = await run_in_threadpool(load_run_report, run_id)
+        engine, _ = resolve_pdf_engine(report)
+        jobs.append(await render_queue.enqueue(run_id, cache_key(report, engine=engine_version(engine)), lane=input.lane))
+    return {"jobs": jobs}
+
+@api_router.get("/render-jobs/{job_id}")
+async def get_render_job(job_id: str):
+    job = await render_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Render job not found")
+    return job
+
+@api_router.get("/metrics/pdf-cache")
+async def get_pdf_cache_metrics():
+    stats = get_pdf_cache().stats()
+    part_cache = get_part_cache()
+    if part_cache is not None:
+        stats["parts"] = part_cache.stats()
+    return stats
+
+@api_router.get("/metrics/render-queue")
+async def get_render_queue_metrics():
+    return await render_queue.metrics()
+
+@api_router.get("/metrics/status-writes")
+async def get_status_write_metrics():
+    return dict(status_writes.metrics(), enabled=STATUS_WRITE_BATCHING)
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -84,6 +545,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_status_indexes():
+    # Backs the keyset pagination of GET /api/status
+    await db.status_checks.create_index(STATUS_SORT)
+
+@app.on_event("startup")
+async def start_status_writes():
+    if STATUS_WRITE_BATCHING:
+        status_writes.start()
+
+@app.on_event("startup")
+async def start_render_workers():
+    await render_queue.ensure_indexes()
+    render_workers.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await render_workers.stop()
+    stream_renders.shutdown()
+    await status_writes.stop()
     client.close()
\ No newline at end of file
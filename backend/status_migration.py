@@ -0,0 +1,98 @@
+"""
+Online migration of status_checks.timestamp from ISO strings to BSON dates.
+
+POST /api/status used to store timestamps as ISO-8601 strings; it now stores
+native dates, and the read path accepts both while old documents remain.
+This converts the old documents in small batches while the API keeps
+serving: each update is conditional on the document still holding the
+string it was read with, so a concurrent write is never overwritten, and
+documents are walked in _id order with an optional pause between batches.
+
+The state of the migration is the data itself (documents whose timestamp is
+still a string), so an interrupted run is resumed by running it again.
+
+    cd backend
+    python status_migration.py --dry-run
+    python status_migration.py --batch-size 1000 --pause 0.1
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+from pymongo import ASCENDING, MongoClient, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+LEGACY_TIMESTAMP = {"timestamp": {"$type": "string"}}
+
+
+def parse_timestamp(value):
+    """ISO-8601 string as stored by the old POST /api/status; naive values are UTC"""
+    parsed = datetime.fromisoformat(value)
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed
+
+
+def migrate(collection, batch_size=BATCH_SIZE, pause=0.0, dry_run=False):
+    """Convert string timestamps in collection to dates; returns (converted, skipped)"""
+    converted = skipped = 0
+    last_id = None
+    while True:
+        query = dict(LEGACY_TIMESTAMP)
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = list(collection.find(query, {"timestamp": 1}).sort("_id", ASCENDING).limit(batch_size))
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+
+        updates = []
+        for doc in batch:
+            try:
+                timestamp = parse_timestamp(doc["timestamp"])
+            except ValueError:
+                logger.warning("Skipping status check %s: unparseable timestamp %r", doc["_id"], doc["timestamp"])
+                skipped += 1
+                continue
+            updates.append(UpdateOne(
+                {"_id": doc["_id"], "timestamp": doc["timestamp"]},
+                {"$set": {"timestamp": timestamp}},
+            ))
+        if updates and not dry_run:
+            converted += collection.bulk_write(updates, ordered=False).modified_count
+        else:
+            converted += len(updates)
+        logger.info("%s %d status checks", "Would convert" if dry_run else "Converted", converted)
+        if pause:
+            time.sleep(pause)
+    return converted, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert status_checks timestamps from ISO strings to BSON dates")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help=f"Documents per batch (default: {BATCH_SIZE})")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    parser.add_argument("--dry-run", action="store_true", help="Count convertible documents without writing")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    load_dotenv(Path(__file__).parent / '.env')
+    client = MongoClient(os.environ['MONGO_URL'])
+    try:
+        collection = client[os.environ['DB_NAME']].status_checks
+        converted, skipped = migrate(collection, args.batch_size, args.pause, args.dry_run)
+        remaining = collection.count_documents(LEGACY_TIMESTAMP)
+    finally:
+        client.close()
+    print(f"{converted} converted, {skipped} skipped, {remaining} string timestamps left")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
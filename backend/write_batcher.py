@@ -0,0 +1,178 @@
+"""
+Write-behind batching of single-document inserts.
+
+Many concurrent POST /api/status requests each used to pay for their own
+insert_one round trip. InsertBatcher queues their documents instead and
+writes them with one unordered insert_many once STATUS_WRITE_FLUSH_MS have
+passed since the first queued document, or as soon as STATUS_WRITE_MAX_BATCH
+are waiting. Each caller still awaits the acknowledgement of its own
+document and gets its own write error, so the API doesn't change.
+
+    batcher = InsertBatcher(db.status_checks, flush_seconds=0.005, max_batch=500)
+    batcher.start()
+    await batcher.insert(doc)
+    await batcher.stop()
+
+Under a steady trickle every insert waits up to one flush interval longer;
+under a burst the batches grow and the round trips per document drop.
+stop() lets the batch in flight finish and writes what is still queued;
+no caller is left waiting on a document that wasn't written.
+"""
+
+import asyncio
+import logging
+import time
+
+from pymongo.errors import BulkWriteError, WriteError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_SECONDS = 0.005
+DEFAULT_MAX_BATCH = 500
+
+
+class StoppedError(RuntimeError):
+    """The batcher stopped before a queued document could be written"""
+
+
+def size_buckets(max_batch):
+    """Upper bounds of the batch size histogram: powers of two up to max_batch"""
+    buckets = []
+    bound = 1
+    while bound < max_batch:
+        buckets.append(bound)
+        bound *= 2
+    buckets.append(max_batch)
+    return buckets
+
+
+class InsertBatcher:
+    """Coalesces insert(doc) calls into insert_many batches written by one background task"""
+
+    def __init__(self, collection, flush_seconds=DEFAULT_FLUSH_SECONDS, max_batch=DEFAULT_MAX_BATCH):
+        self.collection = collection
+        self.flush_seconds = flush_seconds
+        self.max_batch = max(1, max_batch)
+        self._pending = []  # (document, future)
+        self._queued = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task = None
+        self._stopping = False
+        self._buckets = size_buckets(self.max_batch)
+        self._histogram = [0] * len(self._buckets)
+        self._flushes = 0
+        self._documents = 0
+        self._errors = 0
+        self._flush_seconds_total = 0.0
+
+    def start(self):
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Let the batch being written finish, write what is still queued, then end the background task
+
+        New inserts are written through from here on. Any caller whose document
+        still couldn't be written gets StoppedError instead of waiting forever.
+        """
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._stopping = True
+        # Wake _run wherever it waits, and skip the flush interval from now on
+        self._queued.set()
+        self._full.set()
+        try:
+            await asyncio.gather(task, return_exceptions=True)
+            # Left over if _run died
+            while self._pending:
+                await self._flush(self._take())
+        finally:
+            batch, self._pending = self._pending, []
+            self._resolve(batch, StoppedError('InsertBatcher stopped before the document was written'))
+
+    async def insert(self, doc):
+        """Insert doc with the next batch; returns once that batch is acknowledged"""
+        if self._task is None:
+            # Not started (or stopped): write through
+            await self.collection.insert_one(doc)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((doc, future))
+        self._queued.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        await future
+
+    def metrics(self):
+        histogram = {str(bound): count for bound, count in zip(self._buckets, self._histogram)}
+        return {
+            'flush_ms': self.flush_seconds * 1000,
+            'max_batch': self.max_batch,
+            'queued': len(self._pending),
+            'flushes': self._flushes,
+            'documents': self._documents,
+            'errors': self._errors,
+            'mean_batch_size': round(self._documents / self._flushes, 2) if self._flushes else 0,
+            'flush_seconds_total': round(self._flush_seconds_total, 6),
+            # Flushes by batch size, keyed by the upper bound of each bucket
+            'batch_sizes': histogram,
+        }
+
+    def _take(self):
+        batch = self._pending[:self.max_batch]
+        del self._pending[:self.max_batch]
+        if not self._pending:
+            self._queued.clear()
+        if len(self._pending) < self.max_batch:
+            self._full.clear()
+        return batch
+
+    async def _run(self):
+        while True:
+            await self._queued.wait()
+            if not self._full.is_set() and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            if self._pending:
+                await self._flush(self._take())
+            if self._stopping and not self._pending:
+                return
+
+    async def _flush(self, batch):
+        started = time.perf_counter()
+        errors = {}
+        try:
+            await self.collection.insert_many([doc for doc, _ in batch], ordered=False)
+        except BulkWriteError as exc:
+            errors = {error['index']: WriteError(error['errmsg'], error['code'], error) for error in exc.details['writeErrors']}
+        except asyncio.CancelledError:
+            # Whether it was written is unknown; the callers mustn't wait for an answer that won't come
+            self._resolve(batch, StoppedError('InsertBatcher was cancelled while writing the document'))
+            raise
+        except Exception as exc:
+            logger.exception('Writing a batch of %d documents failed', len(batch))
+            errors = dict.fromkeys(range(len(batch)), exc)
+
+        self._flushes += 1
+        self._documents += len(batch)
+        self._errors += len(errors)
+        self._flush_seconds_total += time.perf_counter() - started
+        self._histogram[next(i for i, bound in enumerate(self._buckets) if len(batch) <= bound)] += 1
+
+        for index, (_, future) in enumerate(batch):
+            # A caller that went away (request cancelled) no longer waits on its future
+            if future.done():
+                continue
+            if index in errors:
+                future.set_exception(errors[index])
+            else:
+                future.set_result(None)
+
+    @staticmethod
+    def _resolve(batch, exc):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
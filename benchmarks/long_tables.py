@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Scaling curve of the check appendix: plain platypus Table vs BatchedTable.
+
+Renders only the appendix section of synthetic reports of growing size, once
+with reporting.tables batching disabled (a single Table that splits itself page
+by page) and once as shipped, and prints wall time per 1,000 rows. Flat
+per-row cost means linear scaling.
+
+    python benchmarks/long_tables.py
+    python benchmarks/long_tables.py --sizes 250,500,1000,2000,4000 --modes batched
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'backend'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from reporting import normalize_report, tables  # noqa: E402
+from reporting.parallel import render_part  # noqa: E402
+from synthetic import synthetic_report  # noqa: E402
+
+DEFAULT_SIZES = (250, 500, 1000, 2000)
+MODES = ('table', 'batched')
+
+
+def appendix_job(checks):
+    view = normalize_report(synthetic_report(checks))
+    section = next(s for s in view['sections'] if s['id'] == 'checks_appendix')
+    return section, view['meta']
+
+
+def measure(mode, checks):
+    job = appendix_job(checks)
+    default = tables.BATCHED_TABLE_MIN_ROWS
+    tables.BATCHED_TABLE_MIN_ROWS = float('inf') if mode == 'table' else default
+    try:
+        start = time.perf_counter()
+        data, pages = render_part(job)
+        wall = time.perf_counter() - start
+    finally:
+        tables.BATCHED_TABLE_MIN_ROWS = default
+    return {'mode': mode, 'rows': checks, 'pages': pages, 'wall_s': round(wall, 3),
+            'ms_per_row': round(wall * 1000 / checks, 2), 'bytes': len(data)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Appendix table scaling benchmark')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='Comma-separated row counts')
+    parser.add_argument('--modes', default=','.join(MODES), help=f'Comma-separated subset of {", ".join(MODES)}')
+    args = parser.parse_args(argv)
+
+    print(f'{"mode":<8} {"rows":>6} {"pages":>6} {"wall":>9} {"ms/row":>8}')
+    for mode in args.modes.split(','):
+        for checks in map(int, args.sizes.split(',')):
+            row = measure(mode, checks)
+            print(f'{row["mode"]:<8} {row["rows"]:>6} {row["pages"]:>6} {row["wall_s"]:>8.3f}s {row["ms_per_row"]:>8.2f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
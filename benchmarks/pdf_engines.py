@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Cross-engine PDF benchmark.
+
+Runs every PDF generator against reports of 10/100/1,000/5,000 checks, each
+run in a fresh interpreter so peak RSS belongs to that run alone, and writes
+a JSON result file for comparing commits:
+
+    python benchmarks/pdf_engines.py
+    python benchmarks/pdf_engines.py --sizes 10,100 --engines reporting,reportlab-v2 --repeat 3
+    python benchmarks/pdf_engines.py compare old.json new.json
+
+Engines:
+  weasyprint       frontend/scripts/generate-pdf.py (HTML_CONTENT)
+  reportlab        frontend/scripts/generate-pdf-reportlab.py
+  reportlab-v2     frontend/scripts/generate-pdf-v2.py
+  reportlab-final  frontend/scripts/generate-pdf-final.py
+  reporting        backend/reporting (data-driven, renders the synthetic report.json)
+
+The four scripts hardcode one sample report of 20 checks, so they are scaled
+by repeating the whole sample once per 20 checks. Timings cover the render
+call only; imports and input preparation are excluded.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import math
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = ROOT / 'frontend' / 'scripts'
+BACKEND_DIR = ROOT / 'backend'
+RESULTS_DIR = ROOT / 'benchmarks' / 'results'
+
+DEFAULT_SIZES = (10, 100, 1000, 5000)
+SAMPLE_CHECKS = 20  # 2 critical + 4 warnings + 14 passed in the hardcoded sample
+
+
+def load_script(filename):
+    """Import one of the hyphen-named generator scripts as a module"""
+    path = SCRIPTS_DIR / filename
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def sample_copies(checks):
+    return max(1, math.ceil(checks / SAMPLE_CHECKS))
+
+
+def prepare_weasyprint(checks, output):
+    module = load_script('generate-pdf.py')
+    return lambda: module.generate_pdf(output, copies=sample_copies(checks))
+
+
+def prepare_reportlab(checks, output):
+    module = load_script('generate-pdf-reportlab.py')
+    return lambda: module.generate_pdf(output, copies=sample_copies(checks))
+
+
+def prepare_reportlab_v2(checks, output):
+    module = load_script('generate-pdf-v2.py')
+    return lambda: module.generate_pdf(output, copies=sample_copies(checks))
+
+
+def prepare_reportlab_final(checks, output):
+    module = load_script('generate-pdf-final.py')
+    return lambda: module.generate(output, copies=sample_copies(checks))
+
+
+def prepare_reporting(checks, output):
+    sys.path.insert(0, str(BACKEND_DIR))
+    sys.path.insert(0, str(ROOT / 'benchmarks'))
+    from reporting import render_pdf
+    from synthetic import synthetic_report
+
+    report = synthetic_report(checks)
+    return lambda: render_pdf(report, output)
+
+
+ENGINES = {
+    'weasyprint': prepare_weasyprint,
+    'reportlab': prepare_reportlab,
+    'reportlab-v2': prepare_reportlab_v2,
+    'reportlab-final': prepare_reportlab_final,
+    'reporting': prepare_reporting,
+}
+
+
+def count_pages(path):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        with open(path, 'rb') as fh:
+            return len(re.findall(rb'/Type\s*/Page(?![a-zA-Z])', fh.read()))
+    return len(PdfReader(path).pages)
+
+
+def peak_rss_bytes():
+    # VmHWM starts fresh at exec; ru_maxrss on Linux carries the parent's peak across fork+exec
+    try:
+        with open('/proc/self/status') as fh:
+            for line in fh:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_child(engine, checks, output):
+    """Body of one measured run; executed inside a fresh interpreter"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        render = ENGINES[engine](checks, output)
+        rss_before = peak_rss_bytes()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        render()
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    return {
+        'wall_s': round(wall, 4),
+        'cpu_s': round(cpu, 4),
+        'peak_rss_mb': round(peak_rss_bytes() / 2**20, 1),
+        'rss_before_render_mb': round(rss_before / 2**20, 1),
+        'output_bytes': os.path.getsize(output),
+        'pages': count_pages(output),
+    }
+
+
+def measure(engine, checks, timeout):
+    """Run one engine/size in a subprocess and return its result row"""
+    row = {'engine': engine, 'checks': checks}
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'report.pdf')
+        cmd = [sys.executable, __file__, '--child', engine, str(checks), output]
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return dict(row, status='timeout', timeout_s=timeout)
+    if proc.returncode != 0:
+        lines = (proc.stderr or proc.stdout).strip().splitlines()
+        return dict(row, status='error', error=lines[-1] if lines else f'exit code {proc.returncode}')
+    return dict(row, status='ok', **json.loads(proc.stdout.strip().splitlines()[-1]))
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain'], cwd=ROOT, capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def environment():
+    commit, dirty = git_revision()
+    versions = {}
+    for name in ('reportlab', 'weasyprint', 'pypdf'):
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'git_commit': commit,
+        'git_dirty': dirty,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'versions': versions,
+    }
+
+
+def print_row(row):
+    if row['status'] != 'ok':
+        print(f'{row["engine"]:<16} {row["checks"]:>6}  {row["status"].upper()}: {row.get("error", "")}')
+        return
+    print(f'{row["engine"]:<16} {row["checks"]:>6}  wall {row["wall_s"]:>8.3f}s  cpu {row["cpu_s"]:>8.3f}s  '
+          f'rss {row["peak_rss_mb"]:>7.1f}MB  {row["output_bytes"] / 1024:>9.1f}KB  {row["pages"]:>5} pages')
+
+
+def compare(old_path, new_path):
+    """Print wall time and size deltas between two result files"""
+    def index(path):
+        with open(path) as fh:
+            data = json.load(fh)
+        rows = {}
+        for row in data['results']:
+            if row['status'] == 'ok':
+                rows.setdefault((row['engine'], row['checks']), []).append(row)
+        return data['meta'], {k: min(v, key=lambda r: r['wall_s']) for k, v in rows.items()}
+
+    old_meta, old = index(old_path)
+    new_meta, new = index(new_path)
+    print(f'old: {old_meta.get("git_commit")}  new: {new_meta.get("git_commit")}')
+    for key in sorted(set(old) & set(new)):
+        a, b = old[key], new[key]
+        print(f'{key[0]:<16} {key[1]:>6}  wall {a["wall_s"]:>8.3f}s -> {b["wall_s"]:>8.3f}s ({b["wall_s"] / a["wall_s"]:>5.2f}x)  '
+              f'size {a["output_bytes"]:>9} -> {b["output_bytes"]:>9}  rss {a["peak_rss_mb"]:.1f} -> {b["peak_rss_mb"]:.1f}MB')
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['--child']:
+        _, engine, checks, output = argv
+        print(json.dumps(run_child(engine, int(checks), output)))
+        return 0
+    if argv[:1] == ['compare']:
+        compare(*argv[1:3])
+        return 0
+
+    parser = argparse.ArgumentParser(description='Benchmark the PDF generators against synthetic reports')
+    parser.add_argument('--engines', default=','.join(ENGINES), help='Comma-separated engine names')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='Comma-separated check counts')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per engine and size')
+    parser.add_argument('--timeout', type=float, default=900, help='Seconds before a run is recorded as a timeout')
+    parser.add_argument('--output', '-o', help='Result file (default: benchmarks/results/pdf-engines-<commit>.json)')
+    args = parser.parse_args(argv)
+
+    engines = [e for e in args.engines.split(',') if e]
+    unknown = set(engines) - set(ENGINES)
+    if unknown:
+        parser.error(f'unknown engine(s): {", ".join(sorted(unknown))}')
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+
+    meta = environment()
+    results = []
+    for checks in sizes:
+        for engine in engines:
+            for run in range(args.repeat):
+                row = dict(measure(engine, checks, args.timeout), run=run)
+                print_row(row)
+                results.append(row)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f'pdf-engines-{(meta["git_commit"] or "nogit")[:12]}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as fh:
+        json.dump({'meta': meta, 'results': results}, fh, indent=2)
+    print(f'Results written to {output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Synthetic v2 report.json documents of any size, derived from
+frontend/public/sample-report.json so field shapes match real runs.
+"""
+
+import copy
+import json
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_REPORT = ROOT / 'frontend' / 'public' / 'sample-report.json'
+
+
+def load_sample():
+    with open(SAMPLE_REPORT, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def synthetic_report(checks, run_id=None, sample=None):
+    """A report with `checks` checks; every non-passing check also becomes a finding"""
+    sample = sample or load_sample()
+    report = copy.deepcopy(sample)
+    base_checks = sample['checks']
+    findings_by_ref = {f['reference']: f for f in sample['findings']}
+
+    report['run_id'] = run_id or f'SYNTH-{checks:05d}'
+    report['checks'] = []
+    report['findings'] = []
+    for i in range(checks):
+        template = base_checks[i % len(base_checks)]
+        check = dict(template, id=f'{template["id"]}_{i:05d}', reference=f'{template["id"]}_{i:05d}')
+        report['checks'].append(check)
+        if check['status'] != 'pass':
+            finding = copy.deepcopy(findings_by_ref.get(template['id']) or {
+                'title': template['title'],
+                'status': template['status'],
+                'source': 'Label',
+                'fix': template['fix'],
+                'detail': template['detail'],
+                'evidence': [{'source': 'Label', 'page': 1, 'excerpt': e.get('snippet', '')} for e in template['evidence']],
+            })
+            finding['id'] = finding['reference'] = check['id']
+            report['findings'].append(finding)
+
+    passed = sum(1 for c in report['checks'] if c['status'] == 'pass')
+    report['summary'] = dict(
+        sample['summary'],
+        passed=passed,
+        warnings=len(report['findings']),
+        issues_total=len(report['findings']),
+    )
+    return report
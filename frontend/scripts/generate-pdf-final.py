@@ -344,9 +344,9 @@ def page7(s):
     
     return e
 
-def generate():
-    output = '/app/frontend/public/sample-report.pdf'
-    
+def generate(output='/app/frontend/public/sample-report.pdf', copies=1):
+    """Generate the PDF; copies repeats the whole report (used by benchmarks/pdf_engines.py)"""
+
     doc = SimpleDocTemplate(
         output,
         pagesize=A4,
@@ -359,13 +359,16 @@ def generate():
     styles = create_styles()
     
     elements = []
-    elements.extend(page1(styles))
-    elements.extend(page2(styles))
-    elements.extend(page3(styles))
-    elements.extend(page4(styles))
-    elements.extend(page5(styles))
-    elements.extend(page6(styles))
-    elements.extend(page7(styles))
+    for copy in range(copies):
+        if copy:
+            elements.append(PageBreak())
+        elements.extend(page1(styles))
+        elements.extend(page2(styles))
+        elements.extend(page3(styles))
+        elements.extend(page4(styles))
+        elements.extend(page5(styles))
+        elements.extend(page6(styles))
+        elements.extend(page7(styles))
     
     doc.build(elements, onFirstPage=header_footer, onLaterPages=header_footer)
     
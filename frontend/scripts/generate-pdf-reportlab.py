@@ -684,10 +684,12 @@ def build_page7_next_steps(styles):
     
     return elements
 
-def generate_pdf():
-    """Generate the complete PDF report"""
-    output_path = '/app/frontend/public/sample-report.pdf'
-    
+def generate_pdf(output_path='/app/frontend/public/sample-report.pdf', copies=1):
+    """Generate the complete PDF report.
+
+    copies repeats the whole report to scale content (used by benchmarks/pdf_engines.py).
+    """
+
     # Create document
     doc = SimpleDocTemplate(
         output_path,
@@ -703,13 +705,16 @@ def generate_pdf():
     
     # Build all pages
     elements = []
-    elements.extend(build_page1_executive_summary(styles))
-    elements.extend(build_page2_findings_overview(styles))
-    elements.extend(build_page3_evidence_details(styles))
-    elements.extend(build_page4_crosscheck(styles))
-    elements.extend(build_page5_print_pack(styles))
-    elements.extend(build_page6_halal(styles))
-    elements.extend(build_page7_next_steps(styles))
+    for copy in range(copies):
+        if copy:
+            elements.append(PageBreak())
+        elements.extend(build_page1_executive_summary(styles))
+        elements.extend(build_page2_findings_overview(styles))
+        elements.extend(build_page3_evidence_details(styles))
+        elements.extend(build_page4_crosscheck(styles))
+        elements.extend(build_page5_print_pack(styles))
+        elements.extend(build_page6_halal(styles))
+        elements.extend(build_page7_next_steps(styles))
     
     # Build PDF
     print("Generating PDF...")
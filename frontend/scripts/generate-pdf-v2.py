@@ -17,6 +17,7 @@ from reportlab.platypus import (
     PageBreak, KeepTogether
 )
 from reportlab.pdfgen import canvas
+import argparse
 import os
 from datetime import datetime
 
@@ -38,8 +39,40 @@ MARGIN_BOTTOM = 32
 MARGIN_LEFT = 36
 MARGIN_RIGHT = 36
 
+PAGE_COUNT_FORM = 'PageCount'
+FOOTER_TEXT = "Nexodify AVA • EU Label Compliance Preflight • Confidential • Sample Report • Page {page}/"
+
+
+def draw_page_background(c):
+    """Draw off-white background"""
+    c.setFillColor(PAGE_BG)
+    c.rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT, fill=1, stroke=0)
+
+
+def draw_header(c):
+    """Draw the header and its divider line"""
+    c.setFillColor(DARK_TEXT)
+    c.setFont('Helvetica-Bold', 10)
+    c.drawString(MARGIN_LEFT, PAGE_HEIGHT - 24, "Nexodify AVA")
+
+    c.setFillColor(MUTED_TEXT)
+    c.setFont('Helvetica', 9)
+    c.drawCentredString(PAGE_WIDTH / 2, PAGE_HEIGHT - 24, "EU Label Compliance Preflight Report")
+
+    c.drawRightString(PAGE_WIDTH - MARGIN_RIGHT, PAGE_HEIGHT - 24, "Run ID: SAMPLE-AVA-0001")
+
+    # Header divider line
+    c.setStrokeColor(PRIMARY_BLUE)
+    c.setLineWidth(2)
+    c.line(MARGIN_LEFT, PAGE_HEIGHT - 32, PAGE_WIDTH - MARGIN_RIGHT, PAGE_HEIGHT - 32)
+
+
 class NumberedCanvas(canvas.Canvas):
-    """Canvas that adds page background and header/footer on each page"""
+    """Canvas that adds page background and header/footer on each page.
+
+    Keeps a snapshot of every page until save() so the total is known;
+    memory grows with page count. Prefer PageCountCanvas for long documents.
+    """
     def __init__(self, *args, **kwargs):
         canvas.Canvas.__init__(self, *args, **kwargs)
         self._saved_page_states = []
@@ -61,35 +94,58 @@ class NumberedCanvas(canvas.Canvas):
 
     def draw_page_background(self):
         """Draw off-white background"""
-        self.setFillColor(PAGE_BG)
-        self.rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT, fill=1, stroke=0)
+        draw_page_background(self)
 
     def draw_header_footer(self, num_pages):
         """Draw header and footer on each page"""
         page_num = self._pageNumber
-        
-        # Header
-        self.setFillColor(DARK_TEXT)
-        self.setFont('Helvetica-Bold', 10)
-        self.drawString(MARGIN_LEFT, PAGE_HEIGHT - 24, "Nexodify AVA")
-        
-        self.setFillColor(MUTED_TEXT)
-        self.setFont('Helvetica', 9)
-        self.drawCentredString(PAGE_WIDTH / 2, PAGE_HEIGHT - 24, "EU Label Compliance Preflight Report")
-        
-        self.drawRightString(PAGE_WIDTH - MARGIN_RIGHT, PAGE_HEIGHT - 24, "Run ID: SAMPLE-AVA-0001")
-        
-        # Header divider line
-        self.setStrokeColor(PRIMARY_BLUE)
-        self.setLineWidth(2)
-        self.line(MARGIN_LEFT, PAGE_HEIGHT - 32, PAGE_WIDTH - MARGIN_RIGHT, PAGE_HEIGHT - 32)
-        
+
+        draw_header(self)
+
         # Footer
         self.setFillColor(MUTED_TEXT)
         self.setFont('Helvetica', 8)
-        footer_text = f"Nexodify AVA • EU Label Compliance Preflight • Confidential • Sample Report • Page {page_num}/{num_pages}"
+        footer_text = FOOTER_TEXT.format(page=page_num) + str(num_pages)
         self.drawCentredString(PAGE_WIDTH / 2, 18, footer_text)
 
+
+class PageCountCanvas(canvas.Canvas):
+    """Canvas that writes "Page X/Y" footers in constant memory.
+
+    Each footer draws "Page X/" and references a form XObject for Y. The form
+    is a forward reference, defined once in save() when the page count is
+    known, so pages are finished and released as soon as they are laid out.
+    Background and header are drawn by draw_page_frame() at page start.
+    """
+    def save(self):
+        # showPage() has already advanced past the last page
+        num_pages = self._pageNumber - 1
+        self.beginForm(PAGE_COUNT_FORM)
+        self.setFillColor(MUTED_TEXT)
+        self.setFont('Helvetica', 8)
+        self.drawString(0, 0, str(num_pages))
+        self.endForm()
+        canvas.Canvas.save(self)
+
+
+def draw_page_frame(c, doc):
+    """onPage callback for PageCountCanvas: background, header and numbered footer"""
+    c.saveState()
+    draw_page_background(c)
+    draw_header(c)
+
+    c.setFillColor(MUTED_TEXT)
+    c.setFont('Helvetica', 8)
+    prefix = FOOTER_TEXT.format(page=doc.page)
+    prefix_width = c.stringWidth(prefix, 'Helvetica', 8)
+    # The total is not known yet; reserve as many digits as the current page number has
+    total_width = c.stringWidth('0' * len(str(doc.page)), 'Helvetica', 8)
+    x = (PAGE_WIDTH - prefix_width - total_width) / 2
+    c.drawString(x, 18, prefix)
+    c.translate(x + prefix_width, 18)
+    c.doForm(PAGE_COUNT_FORM)
+    c.restoreState()
+
 def create_styles():
     """Create custom paragraph styles"""
     styles = getSampleStyleSheet()
@@ -527,10 +583,13 @@ def build_page7(styles):
     
     return elements
 
-def generate_pdf():
-    """Generate the complete PDF"""
-    output_path = '/app/frontend/public/sample-report.pdf'
-    
+def generate_pdf(output_path='/app/frontend/public/sample-report.pdf', numbering='forward', copies=1):
+    """Generate the complete PDF.
+
+    numbering='forward' uses PageCountCanvas (flat memory); 'replay' uses the
+    original NumberedCanvas, which snapshots every page until save().
+    copies repeats the whole report (used by benchmarks/pdf_engines.py).
+    """
     doc = SimpleDocTemplate(
         output_path,
         pagesize=A4,
@@ -543,20 +602,32 @@ def generate_pdf():
     styles = create_styles()
     
     elements = []
-    elements.extend(build_page1(styles))
-    elements.extend(build_page2(styles))
-    elements.extend(build_page3(styles))
-    elements.extend(build_page4(styles))
-    elements.extend(build_page5(styles))
-    elements.extend(build_page6(styles))
-    elements.extend(build_page7(styles))
+    for copy in range(copies):
+        if copy:
+            elements.append(PageBreak())
+        elements.extend(build_page1(styles))
+        elements.extend(build_page2(styles))
+        elements.extend(build_page3(styles))
+        elements.extend(build_page4(styles))
+        elements.extend(build_page5(styles))
+        elements.extend(build_page6(styles))
+        elements.extend(build_page7(styles))
     
     print("Generating PDF with improved styling...")
-    doc.build(elements, canvasmaker=NumberedCanvas)
+    if numbering == 'replay':
+        doc.build(elements, canvasmaker=NumberedCanvas)
+    else:
+        doc.build(elements, onFirstPage=draw_page_frame, onLaterPages=draw_page_frame,
+                  canvasmaker=PageCountCanvas)
     
     file_size = os.path.getsize(output_path)
     print(f"✅ PDF generated: {output_path}")
     print(f"   File size: {file_size / 1024:.1f} KB")
 
 if __name__ == '__main__':
-    generate_pdf()
+    parser = argparse.ArgumentParser(description='Generate the sample compliance report PDF')
+    parser.add_argument('--output', default='/app/frontend/public/sample-report.pdf')
+    parser.add_argument('--numbering', choices=['forward', 'replay'], default='forward',
+                        help='forward: constant-memory page totals (default); replay: legacy per-page snapshots')
+    args = parser.parse_args()
+    generate_pdf(args.output, args.numbering)
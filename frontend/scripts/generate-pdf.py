@@ -1086,17 +1086,22 @@ body {
 </html>
 """
 
-def generate_pdf():
-    # Output path
-    output_dir = '/app/frontend/public'
-    output_path = os.path.join(output_dir, 'sample-report.pdf')
-    
+def scaled_html(copies):
+    """HTML_CONTENT with the report body repeated (used by benchmarks/pdf_engines.py)"""
+    if copies == 1:
+        return HTML_CONTENT
+    head, rest = HTML_CONTENT.split('<body>', 1)
+    body, tail = rest.rsplit('</body>', 1)
+    return head + '<body>' + body * copies + '</body>' + tail
+
+def generate_pdf(output_path='/app/frontend/public/sample-report.pdf', copies=1):
     # Ensure output directory exists
+    output_dir = os.path.dirname(output_path)
     os.makedirs(output_dir, exist_ok=True)
     
     # Generate PDF
     print("Generating PDF...")
-    html = HTML(string=HTML_CONTENT)
+    html = HTML(string=scaled_html(copies))
     html.write_pdf(output_path)
     
     print(f"✅ PDF generated successfully: {output_path}")
@@ -0,0 +1,70 @@
+import React, { useEffect, useRef, useState } from 'react';
+import { runAPI } from '../lib/api';
+
+// Polls of a thumbnail whose report is still rendering, before giving up until the next mount
+const MAX_ATTEMPTS = 20;
+
+// First-page thumbnail of a run's report. /api needs the bearer token, which
+// a plain <img src> can't send, so the PNG is fetched through the API client
+// once the row scrolls into view and shown from an object URL. While the
+// report is still rendering (202), it asks again after Retry-After.
+export function RunThumbnail({ runId, className }) {
+  const ref = useRef(null);
+  const [visible, setVisible] = useState(false);
+  const [src, setSrc] = useState(null);
+
+  useEffect(() => {
+    const node = ref.current;
+    if (!node || typeof IntersectionObserver === 'undefined') {
+      setVisible(true);
+      return undefined;
+    }
+    const observer = new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        setVisible(true);
+        observer.disconnect();
+      }
+    }, { rootMargin: '200px' });
+    observer.observe(node);
+    return () => observer.disconnect();
+  }, []);
+
+  useEffect(() => {
+    if (!visible || !runId) return undefined;
+    let cancelled = false;
+    let objectUrl = null;
+    let retryTimer = null;
+    const load = (attempt) => {
+      runAPI.getThumbnail(runId)
+        .then(({ blob, retryAfter }) => {
+          if (cancelled) return;
+          if (blob) {
+            objectUrl = URL.createObjectURL(blob);
+            setSrc(objectUrl);
+          } else if (attempt < MAX_ATTEMPTS) {
+            retryTimer = setTimeout(() => load(attempt + 1), retryAfter * 1000);
+          }
+        })
+        .catch(() => {});
+    };
+    load(1);
+    return () => {
+      cancelled = true;
+      clearTimeout(retryTimer);
+      if (objectUrl) URL.revokeObjectURL(objectUrl);
+      setSrc(null);
+    };
+  }, [visible, runId]);
+
+  return (
+    <img
+      ref={ref}
+      src={src || undefined}
+      alt=""
+      className={className}
+      style={src ? undefined : { visibility: 'hidden' }}
+    />
+  );
+}
+
+export default RunThumbnail;
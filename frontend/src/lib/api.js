@@ -139,6 +139,18 @@ export const runAPI = {
     return `${API_BASE_URL}/api/runs/${runId}/report.pdf`;
   },
   
+  // GET /api/runs/:run_id/thumbnail.png (first page of the report, 240px wide)
+  // Fetched with auth like every /api call. While the report is still rendering (202),
+  // blob is null and retryAfter is the number of seconds to wait before asking again
+  getThumbnail: async (runId) => {
+    const response = await api.get(`/api/runs/${runId}/thumbnail.png`, { responseType: 'blob' });
+    if (response.status === 200) {
+      return { blob: response.data, retryAfter: null };
+    }
+    const retryAfter = Number(response.headers['retry-after']);
+    return { blob: null, retryAfter: retryAfter > 0 ? retryAfter : 5 };
+  },
+
   // Download PDF as blob
   downloadPdf: async (runId, pdfPath = null) => {
     const url = pdfPath ? `/api/runs/${runId}${pdfPath}` : `/api/runs/${runId}/report.pdf`;
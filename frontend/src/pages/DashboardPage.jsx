@@ -33,6 +33,7 @@ import {
   Loader2,
 } from 'lucide-react';
 import { runAPI, API_BASE_URL } from '../lib/api';
+import { RunThumbnail } from '../components/RunThumbnail';
 import { formatVerdictLabel, normalizeVerdict } from '../utils/verdict';
 
 // Verdict Badge component
@@ -699,9 +700,15 @@ export default function DashboardPage() {
                   <div className="divide-y divide-white/[0.04]">
                     {runs.slice(0, 5).map((run) => (
                       <div key={run.run_id} className="grid grid-cols-12 gap-4 px-6 py-3 hover:bg-white/[0.02] transition-colors items-center">
-                        <div className="col-span-3">
-                          <div className="text-sm text-white/90 truncate">{run.product_name}</div>
-                          <div className="text-xs text-white/40 font-mono">{run.run_id}</div>
+                        <div className="col-span-3 flex items-center gap-3 min-w-0">
+                          <RunThumbnail
+                            runId={run.run_id}
+                            className="h-12 w-9 shrink-0 rounded-sm bg-white object-cover object-top opacity-90"
+                          />
+                          <div className="min-w-0">
+                            <div className="text-sm text-white/90 truncate">{run.product_name}</div>
+                            <div className="text-xs text-white/40 font-mono">{run.run_id}</div>
+                          </div>
                         </div>
                         <div className="col-span-2 text-sm text-white/50">
                           {formatRunDate(run)}
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { Link, useSearchParams } from 'react-router-dom';
 import { runAPI, API_BASE_URL } from '../../lib/api';
+import { RunThumbnail } from '../../components/RunThumbnail';
 import { DashboardLayout } from '../../components/layout/DashboardLayout';
 import { Button } from '../../components/ui/button';
 import { Input } from '../../components/ui/input';
@@ -236,7 +237,13 @@ export default function RunHistoryPage() {
                           data-testid={`run-row-${run.run_id}`}
                         >
                           <TableCell className="font-medium">
-                            {truncate(run.product_name || 'Untitled', 30)}
+                            <div className="flex items-center gap-3">
+                              <RunThumbnail
+                                runId={run.run_id}
+                                className="h-14 w-10 shrink-0 rounded border border-slate-200 bg-white object-cover object-top"
+                              />
+                              {truncate(run.product_name || 'Untitled', 30)}
+                            </div>
                           </TableCell>
                           <TableCell className="text-slate-600">
                             {truncate(run.company_name || 'Unknown', 25)}
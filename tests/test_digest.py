@@ -0,0 +1,73 @@
+"""
+The portfolio digest skips unreadable reports, and GET /api/digest.pdf stays bounded.
+"""
+
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'backend'))
+sys.path.insert(0, str(ROOT))
+# server connects lazily; importing it needs no running MongoDB
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'test_digest')
+
+import server  # noqa: E402
+from benchmarks.synthetic import synthetic_report  # noqa: E402
+from reporting.digest import latest_runs  # noqa: E402
+
+
+@pytest.fixture
+def runs_dir(tmp_path, monkeypatch):
+    for index, run_id in enumerate(['R1', 'R2']):
+        report = synthetic_report(5, run_id=run_id)
+        report['product']['product_name'] = f'Product {index}'
+        (tmp_path / run_id).mkdir()
+        (tmp_path / run_id / 'report.json').write_text(json.dumps(report))
+    (tmp_path / 'BROKEN').mkdir()
+    (tmp_path / 'BROKEN' / 'report.json').write_text('{"run_id": "BROKEN", ')
+    monkeypatch.setattr(server, 'RUNS_DIR', tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    return TestClient(server.app)
+
+
+def test_latest_runs_skips_unreadable_reports(runs_dir, caplog):
+    with caplog.at_level(logging.WARNING, logger='reporting.digest'):
+        entries = latest_runs(runs_dir)
+    assert [entry['run_id'] for entry in entries] == ['R1', 'R2']
+    assert 'BROKEN' in caplog.text and 'JSONDecodeError' in caplog.text
+
+
+def test_digest_of_listed_runs_leaves_out_a_broken_one(runs_dir, client):
+    response = client.get('/api/digest.pdf', params={'run_id': ['R1', 'BROKEN', 'R2']})
+    assert response.status_code == 200
+    assert response.content.startswith(b'%PDF-')
+
+
+def test_digest_without_runs_is_not_rendered_per_request(runs_dir, client):
+    response = client.get('/api/digest.pdf')
+    assert response.status_code == 422
+    assert 'python -m reporting.digest' in response.json()['detail']
+
+
+def test_digest_run_count_is_capped(runs_dir, client, monkeypatch):
+    monkeypatch.setattr(server, 'DIGEST_MAX_RUNS', 1)
+    response = client.get('/api/digest.pdf', params={'run_id': ['R1', 'R2']})
+    assert response.status_code == 422
+    assert response.json() == {'detail': 'At most 1 runs per digest'}
+    # Repeats count once
+    assert client.get('/api/digest.pdf', params={'run_id': ['R1', 'R1']}).status_code == 200
+
+
+def test_digest_of_an_unknown_run_is_a_404(runs_dir, client):
+    assert client.get('/api/digest.pdf', params={'run_id': ['R1', 'NOPE']}).status_code == 404
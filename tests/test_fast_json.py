@@ -0,0 +1,90 @@
+"""
+fast_json must render list endpoints byte for byte like response_model did.
+
+The reference is FastAPI itself: a route returning the same documents
+through response_model=List[StatusCheck], as GET /api/status used to.
+"""
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+import pytest
+from bson.tz_util import utc as bson_utc
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+# server connects lazily; importing it needs no running MongoDB
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'test_fast_json')
+
+import fast_json  # noqa: E402
+from server import StatusCheck  # noqa: E402
+
+
+def reference_body(docs):
+    app = FastAPI()
+
+    @app.get('/status', response_model=List[StatusCheck])
+    async def get_status_checks():
+        return docs
+
+    with TestClient(app) as client:
+        return client.get('/status').content
+
+
+def status_docs():
+    start = datetime(2026, 3, 29, 0, 59, 59, tzinfo=bson_utc)
+    docs = [
+        # As the tz_aware client returns BSON dates: millisecond precision
+        {'id': str(uuid.uuid4()), 'client_name': f'agent-{i}', 'timestamp': start + timedelta(milliseconds=1234 * i)}
+        for i in range(50)
+    ]
+    docs += [
+        # Legacy ISO strings, with and without microseconds
+        {'id': 'legacy-1', 'client_name': 'legacy', 'timestamp': '2025-12-31T23:59:59.123456+00:00'},
+        {'id': 'legacy-2', 'client_name': 'legacy', 'timestamp': '2025-12-31T23:59:59+00:00'},
+        {'id': 'aware', 'client_name': 'python utc', 'timestamp': datetime(2026, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc)},
+        {'id': 'offset', 'client_name': 'offset', 'timestamp': datetime(2026, 1, 2, tzinfo=timezone(timedelta(hours=2)))},
+        {'id': 'naive', 'client_name': 'naive', 'timestamp': datetime(2026, 1, 2, 3, 4, 5)},
+        # Text that needs escaping, or must not be escaped
+        {'id': 'text', 'client_name': 'Café "Zürich" \\ \n\t\x00\x1f\x7f   食品 😀', 'timestamp': start},
+        # Fields the model ignores
+        {'id': 'extra', 'client_name': 'extra', 'timestamp': start, 'agent_version': '1.2'},
+    ]
+    return docs
+
+
+@pytest.fixture(params=['orjson', 'pydantic'])
+def encoder(request, monkeypatch):
+    if request.param == 'orjson':
+        if fast_json.orjson is None:
+            pytest.skip('orjson is not installed')
+    else:
+        monkeypatch.setattr(fast_json, 'orjson', None)
+    return request.param
+
+
+def test_list_matches_response_model(encoder):
+    docs = status_docs()
+    assert fast_json.dump_documents(docs, StatusCheck) == reference_body(docs)
+
+
+def test_empty_list_matches_response_model(encoder):
+    assert fast_json.dump_documents([], StatusCheck) == reference_body([])
+
+
+def test_document_without_a_field_is_validated(encoder):
+    from pydantic import ValidationError
+
+    with pytest.raises(ValidationError):
+        fast_json.dump_documents([{'id': 'x', 'timestamp': datetime(2026, 1, 1, tzinfo=timezone.utc)}], StatusCheck)
+
+
+def test_document_matches_model_dump_json(encoder):
+    for doc in status_docs():
+        assert fast_json.dump_document(doc, StatusCheck) == StatusCheck.model_validate(doc).model_dump_json().encode()
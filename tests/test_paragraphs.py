@@ -0,0 +1,47 @@
+"""
+para() shares parse results between equal styles, and only between equal styles.
+"""
+
+import sys
+from pathlib import Path
+
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+from reporting.paragraphs import _StyleKey, para  # noqa: E402
+
+TEXT = 'Legal basis: <b>Regulation (EU) No 1169/2011</b>, Article 9(1) ' * 4
+
+
+def test_child_style_does_not_share_its_parents_entry():
+    parent = ParagraphStyle('Detail', fontSize=8, leading=10)
+    # Key the parent first, as create_styles() users do before deriving styles
+    parent_para = para(TEXT, parent)
+    child = ParagraphStyle('Detail', parent=parent, fontSize=20, leading=24)
+
+    assert _StyleKey(child) != _StyleKey(parent)
+    child_para = para(TEXT, child)
+    assert child_para._parsed is not parent_para._parsed
+    assert child_para.frags[0].fontSize == 20 and parent_para.frags[0].fontSize == 8
+
+    _, parent_height = parent_para.wrap(200, 1000)
+    _, child_height = child_para.wrap(200, 1000)
+    assert child_height > parent_height
+    # Laid out as a plain Paragraph in the child style would be
+    assert child_height == Paragraph(TEXT, child).wrap(200, 1000)[1]
+
+
+def test_equal_styles_share_an_entry():
+    first = ParagraphStyle('Detail', fontSize=8, leading=10)
+    again = ParagraphStyle('Detail', fontSize=8, leading=10)
+    assert _StyleKey(first) == _StyleKey(again)
+    assert para(TEXT, first)._parsed is para(TEXT, again)._parsed
+
+
+def test_child_with_the_parents_attributes_shares_its_entry():
+    parent = ParagraphStyle('Detail', fontSize=8, leading=10)
+    para(TEXT, parent)
+    child = ParagraphStyle('Detail', parent=parent)
+    assert para(TEXT, child)._parsed is para(TEXT, parent)._parsed
@@ -0,0 +1,93 @@
+"""
+Renders sharing the process pool: a bulk report's parts must not queue ahead of
+an interactive download's.
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+from reporting import parallel  # noqa: E402
+from reporting.parallel import rendered_parts  # noqa: E402
+
+META = {'run_id': 'R1'}
+
+
+class RecordingRender:
+    """render_part stand-in that logs which part started when"""
+
+    def __init__(self, seconds=0.05):
+        self.seconds = seconds
+        self.started = []
+        self.first = threading.Event()
+
+    def __call__(self, job):
+        section, _ = job
+        self.started.append(section['id'])
+        self.first.set()
+        time.sleep(self.seconds)
+        return section['id'].encode(), 1
+
+
+def parts(name, count):
+    return [{'id': f'{name}-{i}'} for i in range(count)]
+
+
+def test_interactive_parts_go_before_a_queued_bulk_backlog(monkeypatch):
+    render = RecordingRender()
+    monkeypatch.setattr(parallel, 'render_part', render)
+    # Two workers, both taken by the bulk report's first parts
+    pool = ThreadPoolExecutor(max_workers=2)
+    bulk_done = []
+    bulk = threading.Thread(target=lambda: bulk_done.extend(rendered_parts(parts('bulk', 8), META, pool, background=True)))
+    bulk.start()
+    render.first.wait(5)
+
+    interactive = list(rendered_parts(parts('interactive', 3), META, pool))
+    bulk.join(10)
+
+    assert [data for data, _ in interactive] == [b'interactive-0', b'interactive-1', b'interactive-2']
+    assert [data for data, _ in bulk_done] == [f'bulk-{i}'.encode() for i in range(8)]
+    # Only the bulk parts already running when the download arrived went first
+    first_interactive = render.started.index('interactive-0')
+    assert first_interactive <= 2
+    assert render.started[first_interactive:first_interactive + 3] == ['interactive-0', 'interactive-1', 'interactive-2']
+
+
+def test_parts_are_submitted_no_faster_than_workers_free_up(monkeypatch):
+    monkeypatch.setattr(parallel, 'render_part', RecordingRender(seconds=0.01))
+    pool = ThreadPoolExecutor(max_workers=2)
+    submitted = []
+    submit = pool.submit
+
+    def counting_submit(fn, *args):
+        in_flight = sum(not future.done() for future in submitted)
+        submitted.append(submit(fn, *args))
+        peak.append(in_flight + 1)
+        return submitted[-1]
+
+    peak = []
+    monkeypatch.setattr(pool, 'submit', counting_submit)
+    assert len(list(rendered_parts(parts('bulk', 10), META, pool, background=True))) == 10
+    # Never more parts in the executor than it has workers, so nothing waits in its own FIFO queue
+    assert len(submitted) == 10 and max(peak) <= 2
+
+
+def test_closing_early_leaves_waiting_parts_unrendered(monkeypatch):
+    render = RecordingRender(seconds=0.05)
+    monkeypatch.setattr(parallel, 'render_part', render)
+    pool = ThreadPoolExecutor(max_workers=1)
+    rendered = rendered_parts(parts('p', 6), META, pool)
+    next(rendered)
+    rendered.close()
+    time.sleep(0.2)
+    assert len(render.started) <= 2
+
+
+def test_without_an_executor_parts_render_in_order(monkeypatch):
+    monkeypatch.setattr(parallel, 'render_part', RecordingRender(seconds=0))
+    assert [data for data, _ in rendered_parts(parts('p', 3), META)] == [b'p-0', b'p-1', b'p-2']
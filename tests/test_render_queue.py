@@ -0,0 +1,187 @@
+"""
+RenderQueue leases, retries and lanes, and the RenderWorkers thread pool,
+against mongomock-motor.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+from render_queue import BULK, DONE, FAILED, INTERACTIVE, QUEUED, RUNNING, RenderQueue, RenderWorkers  # noqa: E402
+
+LEASE_SECONDS = 0.05
+
+
+def new_queue(**kwargs):
+    return RenderQueue(AsyncMongoMockClient(tz_aware=True)['test']['render_jobs'], **kwargs)
+
+
+async def expire_lease():
+    await asyncio.sleep(LEASE_SECONDS * 2)
+
+
+def test_interactive_lane_is_claimed_first():
+    async def scenario():
+        queue = new_queue()
+        bulk = await queue.enqueue('R1', 'k1', lane=BULK)
+        interactive = await queue.enqueue('R2', 'k2', lane=INTERACTIVE)
+        assert (await queue.claim('w'))['id'] == interactive['id']
+        assert (await queue.claim('w'))['id'] == bulk['id']
+        assert await queue.claim('w') is None
+
+    asyncio.run(scenario())
+
+
+def test_reserved_worker_never_claims_bulk():
+    async def scenario():
+        queue = new_queue()
+        await queue.enqueue('R1', 'k1', lane=BULK)
+        assert await queue.claim('w', lanes=(INTERACTIVE,)) is None
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_is_taken_over():
+    async def scenario():
+        queue = new_queue(lease_seconds=LEASE_SECONDS)
+        job = await queue.enqueue('R1', 'k1')
+        assert (await queue.claim('w1'))['attempts'] == 1
+        # Still leased: nobody else gets it
+        assert await queue.claim('w2') is None
+
+        await expire_lease()
+        taken = await queue.claim('w2')
+        assert taken['id'] == job['id'] and taken['attempts'] == 2
+        # The first worker lost it: no heartbeat, and its result doesn't count
+        assert not await queue.heartbeat(job['id'], 'w1')
+        assert not await queue.complete(job['id'], 'w1')
+        assert await queue.complete(job['id'], 'w2')
+        assert (await queue.get(job['id']))['state'] == DONE
+
+    asyncio.run(scenario())
+
+
+def test_heartbeat_keeps_the_lease():
+    async def scenario():
+        queue = new_queue(lease_seconds=LEASE_SECONDS)
+        job = await queue.enqueue('R1', 'k1')
+        await queue.claim('w1')
+        for _ in range(4):
+            await asyncio.sleep(LEASE_SECONDS / 2)
+            assert await queue.heartbeat(job['id'], 'w1')
+        assert await queue.claim('w2') is None
+
+    asyncio.run(scenario())
+
+
+def test_job_fails_after_max_attempts():
+    async def scenario():
+        queue = new_queue(lease_seconds=LEASE_SECONDS, max_attempts=2)
+        job = await queue.enqueue('R1', 'k1')
+        for worker in ('w1', 'w2'):
+            assert (await queue.claim(worker))['id'] == job['id']
+            await expire_lease()
+        # Third lease would exceed max_attempts: the job is failed instead of handed out
+        assert await queue.claim('w3') is None
+        failed = await queue.get(job['id'])
+        assert failed['state'] == FAILED and failed['error'] == 'Lease expired 2 times'
+        # A new request for the same key queues a fresh job
+        again = await queue.enqueue('R1', 'k1')
+        assert again['id'] != job['id'] and again['state'] == QUEUED
+
+    asyncio.run(scenario())
+
+
+def test_workers_render_on_their_own_threads():
+    rendered = []
+
+    def render(job):
+        rendered.append((job['run_id'], threading.current_thread().name))
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        # Every default-executor thread is busy, as with many slow downloads
+        release = threading.Event()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+        blocker = loop.run_in_executor(None, release.wait)
+
+        queue = new_queue()
+        workers = RenderWorkers(queue, render, workers=2, reserved_interactive=1, idle_seconds=0.01)
+        workers.start()
+        try:
+            job = await queue.enqueue('R1', 'k1', lane=INTERACTIVE)
+            finished = await queue.wait(job['id'], timeout=5)
+        finally:
+            await workers.stop()
+            release.set()
+            await blocker
+        return finished
+
+    finished = asyncio.run(scenario())
+    assert finished['state'] == DONE
+    assert rendered[0][0] == 'R1' and rendered[0][1].startswith('render-worker')
+
+
+def test_failed_render_marks_the_job_failed():
+    def render(job):
+        raise RuntimeError('boom')
+
+    async def scenario():
+        queue = new_queue()
+        workers = RenderWorkers(queue, render, workers=1, idle_seconds=0.01)
+        workers.start()
+        try:
+            job = await queue.enqueue('R1', 'k1')
+            return await queue.wait(job['id'], timeout=5)
+        finally:
+            await workers.stop()
+
+    finished = asyncio.run(scenario())
+    assert finished['state'] == FAILED and finished['error'] == 'RuntimeError: boom'
+
+
+def test_stop_leaves_a_running_job_leased():
+    started = threading.Event()
+    release = threading.Event()
+
+    def render(job):
+        started.set()
+        release.wait(5)
+
+    async def scenario():
+        queue = new_queue()
+        workers = RenderWorkers(queue, render, workers=1, idle_seconds=0.01)
+        workers.start()
+        job = await queue.enqueue('R1', 'k1')
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        stopping = time.monotonic()
+        await workers.stop()
+        # stop() doesn't wait for the render thread
+        assert time.monotonic() - stopping < 1
+        release.set()
+        return await queue.get(job['id'])
+
+    job = asyncio.run(scenario())
+    assert job['state'] == RUNNING
+
+
+@pytest.mark.parametrize('lane', [BULK, INTERACTIVE])
+def test_same_key_is_deduplicated_while_active(lane):
+    async def scenario():
+        queue = new_queue()
+        await queue.ensure_indexes()
+        first = await queue.enqueue('R1', 'k1', lane=BULK)
+        second = await queue.enqueue('R1', 'k1', lane=lane)
+        assert second['id'] == first['id']
+        assert second['lane'] == lane
+
+    asyncio.run(scenario())
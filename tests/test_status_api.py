@@ -0,0 +1,235 @@
+"""
+GET /api/status keyset pagination, the NDJSON stream and POST /api/status/bulk,
+against mongomock-motor.
+
+Documents written before the switch to BSON dates keep ISO-string timestamps
+until status_migration converts them; both kinds are mixed here.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+# server connects lazily; importing it needs no running MongoDB
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'test_status_api')
+
+import server  # noqa: E402
+from write_batcher import InsertBatcher  # noqa: E402
+
+LEGACY_CHECKS = 25
+NEW_CHECKS = 20
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = AsyncMongoMockClient(tz_aware=True)['test']
+    monkeypatch.setattr(server, 'db', db)
+    # Not started (no lifespan in these tests): inserts are written through
+    monkeypatch.setattr(server, 'status_writes', InsertBatcher(db.status_checks))
+    return db
+
+
+@pytest.fixture
+def client(db):
+    # Without `with`, startup hooks (indexes, render workers) don't run
+    return TestClient(server.app)
+
+
+@pytest.fixture
+def checks(db, client):
+    """Legacy string timestamps first, then checks posted through the API; all in expected order"""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    legacy = [
+        # Several share a timestamp, so the id breaks the tie
+        {'id': f'legacy-{i:02d}', 'client_name': f'legacy {i}', 'timestamp': (start + timedelta(seconds=i // 3)).isoformat()}
+        for i in range(LEGACY_CHECKS)
+    ]
+    asyncio.run(db.status_checks.insert_many([dict(doc) for doc in legacy]))
+    posted = [client.post('/api/status', json={'client_name': f'new {i}'}).json() for i in range(NEW_CHECKS)]
+    expected = sorted(legacy, key=lambda doc: (doc['timestamp'], doc['id']))
+    expected += sorted(posted, key=lambda doc: (datetime.fromisoformat(doc['timestamp'].replace('Z', '+00:00')), doc['id']))
+    return [doc['id'] for doc in expected]
+
+
+def page_through(client, limit, path='/api/status'):
+    ids, after, pages = [], None, 0
+    while True:
+        params = {'limit': limit}
+        if after:
+            params['after'] = after
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        ids += [doc['id'] for doc in response.json()]
+        pages += 1
+        after = response.headers.get('x-next-cursor')
+        if after is None:
+            assert 'link' not in response.headers
+            return ids, pages
+        assert response.headers['link'] == f'</api/status?limit={limit}&after={after}>; rel="next"'
+
+
+def test_new_checks_are_stored_as_dates(db, client):
+    client.post('/api/status', json={'client_name': 'agent'})
+    doc = asyncio.run(db.status_checks.find_one({'client_name': 'agent'}))
+    assert isinstance(doc['timestamp'], datetime)
+
+
+@pytest.mark.parametrize('limit', [1, 7, 25, 1000])
+def test_pages_cover_legacy_and_date_timestamps_in_order(client, checks, limit):
+    ids, pages = page_through(client, limit)
+    assert ids == checks
+    assert pages == -(-len(checks) // limit)
+
+
+def test_legacy_and_date_timestamps_render_alike(client, checks):
+    body = client.get('/api/status').json()
+    assert body[0]['timestamp'] == '2026-01-01T00:00:00Z'
+    assert all(doc['timestamp'].endswith('Z') for doc in body)
+
+
+def test_stream_returns_everything_in_order(client, checks):
+    response = client.get('/api/status/stream')
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = response.text.splitlines()
+    assert [json.loads(line)['id'] for line in lines] == checks
+    # Each line matches the list endpoint's element
+    assert [json.loads(line) for line in lines] == client.get('/api/status').json()
+
+
+@pytest.mark.parametrize('position', [LEGACY_CHECKS - 1, LEGACY_CHECKS + 3])
+def test_stream_resumes_after_a_page_cursor(client, checks, position):
+    # A cursor on a legacy string timestamp, and one on a BSON date
+    cursor = client.get('/api/status', params={'limit': position + 1}).headers['x-next-cursor']
+    lines = client.get('/api/status/stream', params={'after': cursor}).text.splitlines()
+    assert [json.loads(line)['id'] for line in lines] == checks[position + 1:]
+
+
+def cursor(value):
+    return base64.urlsafe_b64encode(value).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('after', [
+    'not base64!',
+    cursor(b'not json'),
+    cursor(b'{"kind": "date"}'),
+    cursor(b'["date","yesterday","x"]'),
+    cursor(b'["int",1,"x"]'),
+    cursor(b'["str","2026-01-01"]'),
+])
+@pytest.mark.parametrize('path', ['/api/status', '/api/status/stream'])
+def test_invalid_cursor_is_a_400(client, path, after):
+    response = client.get(path, params={'after': after})
+    assert response.status_code == 400
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
+@pytest.mark.parametrize('limit', [0, 1001])
+def test_limit_out_of_range_is_a_422(client, limit):
+    assert client.get('/api/status', params={'limit': limit}).status_code == 422
+
+
+def post_bulk(client, body, content_type='application/json'):
+    return client.post('/api/status/bulk', content=body, headers={'content-type': content_type})
+
+
+def test_bulk_json_array_is_inserted(db, client):
+    response = post_bulk(client, json.dumps([{'client_name': f'bulk {i}'} for i in range(3)]))
+    assert response.status_code == 200
+    body = response.json()
+    assert (body['inserted'], body['failed']) == (3, 0)
+    assert [result['index'] for result in body['results']] == [0, 1, 2]
+    stored = asyncio.run(db.status_checks.find({}, {'_id': 0}).to_list(None))
+    assert sorted(doc['id'] for doc in stored) == sorted(result['id'] for result in body['results'])
+    assert all(isinstance(doc['timestamp'], datetime) for doc in stored)
+
+
+def test_bulk_reports_errors_per_item(client):
+    lines = [
+        json.dumps({'client_name': 'ok 0'}),
+        '{"client_name": ',
+        json.dumps({'name': 'wrong field'}),
+        '',
+        json.dumps({'client_name': 'ok 3'}),
+    ]
+    response = post_bulk(client, '\n'.join(lines), 'application/x-ndjson; charset=utf-8')
+    assert response.status_code == 200
+    body = response.json()
+    assert (body['inserted'], body['failed']) == (2, 2)
+    ok0, bad_json, invalid, ok3 = body['results']
+    assert 'id' in ok0 and 'id' in ok3 and ok3['index'] == 3
+    assert bad_json['index'] == 1 and bad_json['error'].startswith('Invalid JSON: ')
+    assert invalid == {'index': 2, 'error': 'client_name: Field required'}
+
+
+def test_bulk_reports_write_errors_per_item(db, client, monkeypatch):
+    # A unique id index and an id generator that repeats itself: the second insert collides
+    asyncio.run(db.status_checks.create_index('id', unique=True))
+    ids = iter(['a', 'b', 'a', 'c'])
+    monkeypatch.setattr(server.uuid, 'uuid4', lambda: next(ids))
+    body = post_bulk(client, json.dumps([{'client_name': f'bulk {i}'} for i in range(4)])).json()
+    assert (body['inserted'], body['failed']) == (3, 1)
+    assert [result.get('id') for result in body['results']] == ['a', 'b', None, 'c']
+    assert body['results'][2]['index'] == 2 and 'duplicate key' in body['results'][2]['error'].lower()
+
+
+def test_bulk_batches_share_one_result_list(client, monkeypatch):
+    monkeypatch.setattr(server, 'STATUS_BULK_BATCH', 2)
+    items = [{'client_name': f'bulk {i}'} for i in range(5)]
+    items[2] = {}
+    body = post_bulk(client, json.dumps(items)).json()
+    assert (body['inserted'], body['failed']) == (4, 1)
+    assert [result['index'] for result in body['results']] == list(range(5))
+
+
+@pytest.mark.parametrize('body, status_code', [
+    ('not json', 400),
+    ('{"client_name": "not a list"}', 422),
+])
+def test_bulk_rejects_bodies_that_are_not_lists(client, body, status_code):
+    assert post_bulk(client, body).status_code == status_code
+
+
+def test_bulk_rejects_too_many_items(client, monkeypatch):
+    monkeypatch.setattr(server, 'STATUS_BULK_MAX_ITEMS', 2)
+    response = post_bulk(client, json.dumps([{'client_name': 'x'}] * 3))
+    assert response.status_code == 413
+    assert response.json() == {'detail': 'At most 2 status checks per request'}
+
+
+@pytest.fixture
+def small_bulk_limit(monkeypatch):
+    # 2 items of at most 32 bytes: anything past 64 bytes is refused unparsed
+    monkeypatch.setattr(server, 'STATUS_BULK_MAX_ITEMS', 2)
+    monkeypatch.setattr(server, 'STATUS_BULK_MAX_ITEM_BYTES', 32)
+
+    def parsed(body, content_type):
+        raise AssertionError('an oversized body was parsed')
+
+    monkeypatch.setattr(server, 'bulk_status_items', parsed)
+
+
+def test_bulk_refuses_an_oversized_body_by_its_length(client, small_bulk_limit):
+    response = post_bulk(client, json.dumps([{'client_name': 'x' * 100}]))
+    assert response.status_code == 413
+    assert response.json() == {'detail': 'Body larger than 64 bytes'}
+
+
+def test_bulk_refuses_an_oversized_chunked_body_while_reading(client, small_bulk_limit):
+    def chunks():
+        yield b'['
+        for _ in range(10):
+            yield json.dumps({'client_name': 'x' * 20}).encode() + b','
+        yield b'{}]'
+
+    response = post_bulk(client, chunks())
+    assert response.status_code == 413
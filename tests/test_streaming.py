@@ -0,0 +1,188 @@
+"""
+aiter_report must let go of everything when the client goes away mid-download,
+and StreamRenders must bound and share the renders behind concurrent streams.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'backend'))
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import synthetic_report  # noqa: E402
+from reporting import streaming  # noqa: E402
+from reporting.streaming import CHUNK_SIZE, StreamRenders, aiter_report  # noqa: E402
+
+# Large enough that the renderer is still busy when the client disconnects
+REPORT = synthetic_report(400)
+
+
+async def abort_after_first_chunk(report, **kwargs):
+    """Receive one chunk, then disconnect while waiting for the next, as a server cancels the response task"""
+    received = asyncio.Event()
+    chunks = []
+
+    async def consume():
+        async for chunk in aiter_report(report, window_chunks=1, **kwargs):
+            chunks.append(chunk)
+            received.set()
+
+    task = asyncio.create_task(consume())
+    await received.wait()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return chunks[0]
+
+
+def test_complete_stream_is_a_pdf():
+    async def read_all():
+        return b''.join([chunk async for chunk in aiter_report(REPORT)])
+
+    pdf = asyncio.run(read_all())
+    assert pdf.startswith(b'%PDF-') and pdf.rstrip().endswith(b'%%EOF')
+
+
+def slow_stream_report(report, write, **kwargs):
+    """A render that takes a while between its first and second chunk"""
+    write(b'%PDF-' + b'0' * CHUNK_SIZE)
+    time.sleep(0.5)
+    write(b'1' * CHUNK_SIZE)
+    return 1
+
+
+def test_disconnect_does_not_block_executor_threads(monkeypatch):
+    monkeypatch.setattr(streaming, 'stream_report', slow_stream_report)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        # One default-executor thread: a reader stuck on the chunk queue would take it for good
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+        for _ in range(3):
+            assert (await abort_after_first_chunk(REPORT)).startswith(b'%PDF-')
+        assert await asyncio.wait_for(loop.run_in_executor(None, lambda: 42), timeout=5) == 42
+
+    asyncio.run(scenario())
+
+
+def test_disconnect_stops_the_renderer():
+    finished = threading.Event()
+    asyncio.run(abort_after_first_chunk(REPORT, on_finish=finished.set))
+    assert finished.wait(30)
+
+
+def test_on_complete_is_skipped_after_disconnect():
+    completed = []
+    finished = threading.Event()
+
+    async def scenario():
+        chunks = aiter_report(REPORT, window_chunks=1, on_complete=lambda spool, pages: completed.append(pages),
+                              on_finish=finished.set)
+        await chunks.__anext__()
+        await chunks.aclose()
+
+    asyncio.run(scenario())
+    assert finished.wait(30)
+    assert completed == []
+
+
+class CountingRender:
+    """slow_stream_report that records how many renders run at once"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+
+    def __call__(self, report, write, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            return slow_stream_report(report, write, **kwargs)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+async def read_all(chunks):
+    return b''.join([chunk async for chunk in chunks])
+
+
+def test_streams_beyond_the_limit_wait_for_a_render_thread(monkeypatch):
+    render = CountingRender()
+    monkeypatch.setattr(streaming, 'stream_report', render)
+
+    async def scenario():
+        threads = ThreadPoolExecutor(max_workers=2)
+        return await asyncio.gather(*(read_all(aiter_report(REPORT, render_executor=threads)) for _ in range(4)))
+
+    pdfs = asyncio.run(scenario())
+    assert all(pdf.startswith(b'%PDF-') for pdf in pdfs)
+    assert render.calls == 4 and render.peak == 2
+
+
+def test_stream_abandoned_while_waiting_never_renders(monkeypatch):
+    render = CountingRender()
+    monkeypatch.setattr(streaming, 'stream_report', render)
+    finished = threading.Event()
+
+    async def scenario():
+        # The only render thread is busy
+        threads = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        threads.submit(release.wait)
+        task = asyncio.create_task(read_all(aiter_report(REPORT, render_executor=threads, on_finish=finished.set)))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        release.set()
+        threads.shutdown(wait=True)
+
+    asyncio.run(scenario())
+    assert finished.is_set() and render.calls == 0
+
+
+def test_second_request_for_a_key_waits_for_the_first_render(monkeypatch):
+    render = CountingRender()
+    monkeypatch.setattr(streaming, 'stream_report', render)
+    stored = []
+
+    def store(spool, pages):
+        stored.append(spool.read())
+
+    async def scenario():
+        renders = StreamRenders(max_renders=2)
+        first = asyncio.create_task(read_all(renders.stream('k', REPORT, on_complete=store)))
+        await asyncio.sleep(0)
+        # Registered before the first chunk, so there's no window for a second render
+        assert await renders.wait('k', timeout=5)
+        # The finished file was handed over before the waiter woke up
+        assert stored == [await first]
+        # Over and unregistered: a later request doesn't wait
+        assert not await renders.wait('k', timeout=5)
+        renders.shutdown()
+
+    asyncio.run(scenario())
+    assert render.calls == 1
+
+
+def test_wait_without_a_render_or_past_its_timeout_is_false(monkeypatch):
+    monkeypatch.setattr(streaming, 'stream_report', slow_stream_report)
+
+    async def scenario():
+        renders = StreamRenders(max_renders=1)
+        assert not await renders.wait('other', timeout=5)
+        task = asyncio.create_task(read_all(renders.stream('k', REPORT)))
+        await asyncio.sleep(0)
+        assert not await renders.wait('k', timeout=0.05)
+        await task
+        renders.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,128 @@
+"""
+InsertBatcher batching, per-document errors and shutdown, against mongomock-motor.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import WriteError
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+from write_batcher import InsertBatcher, StoppedError  # noqa: E402
+
+
+def new_collection():
+    return AsyncMongoMockClient()['test']['status_checks']
+
+
+class GatedCollection:
+    """insert_many holds until the gate opens, like a slow write to the primary"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.gate = asyncio.Event()
+        self.writing = asyncio.Event()
+        self.batches = []
+
+    async def insert_many(self, docs, ordered=True):
+        self.batches.append(len(docs))
+        self.writing.set()
+        await self.gate.wait()
+        return await self.collection.insert_many(docs, ordered=ordered)
+
+    async def insert_one(self, doc):
+        return await self.collection.insert_one(doc)
+
+
+async def count(collection):
+    return await collection.count_documents({})
+
+
+def test_concurrent_inserts_share_a_batch():
+    async def scenario():
+        collection = new_collection()
+        batcher = InsertBatcher(collection, flush_seconds=0.05, max_batch=8)
+        batcher.start()
+        try:
+            await asyncio.gather(*(batcher.insert({'id': str(i)}) for i in range(20)))
+        finally:
+            await batcher.stop()
+        return batcher.metrics(), await count(collection)
+
+    metrics, written = asyncio.run(scenario())
+    assert written == 20
+    assert metrics['documents'] == 20 and metrics['flushes'] == 3
+    # Two full batches of 8, and the remaining 4
+    assert metrics['batch_sizes'] == {'1': 0, '2': 0, '4': 1, '8': 2}
+
+
+def test_write_errors_go_to_their_own_caller():
+    async def scenario():
+        collection = new_collection()
+        await collection.create_index('id', unique=True)
+        batcher = InsertBatcher(collection, flush_seconds=0.05)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.insert({'id': id}) for id in 'aba'), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    first, second, duplicate = asyncio.run(scenario())
+    assert first is None and second is None
+    assert isinstance(duplicate, WriteError) and duplicate.code == 11000
+
+
+def test_stop_lets_the_current_flush_finish_and_writes_the_rest():
+    async def scenario():
+        collection = GatedCollection(new_collection())
+        batcher = InsertBatcher(collection, flush_seconds=0.01, max_batch=2)
+        batcher.start()
+        inserts = [asyncio.create_task(batcher.insert({'id': str(i)})) for i in range(2)]
+        await collection.writing.wait()
+        # Queued behind the batch being written
+        inserts += [asyncio.create_task(batcher.insert({'id': str(i)})) for i in range(2, 5)]
+        await asyncio.sleep(0)
+        stopping = asyncio.create_task(batcher.stop())
+        await asyncio.sleep(0.05)
+        assert not stopping.done()
+        collection.gate.set()
+        await asyncio.wait_for(stopping, timeout=5)
+        results = await asyncio.wait_for(asyncio.gather(*inserts, return_exceptions=True), timeout=5)
+        return results, collection.batches, await count(collection.collection)
+
+    results, batches, written = asyncio.run(scenario())
+    assert results == [None] * 5
+    assert batches == [2, 2, 1] and written == 5
+
+
+def test_cancelled_stop_fails_the_waiting_callers():
+    async def scenario():
+        collection = GatedCollection(new_collection())
+        batcher = InsertBatcher(collection, flush_seconds=0.01, max_batch=2)
+        batcher.start()
+        inserts = [asyncio.create_task(batcher.insert({'id': str(i)})) for i in range(3)]
+        await collection.writing.wait()
+        # The write never comes back, and shutdown gives up on it
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(batcher.stop(), timeout=0.05)
+        return await asyncio.wait_for(asyncio.gather(*inserts, return_exceptions=True), timeout=5)
+
+    results = asyncio.run(scenario())
+    assert len(results) == 3 and all(isinstance(result, StoppedError) for result in results)
+
+
+def test_idle_stop_returns_and_later_inserts_write_through():
+    async def scenario():
+        collection = new_collection()
+        batcher = InsertBatcher(collection, flush_seconds=10)
+        batcher.start()
+        await asyncio.wait_for(batcher.stop(), timeout=5)
+        await asyncio.wait_for(batcher.insert({'id': 'late'}), timeout=5)
+        return batcher.metrics(), await count(collection)
+
+    metrics, written = asyncio.run(scenario())
+    assert written == 1 and metrics['flushes'] == 0